@@ -0,0 +1,78 @@
+# 정책 기간 문자열 파싱 벤치마크
+# 사용법: python -m benchmarks.bench_date_parser [filtered_policies.json 경로]
+import json
+import os
+import re
+import sys
+import time
+
+from ragdata_repo.policy_parser import (
+    _match_date_grammar,
+    date_patterns,
+    parse_date_string,
+)
+
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+default_policy_path = os.path.join(current_dir, "data/filtered_policies.json")
+
+
+def load_period_strings(policy_path):
+    """parse_policy_details와 같은 방식으로 신청/운영 기간 문자열을 추출"""
+    with open(policy_path, "r", encoding="utf-8") as f:
+        policy_data = json.load(f)
+
+    period_strings = []
+    for policy in policy_data:
+        details = {detail["Title"]: detail["Content"] for detail in policy["Details"]}
+        for title in ("사업 신청 기간", "사업 운영 기간"):
+            period_strings.append("".join(details.get(title, "__").split()))
+    return period_strings
+
+
+def legacy_scan(date_str):
+    """기존 방식: 패턴마다 컴파일하지 않은 re.search를 순서대로 호출"""
+    if re.search(date_patterns["special_cases"], date_str):
+        return "special_cases"
+    for pattern_name, pattern in date_patterns.items():
+        if pattern_name != "special_cases" and re.search(pattern, date_str):
+            return pattern_name
+    return None
+
+
+def measure(label, func, period_strings, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for period in period_strings:
+            func(period)
+    elapsed = time.perf_counter() - start
+    count = len(period_strings) * repeat
+    print(f"{label:<28} {elapsed * 1000:10.2f} ms  {count / elapsed:14,.0f} strings/s")
+
+
+def main(policy_path, repeat=20):
+    period_strings = load_period_strings(policy_path)
+    unique_count = len(set(period_strings))
+    print(f"기간 문자열 {len(period_strings)}개 (고유 {unique_count}개), 반복 {repeat}회")
+
+    # re 모듈 내부 패턴 캐시까지 비운 상태에서 기존 방식 측정
+    re.purge()
+    measure("legacy re.search scan", legacy_scan, period_strings, repeat)
+
+    # 메모이제이션 없이 컴파일된 문법만 사용한 경우 (매 호출마다 캐시 비움)
+    def uncached(period):
+        _match_date_grammar.cache_clear()
+        return parse_date_string(period)
+
+    measure("compiled grammar (no memo)", uncached, period_strings, repeat)
+
+    # 첫 요청: 캐시가 빈 상태에서 전체 코퍼스 1회 파싱
+    _match_date_grammar.cache_clear()
+    measure("compiled grammar (cold)", parse_date_string, period_strings, 1)
+
+    # 이후 요청: 이미 본 기간 문자열은 캐시에서 바로 반환
+    measure("compiled grammar (warm)", parse_date_string, period_strings, repeat)
+    print(_match_date_grammar.cache_info())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else default_policy_path)
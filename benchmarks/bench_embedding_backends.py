@@ -0,0 +1,107 @@
+# 임베딩 백엔드 벤치마크: HuggingFace(PyTorch fp32) vs ONNX Runtime fp32 / int8
+# 지연 시간(검색어 1개), 처리량(문장 일괄 임베딩), HuggingFace 대비 top-k 검색 결과 일치율
+# 사용법: python -m benchmarks.bench_embedding_backends [--sample 1000] [--k 5] [--batch-size 32] [--threads 4]
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from config.settings import EMBED_THREADS
+from ragdata_repo.embedding_backends import get_embed_model
+from ragdata_repo.llamaindex_search import EMBED_MODEL_NAME, csv_file_path
+
+# (백엔드, int8 양자화) - 처음으로 실행에 성공한 백엔드가 일치율 비교 기준
+BACKENDS = [("huggingface", False), ("onnx", False), ("onnx", True)]
+
+QUERIES = [
+    "전세를 알아보려고 하는데 전세 사기가 걱정돼요",
+    "월세가 너무 부담돼요",
+    "신혼부부인데 내 집 마련을 하고 싶어요",
+    "청년 전용 적금이 있을까요",
+    "전세 대출 이자를 줄이고 싶어요",
+    "보증금이 부족해요",
+    "청약 통장을 언제 만들어야 하나요",
+    "첫 집을 사려는데 대출 한도가 궁금해요",
+]
+
+
+def top_k(corpus, query_embeddings, k):
+    scores = query_embeddings @ corpus.T
+    return [set(np.argsort(-row)[:k]) for row in scores]
+
+
+def run_backend(backend, quantize, sentences, args):
+    start = time.perf_counter()
+    embed_model = get_embed_model(
+        backend,
+        EMBED_MODEL_NAME,
+        quantize=quantize,
+        batch_size=args.batch_size,
+        threads=args.threads,
+    )
+    load_seconds = time.perf_counter() - start
+
+    # 처리량: 문장 전체를 배치로 임베딩
+    start = time.perf_counter()
+    corpus = np.asarray(embed_model.get_text_embedding_batch(sentences), np.float32)
+    throughput = len(sentences) / (time.perf_counter() - start)
+
+    # 지연 시간: 검색어를 하나씩 임베딩 (첫 호출은 워밍업으로 제외)
+    embed_model.get_query_embedding(QUERIES[0])
+    latencies = []
+    query_embeddings = []
+    for query in QUERIES * args.repeat:
+        start = time.perf_counter()
+        query_embeddings.append(embed_model.get_query_embedding(query))
+        latencies.append(time.perf_counter() - start)
+    query_embeddings = np.asarray(query_embeddings[: len(QUERIES)], np.float32)
+
+    return {
+        "load_seconds": load_seconds,
+        "throughput": throughput,
+        "p50_ms": np.percentile(latencies, 50) * 1000,
+        "p95_ms": np.percentile(latencies, 95) * 1000,
+        "top_k": top_k(corpus, query_embeddings, args.k),
+    }
+
+
+def main(args):
+    sentences = pd.read_csv(args.csv)["sentence"].astype(str).tolist()[: args.sample]
+    print(
+        f"문장 {len(sentences)}개, 검색어 {len(QUERIES)}개 x {args.repeat}, k={args.k}, "
+        f"batch={args.batch_size}, threads={args.threads or os.cpu_count()}"
+    )
+    print(
+        f"{'backend':<16} {'load':>8} {'sent/s':>9} {'p50':>9} {'p95':>9} {'top-k 일치':>10}"
+    )
+
+    reference = None
+    for backend, quantize in BACKENDS:
+        label = backend + ("-int8" if quantize else "")
+        try:
+            result = run_backend(backend, quantize, sentences, args)
+        except Exception as e:
+            print(f"{label:<16} error: {type(e).__name__}: {e}")
+            continue
+
+        reference = reference or result["top_k"]
+        agreement = np.mean(
+            [len(a & b) / args.k for a, b in zip(result["top_k"], reference)]
+        )
+        print(
+            f"{label:<16} {result['load_seconds']:7.1f}s {result['throughput']:9.1f} "
+            f"{result['p50_ms']:7.1f}ms {result['p95_ms']:7.1f}ms {agreement:10.1%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 벤치마크")
+    parser.add_argument("--csv", default=csv_file_path)
+    parser.add_argument("--sample", type=int, default=1000, help="임베딩할 문장 수")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=EMBED_THREADS)
+    parser.add_argument("--repeat", type=int, default=5, help="검색어 반복 횟수")
+    main(parser.parse_args())
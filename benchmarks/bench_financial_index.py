@@ -0,0 +1,74 @@
+# 금융상품 은행별 인덱스 벤치마크: 로드 시간, 조회 시간, 메모리
+# 사용법: python -m benchmarks.bench_financial_index [financial_data.csv 경로]
+import os
+import sys
+import time
+import tracemalloc
+
+from ragdata_repo.financial_parser import (
+    BANK_ALIASES,
+    FinancialProductIndex,
+    load_financial_products_from_file,
+)
+
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+default_data_path = os.path.join(current_dir, "ragdata_repo/data/financial_data.csv")
+
+
+def legacy_filter_financial_products(data, user_input):
+    """기존 구현: 전체 복사 후 행마다 첫 번째 콤마 앞의 은행명을 잘라서 부분 문자열 검색"""
+    filtered_data = data.copy()
+
+    if "main_bank" in user_input:
+        filtered_data = filtered_data[
+            filtered_data["sentence"]
+            .apply(lambda x: x.split(",")[0] if isinstance(x, str) else "")
+            .str.contains(user_input["main_bank"], na=False)
+        ]
+
+    return filtered_data
+
+
+def frame_bytes(frame):
+    return frame.memory_usage(deep=True).sum()
+
+
+def main(data_save_path, repeat=200):
+    banks = list(BANK_ALIASES)
+
+    # 기존 방식: 요청마다 CSV 읽기 + 전체 복사 + 행마다 lambda로 은행명 추출
+    start = time.perf_counter()
+    for bank in banks:
+        legacy = legacy_filter_financial_products(
+            load_financial_products_from_file(data_save_path), {"main_bank": bank}
+        )
+    legacy_elapsed = (time.perf_counter() - start) / len(banks)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = FinancialProductIndex(load_financial_products_from_file(data_save_path))
+    load_elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for bank in banks:
+            index.lookup(bank)
+    lookup_elapsed = (time.perf_counter() - start) / (repeat * len(banks))
+
+    data_bytes = frame_bytes(index.data)
+    partition_bytes = sum(frame_bytes(p) for p in index.partitions.values())
+    print(f"상품 {len(index.data):,}개, 은행 파티션 {len(index.partitions)}개")
+    print(f"legacy 요청당 처리      {legacy_elapsed * 1000:10.3f} ms")
+    print(
+        f"인덱스 로드 (1회)       {load_elapsed * 1000:10.3f} ms  (peak {peak / 2**20:.1f} MiB)"
+    )
+    print(f"인덱스 조회 (요청당)    {lookup_elapsed * 1e6:10.3f} us")
+    print(
+        f"메모리: 원본 {data_bytes / 2**20:.2f} MiB + 파티션 {partition_bytes / 2**20:.2f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else default_data_path)
@@ -0,0 +1,109 @@
+# 정책 검색 벤치마크: 기존 llama_index SimpleVectorStore 조회 + 원문 선형 탐색 vs FlatIndex
+# 문장 수별 검색어 1개 지연 시간과 top-k 일치 여부 (임베딩 모델 없이 무작위 단위 벡터 사용)
+# 사용법: python -m benchmarks.bench_flat_index [--sizes 10000 100000 1000000] [--dim 768] [--k 5]
+import argparse
+import time
+
+import numpy as np
+from llama_index.core import Document
+from llama_index.core.vector_stores.simple import SimpleVectorStore
+from llama_index.core.vector_stores.types import VectorStoreQuery
+
+from ragdata_repo.flat_index import FlatIndex, normalize_rows
+
+
+def make_corpus(size, dim, rng):
+    embeddings = normalize_rows(rng.standard_normal((size, dim), dtype=np.float32))
+    texts = [f"정책 문장 {i}" for i in range(size)]
+    return embeddings, texts
+
+
+def build_legacy(embeddings, texts):
+    """기존 VectorStoreIndex가 메모리에 들고 있던 것: 노드 id -> 임베딩 리스트, Document 목록"""
+    vector_store = SimpleVectorStore()
+    vector_store.data.embedding_dict = {
+        str(i): embedding.tolist() for i, embedding in enumerate(embeddings)
+    }
+    documents = [
+        Document(text=text, metadata={"doc_id": i}) for i, text in enumerate(texts)
+    ]
+    return vector_store, documents
+
+
+def legacy_search(vector_store, documents, query_embedding, k):
+    """기존 search_policies: 벡터 조회 후 결과마다 전체 문서를 훑어 원문을 찾음"""
+    result = vector_store.query(
+        VectorStoreQuery(query_embedding=query_embedding.tolist(), similarity_top_k=k)
+    )
+    results = []
+    for node_id in result.ids:
+        doc_id = int(node_id)
+        matching_docs = [doc for doc in documents if doc.metadata["doc_id"] == doc_id]
+        results.append((doc_id, matching_docs[0].text))
+    return results
+
+
+def flat_search(index, query_embedding, k):
+    rows, _ = index.search(query_embedding, k)
+    doc_ids = [int(index.doc_ids[row]) for row in rows]
+    return [(doc_id, index.policy_text(doc_id)) for doc_id in doc_ids]
+
+
+def measure(search, queries):
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        latencies.append(time.perf_counter() - start)
+    return results, np.percentile(latencies, 50) * 1000
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+    queries = normalize_rows(rng.standard_normal((args.queries, args.dim), np.float32))
+    print(f"dim={args.dim}, k={args.k}, 검색어 {args.queries}개 (p50 지연 시간)")
+    print(
+        f"{'sentences':>10} {'legacy':>12} {'flat':>10} {'speedup':>8} {'top-k 일치':>10}"
+    )
+
+    for size in args.sizes:
+        embeddings, texts = make_corpus(size, args.dim, rng)
+        index = FlatIndex(embeddings, np.arange(size), texts=texts, normalized=True)
+        flat, flat_ms = measure(lambda q: flat_search(index, q, args.k), queries)
+
+        if size > args.legacy_max:
+            print(f"{size:>10,} {'skipped':>12} {flat_ms:8.2f}ms")
+            continue
+
+        vector_store, documents = build_legacy(embeddings, texts)
+        legacy, legacy_ms = measure(
+            lambda q: legacy_search(vector_store, documents, q, args.k),
+            queries[: args.legacy_queries],
+        )
+        agreement = np.mean([a == b for a, b in zip(legacy, flat)])
+        print(
+            f"{size:>10,} {legacy_ms:10.2f}ms {flat_ms:8.2f}ms "
+            f"x{legacy_ms / flat_ms:7.0f} {agreement:10.1%}"
+        )
+        del vector_store, documents
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="정책 검색 인덱스 벤치마크")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=20_000,
+        help="이보다 문장 수가 많으면 기존 방식은 측정하지 않음 (임베딩을 파이썬 리스트로 들고 있어 메모리가 큼)",
+    )
+    parser.add_argument(
+        "--legacy-queries", type=int, default=10, help="기존 방식으로 측정할 검색어 수"
+    )
+    main(parser.parse_args())
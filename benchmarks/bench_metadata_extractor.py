@@ -0,0 +1,148 @@
+# 공고문 메타데이터 추출 벤치마크: 기존 extract_metadata_* (매 호출 re.search) vs MetadataExtractor (한 번의 스캔)
+# 사용법: python -m benchmarks.bench_metadata_extractor [api_data/crawl_data가 있는 data 디렉토리] [반복 횟수]
+import os
+import re
+import sys
+import time
+
+from ragdata_repo.subscription_extract import (
+    current_dir,
+    extract_metadata_api,
+    extract_metadata_crawl,
+    read_pdf_files,
+    read_pdf_pages,
+)
+
+
+def legacy_metadata_api(text, max_supply_price):
+    """기존 구현: 필드마다 컴파일하지 않은 re.search, 키워드마다 in 검사"""
+    metadata = {
+        "supply_name": None,
+        "region_name": None,
+        "application_schedule": None,
+        "special_supply_conditions": [],
+        "enter_day": None,
+        "max_supply_price": max_supply_price,
+    }
+
+    supply_name_match = re.search(r"입주자모집공고주요정보\s*(.+)", text)
+    if supply_name_match:
+        metadata["supply_name"] = supply_name_match.group(1).strip()
+
+    region_name_match = re.search(r"공급위치\s*(.+)", text)
+    if region_name_match:
+        metadata["region_name"] = region_name_match.group(1).strip()
+
+    schedule_match = re.search(r"당첨자 발표일\s*(\d{4}-\d{2}-\d{2})", text)
+    if schedule_match:
+        metadata["application_schedule"] = schedule_match.group(1).strip()
+
+    special_conditions_keywords = ["다자녀", "신혼부", "생애최", "노부모", "신생아", "청년"]
+    for keyword in special_conditions_keywords:
+        if keyword in text:
+            metadata["special_supply_conditions"].append(keyword)
+
+    enter_day_match = re.search(r"입주예정월 :\s*(\d{4}\.\d{2})", text)
+    if enter_day_match:
+        metadata["enter_day"] = enter_day_match.group(1).strip()
+
+    return metadata
+
+
+def legacy_metadata_crawl(text):
+    """기존 구현: 필드마다 컴파일하지 않은 re.search, 키워드마다 in 검사"""
+    metadata = {
+        "supply_name": None,
+        "region_name": None,
+        "supply_type": None,
+        "area": None,
+        "application_schedule": None,
+        "special_supply_conditions": [],
+    }
+
+    supply_name_match = re.search(r"(.+?)\.pdf 바로보기", text)
+    if supply_name_match:
+        metadata["supply_name"] = supply_name_match.group(1).strip()
+
+    region_name_match = re.search(
+        r"모집지역\s*:\s*(.+?)$|소재지\s*:\s*(.+?)$", text, re.MULTILINE
+    )
+    if region_name_match:
+        region_name = region_name_match.group(1) or region_name_match.group(2)
+        if "확인" not in region_name:
+            metadata["region_name"] = region_name.strip()
+
+    supply_type_match = re.search(r"유형\s*:\s*(.+?)\s", text)
+    if supply_type_match:
+        metadata["supply_type"] = supply_type_match.group(1).strip()
+
+    area_match = re.search(r"전용면적\(㎡\)\s*:\s*(\d+\.\d+)", text)
+    if area_match:
+        metadata["area"] = area_match.group(1).strip()
+
+    schedule_match = re.search(
+        r"접수기간\s*:\s*(\d{4}\.\d{2}\.\d{2})\s*~\s*(\d{4}\.\d{2}\.\d{2})", text
+    )
+    if schedule_match:
+        metadata["application_schedule"] = schedule_match.group(2).strip()
+
+    special_conditions_keywords = ["다자녀", "신혼", "생애", "노부모", "신생아", "청년"]
+    for keyword in special_conditions_keywords:
+        if keyword in text:
+            metadata["special_supply_conditions"].append(keyword)
+
+    return metadata
+
+
+def load_texts(data_path):
+    """data 디렉토리의 PDF 텍스트를 (종류, 텍스트)로 읽음 (텍스트 추출 시간은 측정에서 제외)"""
+    texts = []
+    for kind in ("api", "crawl"):
+        for pdf_path in read_pdf_files(os.path.join(data_path, f"{kind}_data")):
+            try:
+                texts.append((kind, read_pdf_pages(pdf_path)[0]))
+            except Exception as e:
+                print(f"Skipping {pdf_path}: {e}")
+    return texts
+
+
+def run(texts, api_func, crawl_func):
+    return [
+        api_func(text, None) if kind == "api" else crawl_func(text)
+        for kind, text in texts
+    ]
+
+
+def measure(label, texts, api_func, crawl_func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = run(texts, api_func, crawl_func)
+    elapsed = time.perf_counter() - start
+    count = len(texts) * repeat
+    print(f"{label:<24} {elapsed * 1000:10.2f} ms  {count / elapsed:10,.0f} docs/s")
+    return results, elapsed
+
+
+def main(data_path, repeat=20):
+    texts = load_texts(data_path)
+    total_chars = sum(len(text) for _, text in texts)
+    print(f"공고문 {len(texts)}개 (총 {total_chars:,}자), 반복 {repeat}회")
+
+    re.purge()
+    legacy, legacy_elapsed = measure(
+        "legacy re.search", texts, legacy_metadata_api, legacy_metadata_crawl, repeat
+    )
+    scanned, scan_elapsed = measure(
+        "MetadataExtractor", texts, extract_metadata_api, extract_metadata_crawl, repeat
+    )
+
+    mismatches = sum(a != b for a, b in zip(legacy, scanned))
+    print(f"speedup x{legacy_elapsed / scan_elapsed:.1f}, 결과 불일치 {mismatches}건")
+    assert mismatches == 0
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if len(sys.argv) > 1 else os.path.join(current_dir, "data"),
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
@@ -0,0 +1,40 @@
+# PDF 텍스트 병렬 추출 확장성 벤치마크
+# 사용법: python -m benchmarks.bench_pdf_extract [PDF 디렉토리] [최대 작업자 수]
+import os
+import sys
+import time
+
+from ragdata_repo.subscription_extract import (
+    api_data_path,
+    extract_pdfs,
+    read_pdf_files,
+)
+
+
+def main(directory_path, max_workers):
+    pdf_paths = read_pdf_files(directory_path)
+    print(f"PDF {len(pdf_paths)}개, 최대 작업자 {max_workers}개")
+
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        # 캐시 없이 파이프라인과 같은 extract_pdfs로 추출
+        jobs = [("api", pdf_path) for pdf_path in pdf_paths]
+        failures = sum(
+            1 for result in extract_pdfs(jobs, None, workers) if result["error"]
+        )
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(
+            f"workers={workers:<3} {elapsed:8.2f} s  {len(pdf_paths) / elapsed:8.1f} files/s  "
+            f"speedup x{baseline / elapsed:.2f}  failures {failures}"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if len(sys.argv) > 1 else api_data_path,
+        int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count(),
+    )
@@ -0,0 +1,86 @@
+# 다중 프로필 배치 평가 벤치마크: 프로필별 recommend 루프 vs PolicyIndex.query_batch
+# 사용법: python -m benchmarks.bench_policy_batch
+# query_batch의 이득은 대부분 같은 (나이, 지역, 날짜) 프로필의 결과 공유에서 오므로
+# 같은 날 실행하는 배치(중복 많음)와 날짜/나이가 다양한 프로필(중복 거의 없음)을 따로 측정
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.bench_policy_index import synthetic_policies
+from ragdata_repo.policy_index import PolicyIndex, to_datetime
+from ragdata_repo.region_matcher import region_matcher
+
+
+def synthetic_profiles(count, seed=2):
+    """저장된 사용자 프로필과 같은 형태 (같은 날 실행되는 야간 배치 기준)"""
+    rng = random.Random(seed)
+    return [
+        {
+            "user_age": rng.randint(19, 45),
+            "user_region": rng.choice(region_matcher.provinces),
+            "current_date": "2025-01-10",
+        }
+        for _ in range(count)
+    ]
+
+
+def diverse_profiles(count, seed=3):
+    """나이 15~70세, 날짜 2년 범위의 프로필 (대부분의 조합이 서로 다름)"""
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    return [
+        {
+            "user_age": rng.randint(15, 70),
+            "user_region": rng.choice(region_matcher.provinces),
+            "current_date": (start + timedelta(days=rng.randrange(730))).isoformat(),
+        }
+        for _ in range(count)
+    ]
+
+
+def main(policy_count=10_000, profile_count=100_000):
+    policies = synthetic_policies(policy_count)
+    for label, profiles in (
+        ("same-day batch", synthetic_profiles(profile_count)),
+        ("diverse profiles", diverse_profiles(profile_count)),
+    ):
+        distinct = len(
+            {(p["user_age"], p["user_region"], p["current_date"]) for p in profiles}
+        )
+        print(
+            f"[{label}] 정책 {policy_count:,}개, 프로필 {profile_count:,}개 (고유 조합 {distinct:,}개)"
+        )
+        # 앞 측정에서 채워진 나이/지역 비트셋 캐시가 섞이지 않도록 인덱스를 새로 만듦
+        run(PolicyIndex(policies), profiles)
+
+
+def run(index, profiles):
+    profile_count = len(profiles)
+
+    # 기준: 프로필마다 단건 조회 (일부만 측정 후 환산)
+    sample = profiles[:2_000]
+    start = time.perf_counter()
+    loop_results = [
+        tuple(
+            index.query(p["user_age"], p["user_region"], to_datetime(p["current_date"]))
+        )
+        for p in sample
+    ]
+    loop_elapsed = (time.perf_counter() - start) * len(profiles) / len(sample)
+
+    start = time.perf_counter()
+    batch_results = index.query_batch(profiles)
+    batch_elapsed = time.perf_counter() - start
+
+    assert batch_results[: len(sample)] == loop_results, "배치 결과가 단건 조회와 다릅니다"
+    for label, elapsed in (
+        ("per-profile loop", loop_elapsed),
+        ("query_batch", batch_elapsed),
+    ):
+        print(
+            f"{label:<18} {elapsed:8.2f} s  {profile_count / elapsed * 60:14,.0f} profiles/min"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# 정책 자격 필터링 벤치마크: filter_available_policies 선형 탐색 vs 비트셋 인덱스
+# 사용법: python -m benchmarks.bench_policy_index
+import random
+import time
+from datetime import datetime
+
+from ragdata_repo.policy_index import PolicyIndex
+from ragdata_repo.policy_parser import filter_available_policies
+from ragdata_repo.region_matcher import region_matcher
+
+REGION_CODES = region_matcher.provinces + ["전국"]
+
+
+def random_period(rng):
+    kind = rng.random()
+    if kind < 0.2:
+        return {"type": "special_case", "value": "상시"}
+    if kind < 0.25:
+        return None
+    start_year = rng.choice(["2023", "2024", "2025"])
+    end_year = str(int(start_year) + rng.choice([0, 0, 1, 2]))
+    if kind < 0.7:
+        return {
+            "type": "year_month",
+            "start": {"year": start_year, "month": str(rng.randint(1, 12))},
+            "end": {"year": end_year, "month": str(rng.randint(1, 12))},
+        }
+    return {
+        "type": "full_date",
+        "start": {
+            "year": start_year,
+            "month": str(rng.randint(1, 12)),
+            "day": str(rng.randint(1, 28)),
+        },
+        "end": {
+            "year": end_year,
+            "month": str(rng.randint(1, 12)),
+            "day": str(rng.randint(1, 28)),
+        },
+    }
+
+
+def synthetic_policies(count, seed=0):
+    """parse_policy_details 결과와 같은 형태의 합성 정책"""
+    rng = random.Random(seed)
+    policies = []
+    for i in range(count):
+        policies.append(
+            {
+                "title": f"정책 {i}",
+                "description": "",
+                "support_period": random_period(rng),
+                "operating_period": random_period(rng),
+                "age_range": {
+                    "min_age": rng.choice([0, 15, 18, 19, 20]),
+                    "max_age": rng.choice([None, 29, 34, 39, 45]),
+                },
+                "managing_regions": {rng.choice(REGION_CODES)},
+                "residence_regions": {rng.choice(REGION_CODES)},
+                "original_link": "",
+                "details": {},
+            }
+        )
+    return policies
+
+
+def synthetic_queries(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        (
+            rng.randint(19, 39),
+            rng.choice(region_matcher.provinces),
+            datetime(rng.choice([2024, 2025]), rng.randint(1, 12), rng.randint(1, 28)),
+        )
+        for _ in range(count)
+    ]
+
+
+def main(sizes=(1_000, 10_000, 100_000), query_count=50):
+    queries = synthetic_queries(query_count)
+    print(
+        f"{'policies':>10} {'build':>10} {'linear/query':>14} {'index/query':>13} {'speedup':>8}"
+    )
+    for size in sizes:
+        policies = synthetic_policies(size)
+
+        start = time.perf_counter()
+        index = PolicyIndex(policies)
+        build_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        linear_results = [filter_available_policies(policies, *q) for q in queries]
+        linear_elapsed = (time.perf_counter() - start) / len(queries)
+
+        start = time.perf_counter()
+        index_results = [index.recommend(*q) for q in queries]
+        index_elapsed = (time.perf_counter() - start) / len(queries)
+
+        assert linear_results == index_results, "인덱스 결과가 선형 탐색과 다릅니다"
+        print(
+            f"{size:>10,} {build_elapsed * 1000:>8.1f}ms {linear_elapsed * 1000:>12.2f}ms "
+            f"{index_elapsed * 1000:>11.2f}ms {linear_elapsed / index_elapsed:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
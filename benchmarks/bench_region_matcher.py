@@ -0,0 +1,114 @@
+# 지역 분류 벤치마크: 기존 중첩 루프 classify_regions vs Aho-Corasick 오토마톤
+# 사용법: python -m benchmarks.bench_region_matcher [filtered_policies.json 경로]
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+from ragdata_repo.region_matcher import region_matcher, regions
+
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+default_policy_path = os.path.join(current_dir, "data/filtered_policies.json")
+
+# 분류 결과 확인용 (문자열, 기대하는 시도 코드)
+# "경기도 광주시"는 기존 구현에서 광주로 분류되던 경우
+EXPECTED = [
+    ("경기도 광주시", "경기"),
+    ("경기 광주", "경기"),
+    ("광주광역시 북구", "광주"),
+    ("광주광역시, 경기도 광주시", "광주"),
+    ("충청북도 청주시", "충북"),
+    ("강원 고성군", "강원"),
+    ("경남 고성군", "경남"),
+    ("서울특별시", "서울"),
+    ("", "전국"),
+]
+
+
+def legacy_classify_regions(entries, regions):
+    """기존 구현: 시도 키 전체를 훑은 뒤 시군구 목록을 다시 훑음"""
+    result = defaultdict(list)
+
+    for entry in entries:
+        matched = False
+        for regionss in regions.keys():
+            if type(regionss) == tuple:
+                for region in regionss:
+                    if region in entry:
+                        result[regionss[0]].append(entry)
+                        matched = True
+                        break
+                if matched:
+                    break
+            else:
+                if regionss in entry:
+                    result[regionss].append(entry)
+                    matched = True
+                    break
+        if not matched:
+            for region, subregions in regions.items():
+                if any(subregion in entry for subregion in subregions):
+                    result[region].append(entry)
+                    matched = True
+                    break
+        if not matched:
+            result["전국"].append(entry)
+
+    return result
+
+
+def load_region_strings(policy_path):
+    """정책마다 분류 대상인 "주관 기관", "거주지 및 소득" 문자열을 추출"""
+    with open(policy_path, "r", encoding="utf-8") as f:
+        policy_data = json.load(f)
+
+    region_strings = []
+    for policy in policy_data:
+        details = {detail["Title"]: detail["Content"] for detail in policy["Details"]}
+        region_strings.append(details.get("주관 기관", ""))
+        region_strings.append(details.get("거주지 및 소득", ""))
+    return region_strings
+
+
+def check_expected():
+    for text, expected in EXPECTED:
+        result = region_matcher.classify(text)
+        assert result == expected, f"{text!r}: {result} != {expected}"
+    print(f"분류 확인 {len(EXPECTED)}건 통과")
+
+
+def main(policy_path, repeat=20):
+    check_expected()
+    region_strings = load_region_strings(policy_path)
+    print(f"지역 문자열 {len(region_strings)}개, 반복 {repeat}회")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        legacy = [
+            next(iter(legacy_classify_regions([s], regions))) for s in region_strings
+        ]
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        matched = [region_matcher.classify(s) for s in region_strings]
+    matcher_elapsed = time.perf_counter() - start
+
+    # 기존 구현은 시군구로만 매칭된 별칭 시도를 튜플 키로 반환하므로 대표 코드로 맞춰서 비교
+    # ("경기도 광주시"처럼 기존 구현이 잘못 분류하던 문자열은 불일치로 집계됨)
+    legacy = [key[0] if isinstance(key, tuple) else key for key in legacy]
+    agreement = sum(a == b for a, b in zip(legacy, matched)) / max(len(matched), 1)
+
+    count = len(region_strings) * repeat
+    print(
+        f"legacy classify_regions {legacy_elapsed * 1000:10.2f} ms  {count / legacy_elapsed:12,.0f} strings/s"
+    )
+    print(
+        f"RegionMatcher           {matcher_elapsed * 1000:10.2f} ms  {count / matcher_elapsed:12,.0f} strings/s"
+    )
+    print(f"speedup x{legacy_elapsed / matcher_elapsed:.1f}, 결과 일치율 {agreement:.1%}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else default_policy_path)
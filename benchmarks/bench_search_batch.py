@@ -0,0 +1,71 @@
+# 정책 검색 처리량 벤치마크: search_policies 반복 호출 vs search_policies_batch
+# 전체(검색어 임베딩 + 점수 계산)와 점수 계산만(임베딩을 미리 계산) 각각의 초당 검색어 수(QPS)
+# 사용법: python -m benchmarks.bench_search_batch [--queries 1000] [--k 5]
+import argparse
+import time
+
+import numpy as np
+
+from ragdata_repo.llamaindex_search import (
+    embed_queries,
+    load_embed_model,
+    load_search_index,
+    search_policies,
+    search_policies_batch,
+)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def scores_of(results):
+    return [[result["similarity_score"] for result in query] for query in results]
+
+
+def main(args):
+    search_index = load_search_index()
+    index = search_index["index"]
+    query_cache = load_embed_model()["query_cache"]
+
+    # 정책 문장을 검색어로 사용 (중복 제거해서 캐시 적중 없이 측정)
+    sentences = list(dict.fromkeys(index.text(row) for row in range(len(index))))
+    queries = sentences[: args.queries]
+    print(f"문장 {len(index):,}개, 검색어 {len(queries)}개, k={args.k}")
+    print(f"{'':<20} {'loop QPS':>10} {'batch QPS':>10} {'speedup':>8}")
+
+    # 전체: 검색어 임베딩 포함 (매번 검색어 캐시를 비움)
+    query_cache.clear()
+    loop, loop_seconds = timed(lambda: [search_policies(q, args.k) for q in queries])
+    query_cache.clear()
+    batch, batch_seconds = timed(lambda: search_policies_batch(queries, args.k))
+    print(
+        f"{'embed + search':<20} {len(queries) / loop_seconds:10.1f} "
+        f"{len(queries) / batch_seconds:10.1f} x{loop_seconds / batch_seconds:7.1f}"
+    )
+
+    # 점수 계산만: 같은 검색어 임베딩으로 index.search 반복 vs index.search_batch
+    embeddings = embed_queries(queries)
+    loop_rows, loop_seconds = timed(
+        lambda: [index.search(embedding, args.k)[0] for embedding in embeddings]
+    )
+    (batch_rows, _), batch_seconds = timed(
+        lambda: index.search_batch(embeddings, args.k)
+    )
+    print(
+        f"{'search only':<20} {len(queries) / loop_seconds:10.1f} "
+        f"{len(queries) / batch_seconds:10.1f} x{loop_seconds / batch_seconds:7.1f}"
+    )
+
+    # 행렬-행렬 곱과 행렬-벡터 곱의 반올림 차이로 동점 순서는 다를 수 있어 점수로 비교
+    agreement = np.mean([a == b for a, b in zip(scores_of(loop), scores_of(batch))])
+    print(f"top-k 점수 일치 {agreement:.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="정책 검색 배치 처리량 벤치마크")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,88 @@
+# 시작 비용 프로파일: 구성 요소별 import/로드 시간과 메모리(RSS)
+# 각 항목을 새 파이썬 프로세스에서 따로 측정하므로 앞 항목이 불러온 모듈의 영향을 받지 않음
+# 사용법: python -m benchmarks.profile_startup [항목 이름 ...]   (make profile-startup)
+import json
+import os
+import subprocess
+import sys
+
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (항목 이름, 측정 전에 실행할 코드, 측정할 코드)
+COMPONENTS = [
+    ("ragdata_repo", "", "import ragdata_repo"),
+    ("policy_parser", "", "from ragdata_repo import policy_parser"),
+    ("subscription_parser", "", "from ragdata_repo import subscription_parser"),
+    (
+        "financial_product_parser",
+        "",
+        "from ragdata_repo import financial_product_parser",
+    ),
+    ("search_policies (import)", "", "from ragdata_repo import search_policies"),
+    (
+        "search_policies (index load)",
+        "from ragdata_repo.llamaindex_search import load_search_index",
+        "load_search_index()",
+    ),
+    ("llm.prompt_context", "", "import llm.prompt_context"),
+    ("llm.response_generator", "", "import llm.response_generator"),
+    ("main", "", "import main"),
+    ("main OpenAI client", "import main", "main.get_openai_client()"),
+]
+
+# 자식 프로세스에서 실행하는 측정 코드
+_PROBE = """
+import json, resource, sys, time
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        # /proc이 없는 경우(macOS) 최대 RSS로 대신함 (macOS는 바이트, 리눅스는 KB 단위)
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / 2**20 if sys.platform == "darwin" else maxrss / 2**10
+
+exec(sys.argv[1])
+rss_before = rss_mb()
+start = time.perf_counter()
+exec(sys.argv[2])
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "rss_before": rss_before, "rss_after": rss_mb()}))
+"""
+
+
+def measure(setup, statement):
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE, setup, statement],
+        cwd=current_dir,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        last_line = (completed.stderr.strip().splitlines() or ["failed"])[-1]
+        return {"error": last_line}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(names=None):
+    baseline = measure("", "pass")
+    print(f"python 기본 RSS {baseline['rss_after']:.1f} MB")
+    print(f"{'component':<30} {'time':>9} {'RSS':>10} {'ΔRSS':>10}")
+
+    for name, setup, statement in COMPONENTS:
+        if names and name not in names:
+            continue
+        result = measure(setup, statement)
+        if "error" in result:
+            print(f"{name:<30} error: {result['error']}")
+            continue
+        print(
+            f"{name:<30} {result['seconds'] * 1000:7.0f}ms "
+            f"{result['rss_after']:7.1f} MB "
+            f"{result['rss_after'] - result['rss_before']:+7.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,52 @@
+import os
+
+from dotenv import load_dotenv
+
+# 애플리케이션 설정 (환경 변수 또는 .env로 덮어쓸 수 있음)
+load_dotenv()
+
+# 시스템 프롬프트의 정책 섹션에 쓸 최대 토큰 수
+POLICY_TOKEN_BUDGET = int(os.getenv("POLICY_TOKEN_BUDGET", "6000"))
+# 정책 검색 방식 ("filter": 자격 필터 후 키워드 관련도 순, "fused": 자격 필터 후 고민사항 임베딩 유사도 순)
+# fused는 요청마다 임베딩 모델을 쓰므로, 첫 요청이 느려지지 않도록
+# python -m ragdata_repo.policy_vectors 로 정책 임베딩을 미리 만들어 두고 사용
+POLICY_RETRIEVAL = os.getenv("POLICY_RETRIEVAL", "filter")
+# fused 방식에서 임베딩 유사도로 고를 정책 수
+POLICY_SEARCH_TOP_K = int(os.getenv("POLICY_SEARCH_TOP_K", "10"))
+
+# 금융상품 유형(예금/적금/대출)별로 프롬프트에 넣을 상품 수
+FINANCIAL_TOP_K = int(os.getenv("FINANCIAL_TOP_K", "5"))
+
+# 정책 검색 임베딩 백엔드 ("huggingface" 또는 "onnx")
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "huggingface")
+# onnx 백엔드에서 int8 동적 양자화 모델 사용 여부
+EMBED_QUANTIZE = os.getenv("EMBED_QUANTIZE", "0") == "1"
+# 한 번에 임베딩할 문장 수
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+# onnx 백엔드 추론 스레드 수 (0이면 CPU 코어 수)
+# 한 서버에서 여러 워커가 함께 돌 때 코어를 나눠 쓰도록 기본값은 작게 둠
+EMBED_THREADS = int(os.getenv("EMBED_THREADS", "2"))
+
+# 검색어 임베딩 LRU 캐시 크기 (0이면 사용하지 않음)
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+# 검색어 임베딩 캐시를 data/query_embedding_cache.npz에 저장해 재시작 후에도 사용
+QUERY_CACHE_PERSIST = os.getenv("QUERY_CACHE_PERSIST", "0") == "1"
+
+# OpenAI 응답 생성 동시 요청 수 (프로세스 전체에서 동시에 진행 중인 생성 요청 상한, 모든 생성기가 공유)
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+# OpenAI HTTP 연결 풀 크기 (전체 연결 수, 재사용을 위해 유지할 연결 수)
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "32"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "16")
+)
+# OpenAI 요청 제한 시간 (초)
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))
+
+# LLM 응답 캐시 사용 여부 (같은 모델/파라미터/프롬프트면 저장된 응답 사용)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+# 응답 캐시 sqlite 파일 경로 (비워 두면 data/llm_cache.sqlite3)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")
+# 응답 유효 시간 (초, 0이면 만료 없음)
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+# 저장할 응답의 최대 총 크기 (MB)
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "64"))
@@ -0,0 +1,146 @@
+import json
+
+# 스트리밍 JSON 섹션 파서
+# LLM이 토큰 단위로 보내는 JSON 응답에서, 최상위 객체의 각 항목("user_analysis",
+# "recommended_policies", ...) 값이 닫히는 즉시 (키, 값)을 돌려줌
+# 받은 글자는 한 번만 훑고, 완성된 항목의 값 부분만 json.loads로 파싱
+
+_WHITESPACE = " \t\r\n"
+
+
+class JsonSectionParser:
+    """
+    사용 예:
+        parser = JsonSectionParser()
+        for chunk in chunks:
+            for key, value in parser.feed(chunk):
+                ...
+
+    응답 앞뒤의 ```json 같은 텍스트는 첫 "{" 전과 최상위 객체가 닫힌 뒤이므로 무시된다.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.sections = {}
+        self.done = False
+        # 최상위 객체가 시작/끝나는 위치 (text[start:end]가 객체 전체)
+        self.start = None
+        self.end = None
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # 최상위 객체 안에서의 상태: "key" -> "colon" -> "value" -> "after" -> "key" ...
+        self._state = "key"
+        self._token_start = None
+        self._key = None
+
+    def feed(self, chunk):
+        """
+        Args:
+            chunk (str): 새로 받은 텍스트
+
+        Returns:
+            list: 이번 chunk로 완성된 (키, 값) 목록
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            if self.done:
+                break
+            char = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._close_top_level_string(i, completed)
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self.start = i
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state in ("key", "value"):
+                    self._token_start = i
+            elif char in "{[":
+                if self._depth == 1 and self._state == "value":
+                    self._token_start = i
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._state == "value":
+                    self._complete(text[self._token_start : i + 1], completed)
+                elif self._depth == 0:
+                    # 최상위 객체 끝: 값이 숫자/true/false/null이면 여기서 끝남
+                    if self._state == "value" and self._token_start is not None:
+                        self._complete(text[self._token_start : i], completed)
+                    self.done = True
+                    self.end = i + 1
+            elif self._depth == 1:
+                if char == ":" and self._state == "colon":
+                    self._state = "value"
+                    self._token_start = None
+                elif char == ",":
+                    if self._state == "value" and self._token_start is not None:
+                        self._complete(text[self._token_start : i], completed)
+                    self._state = "key"
+                elif (
+                    char not in _WHITESPACE
+                    and self._state == "value"
+                    and self._token_start is None
+                ):
+                    self._token_start = i
+        self._pos = len(text)
+        return completed
+
+    def _close_top_level_string(self, end, completed):
+        token = self.text[self._token_start : end + 1]
+        if self._state == "key":
+            self._key = json.loads(token)
+            self._state = "colon"
+        elif self._state == "value":
+            self._complete(token, completed)
+
+    def _complete(self, token, completed):
+        try:
+            value = json.loads(token)
+        except json.JSONDecodeError:
+            value = token.strip()
+        self.sections[self._key] = value
+        completed.append((self._key, value))
+        self._state = "after"
+        self._token_start = None
+
+
+def parse_json_object(text):
+    """
+    응답 텍스트의 최상위 JSON 객체 (닫히지 않았거나 올바른 JSON이 아니면 None)
+
+    응답 캐시에 저장하기 전에 잘리거나 깨진 응답을 거르는 데 사용
+    """
+    parser = JsonSectionParser()
+    parser.feed(text)
+    if not parser.done:
+        return None
+    try:
+        value = json.loads(text[parser.start : parser.end])
+    except json.JSONDecodeError:
+        return None
+    return value if isinstance(value, dict) and value else None
+
+
+def iter_sections(chunks):
+    """텍스트 조각 iterator에서 완성되는 (키, 값)을 순서대로 yield"""
+    parser = JsonSectionParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
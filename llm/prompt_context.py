@@ -0,0 +1,139 @@
+import json
+import math
+
+try:  # 설치되어 있으면 실제 토크나이저로 토큰 수를 셈
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# 프롬프트 컨텍스트 구성
+# 자격이 되는 정책을 사용자 고민/특별공급조건과의 관련도로 정렬하고,
+# 프롬프트에 필요한 필드만 남긴 뒤 토큰 예산 안에 들어가는 만큼만 담음
+
+# 프롬프트에 넣을 정책 상세 항목 (추천 이유, 신청 자격, 혜택, 신청 방법 작성에 필요한 항목)
+PROMPT_DETAIL_FIELDS = (
+    "정책 소개",
+    "지원 내용",
+    "연령",
+    "거주지 및 소득",
+    "사업 신청 기간",
+    "신청 절차",
+    "주관 기관",
+)
+# 항목 하나가 예산을 혼자 차지하지 않도록 항목별 최대 글자 수
+MAX_FIELD_CHARS = 300
+# 필드별 관련도 가중치 (제목에 고민 키워드가 있으면 더 관련 있는 정책으로 봄)
+TITLE_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 2.0
+DETAIL_WEIGHT = 1.0
+
+# None: 아직 로드하지 않음, False: 로드 실패 (글자 수로 어림)
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        try:
+            # 처음 사용할 때 인코딩 파일을 내려받으므로 오프라인이면 실패할 수 있음
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            print(f"Error loading tiktoken encoding, estimating tokens by length: {e}")
+            _encoding = False
+    return _encoding
+
+
+def estimate_tokens(text):
+    """
+    텍스트의 토큰 수. tiktoken이 없거나 인코딩을 불러오지 못하면
+    한글 1글자 = 1토큰, 그 외 4글자 = 1토큰으로 어림
+    """
+    encoding = _get_encoding() if tiktoken is not None else False
+    if encoding:
+        return len(encoding.encode(text))
+
+    ascii_chars = sum(1 for char in text if char.isascii())
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def _bigrams(text):
+    """공백을 제거한 글자 2-gram 집합 (형태소 분석 없이 한국어 키워드 겹침을 보기 위함)"""
+    compact = "".join(str(text).split())
+    return {compact[i : i + 2] for i in range(len(compact) - 1)}
+
+
+def score_policy(policy, query_bigrams):
+    """정책과 질의(고민 + 특별공급조건)가 공유하는 2-gram 수의 가중합"""
+    if not query_bigrams:
+        return 0.0
+    details_text = " ".join(str(value) for value in policy["details"].values())
+    return (
+        TITLE_WEIGHT * len(query_bigrams & _bigrams(policy["title"]))
+        + DESCRIPTION_WEIGHT * len(query_bigrams & _bigrams(policy["description"]))
+        + DETAIL_WEIGHT * len(query_bigrams & _bigrams(details_text))
+    ) / len(query_bigrams)
+
+
+def project_policy(policy):
+    """프롬프트에 필요한 필드만 남긴 정책"""
+    projected = {"title": policy["title"], "description": policy["description"]}
+    for field in PROMPT_DETAIL_FIELDS:
+        value = policy["details"].get(field)
+        if value:
+            value = str(value).strip()
+            if len(value) > MAX_FIELD_CHARS:
+                value = value[:MAX_FIELD_CHARS] + "…"
+            projected[field] = value
+    if policy.get("link"):
+        projected["link"] = policy["link"]
+    return projected
+
+
+def select_policies(
+    policies, concerns, special_supply_conditions, token_budget, rank=True
+):
+    """
+    관련도가 높은 정책부터 토큰 예산 안에 담음
+
+    Args:
+        policies (list): policy_parser 결과
+        concerns (str): 사용자 고민 사항
+        special_supply_conditions (list | str): 특별 공급 조건
+        token_budget (int): 정책 섹션에 쓸 최대 토큰 수
+        rank (bool): False면 이미 정렬된 순서(예: policy_search의 유사도 순)를 그대로 사용
+
+    Returns:
+        tuple: (선택된 정책 목록, {"selected", "dropped", "tokens", "budget"} 리포트)
+    """
+    if isinstance(special_supply_conditions, str):
+        special_supply_conditions = [special_supply_conditions]
+    query = " ".join([concerns or ""] + list(special_supply_conditions or []))
+    query_bigrams = _bigrams(query)
+
+    # 관련도 내림차순, 같으면 원래 순서 유지
+    if rank:
+        ranked = sorted(
+            enumerate(policies),
+            key=lambda item: (-score_policy(item[1], query_bigrams), item[0]),
+        )
+    else:
+        ranked = list(enumerate(policies))
+
+    selected = []
+    used_tokens = estimate_tokens("[]")
+    for _, policy in ranked:
+        projected = project_policy(policy)
+        # 항목 사이 구분자(", ")까지 포함한 토큰 수
+        cost = estimate_tokens(json.dumps(projected, ensure_ascii=False)) + 1
+        if used_tokens + cost > token_budget:
+            continue
+        selected.append(projected)
+        used_tokens += cost
+
+    report = {
+        "selected": len(selected),
+        "dropped": len(policies) - len(selected),
+        "tokens": estimate_tokens(json.dumps(selected, ensure_ascii=False)),
+        "budget": token_budget,
+    }
+    return selected, report
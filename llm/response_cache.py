@@ -0,0 +1,311 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+# LLM 응답 캐시
+# 같은 프로필은 같은 프롬프트를 만들므로, (모델, 파라미터, 시스템/사용자 프롬프트 해시)가 같으면
+# 저장된 응답을 돌려줌. sqlite(WAL)에 저장해서 여러 워커 프로세스가 같은 파일을 함께 사용하고,
+# 적중/실패 횟수도 파일에 기록해 프로세스 전체 기준으로 집계
+
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+default_cache_path = os.path.join(current_dir, "data/llm_cache.sqlite3")
+
+# 키 구성이 바뀌면 값을 올려서 이전 응답을 쓰지 않도록 함
+CACHE_KEY_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO stats VALUES ('hits', 0), ('misses', 0), ('evictions', 0);
+"""
+
+
+def cache_key(model, params, system_prompt, prompt):
+    """모델, 생성 파라미터, 시스템/사용자 프롬프트로 만든 sha256 키"""
+    payload = json.dumps(
+        {
+            "version": CACHE_KEY_VERSION,
+            "model": model,
+            "params": params,
+            "system_prompt": system_prompt,
+            "prompt": prompt,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    sqlite 응답 캐시 (TTL + 전체 크기 제한, 오래 사용하지 않은 응답부터 삭제)
+
+    Attributes:
+        ttl_seconds (float): 응답 유효 시간 (0이면 만료 없음)
+        max_bytes (int): 저장할 응답 텍스트의 최대 총 바이트 수
+    """
+
+    def __init__(self, path=default_cache_path, ttl_seconds=86400, max_bytes=64 << 20):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        # sqlite 연결은 스레드 사이에 공유하지 않음
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: 자동 커밋, 여러 문장은 BEGIN IMMEDIATE로 직접 묶음
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _expired(self, created_at, now):
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _count(self, conn, name, amount=1):
+        conn.execute(
+            "UPDATE stats SET value = value + ? WHERE name = ?", (amount, name)
+        )
+
+    def get(self, key):
+        """저장된 응답 (없거나 만료되었으면 None, 만료된 응답은 삭제)"""
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or self._expired(row[1], now):
+            if row is not None:
+                # 읽기만 많은 경우에도 만료된 응답이 크기 제한을 차지하지 않도록 바로 삭제
+                # (그 사이 다른 프로세스가 새로 저장했으면 지우지 않음)
+                removed = conn.execute(
+                    "DELETE FROM responses WHERE key = ? AND created_at = ?",
+                    (key, row[1]),
+                ).rowcount
+                if removed:
+                    self._count(conn, "evictions")
+            self._count(conn, "misses")
+            return None
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self._count(conn, "hits")
+        return row[0]
+
+    def put(self, key, model, response):
+        conn = self._connect()
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn, now):
+        removed = 0
+        if self.ttl_seconds > 0:
+            removed += conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+
+        (total,) = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total > self.max_bytes:
+            # 오래 사용하지 않은 응답부터 초과한 크기만큼 삭제
+            keys = []
+            for key, size in conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                keys.append((key,))
+                total -= size
+            conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+            removed += len(keys)
+        if removed:
+            self._count(conn, "evictions", removed)
+
+    def stats(self):
+        """모든 프로세스를 합친 적중/실패 횟수와 저장 크기"""
+        conn = self._connect()
+        counts = dict(conn.execute("SELECT name, value FROM stats"))
+        entries, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        total = counts["hits"] + counts["misses"]
+        return {
+            **counts,
+            "hit_rate": counts["hits"] / total if total else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM responses")
+        conn.execute("UPDATE stats SET value = 0")
+        conn.execute("COMMIT")
+
+
+class CachedResponseGenerator:
+    """
+    OpenAIResponseGenerator와 같은 메서드로, 같은 요청이면 캐시된 응답을 돌려줌
+
+    정상적으로 끝난(finish_reason == "stop") 응답 중 validate를 통과한 응답만 저장한다.
+    (max_tokens에 걸려 잘리거나 형식이 깨진 응답을 TTL 동안 계속 돌려주지 않도록)
+
+    Attributes:
+        validate (callable): 응답 텍스트를 받아 저장해도 되면 True (None이면 확인하지 않음)
+    """
+
+    def __init__(
+        self,
+        generator,
+        cache: ResponseCache,
+        validate: Optional[Callable[[str], bool]] = None,
+    ):
+        self.generator = generator
+        self.cache = cache
+        self.validate = validate
+
+    @staticmethod
+    def _key(prompt, model, temperature, max_tokens, system_prompt):
+        params = {"temperature": temperature, "max_tokens": max_tokens}
+        return cache_key(model, params, system_prompt, prompt)
+
+    def _cacheable(self, response, finish_reason):
+        if response is None or finish_reason != "stop":
+            return False
+        return self.validate is None or self.validate(response)
+
+    def _stream(self, key, model, chunks) -> Iterator[str]:
+        # 끝까지 받은 응답만 저장 (중간에 그만 읽거나 오류가 나면 저장하지 않음)
+        received = []
+        finish_reason = yield from _record(chunks, received)
+        response = "".join(received)
+        if self._cacheable(response, finish_reason):
+            self.cache.put(key, model, response)
+        return finish_reason
+
+    def generate_response(
+        self,
+        prompt: str,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.1,
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
+        stream: bool = False,
+        with_finish_reason: bool = False,
+        refresh: bool = False,
+    ) -> Union[str, Tuple[str, str], Iterator[str]]:
+        # refresh=True면 저장된 응답을 쓰지 않고 새로 생성 (정상 응답이면 새로 저장)
+        key = self._key(prompt, model, temperature, max_tokens, system_prompt)
+        cached = None if refresh else self.cache.get(key)
+        if cached is not None:
+            # 정상 종료된 응답만 저장되어 있음
+            if stream:
+                return _cached_stream(cached)
+            return (cached, "stop") if with_finish_reason else cached
+
+        params = dict(
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            system_prompt=system_prompt,
+        )
+        if stream:
+            chunks = self.generator.generate_response(prompt, stream=True, **params)
+            return self._stream(key, model, chunks)
+
+        response, finish_reason = self.generator.generate_response(
+            prompt, with_finish_reason=True, **params
+        )
+        if self._cacheable(response, finish_reason):
+            self.cache.put(key, model, response)
+        return (response, finish_reason) if with_finish_reason else response
+
+    async def agenerate_response(
+        self,
+        prompt: str,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.1,
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
+        with_finish_reason: bool = False,
+        refresh: bool = False,
+    ) -> Union[str, Tuple[str, str]]:
+        key = self._key(prompt, model, temperature, max_tokens, system_prompt)
+        # sqlite 조회/저장은 이벤트 루프를 막지 않도록 스레드에서 실행
+        cached = None if refresh else await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return (cached, "stop") if with_finish_reason else cached
+
+        response, finish_reason = await self.generator.agenerate_response(
+            prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            system_prompt=system_prompt,
+            with_finish_reason=True,
+        )
+        if self._cacheable(response, finish_reason):
+            await asyncio.to_thread(self.cache.put, key, model, response)
+        return (response, finish_reason) if with_finish_reason else response
+
+    def close(self):
+        self.generator.close()
+
+
+def _record(chunks, received):
+    # 조각을 그대로 내보내면서 received에 모으고, 원래 스트림의 반환값(finish_reason)을 돌려줌
+    iterator = iter(chunks)
+    while True:
+        try:
+            chunk = next(iterator)
+        except StopIteration as stop:
+            return stop.value
+        received.append(chunk)
+        yield chunk
+
+
+def _cached_stream(response):
+    yield response
+    return "stop"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM 응답 캐시 통계")
+    parser.add_argument("--path", default=default_cache_path)
+    parser.add_argument("--clear", action="store_true", help="저장된 응답과 통계 삭제")
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.path)
+    if args.clear:
+        cache.clear()
+    print(json.dumps(cache.stats(), indent=2))
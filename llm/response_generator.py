@@ -1,38 +1,215 @@
-from typing import Optional, List
-from openai import OpenAI
+import asyncio
+import queue
+import threading
+from typing import Iterator, Optional, List, Tuple, Union
+
+import httpx
+from openai import AsyncOpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from config.settings import (
+    OPENAI_MAX_CONCURRENCY,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    OPENAI_TIMEOUT,
+)
+
+# 응답 생성은 프로세스에 하나인 백그라운드 이벤트 루프에서 비동기 클라이언트로 처리
+# 요청마다 스레드를 붙잡지 않고, HTTP 연결 풀과 동시 요청 수 제한을 모든 요청이 공유함
+
+_loop = None
+_loop_lock = threading.Lock()
+# 동시에 진행 중인 생성 요청 수 제한 (백그라운드 루프에서 만들고 모든 생성기가 공유)
+_semaphore = None
+
+
+class _StreamEnd:
+    """스트리밍 응답의 끝을 알리는 값 (finish_reason: "stop", "length" 등, 오류로 끝나면 None)"""
+
+    def __init__(self, finish_reason=None):
+        self.finish_reason = finish_reason
+
+
+def get_background_loop():
+    """응답 생성용 이벤트 루프 (처음 호출할 때 데몬 스레드에서 시작)"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="openai-event-loop", daemon=True
+            ).start()
+            _loop = loop
+    return _loop
+
+
+def _request_limit():
+    # 백그라운드 루프 안에서만 호출하므로 잠금 없이 한 번만 생성됨
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+    return _semaphore
+
 
 class OpenAIResponseGenerator:
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        max_connections: int = OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections: int = OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        timeout: float = OPENAI_TIMEOUT,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.loop = get_background_loop()
+        # 연결 풀을 재사용하는 비동기 HTTP 클라이언트 (백그라운드 루프에서만 사용)
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            timeout=timeout,
+            http_client=http_client
+            or httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                ),
+                timeout=timeout,
+            ),
+        )
 
     # API호출 실패시 최대3번 시도
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
     )
 
-    # 응답 생성 메서드
-    def generate_response(
-        self,
-        prompt: str,
-        model: str = "gpt-4o-mini",
-        temperature: float = 0.1,  # 응답의 창의성 수준 (0.1은 매우 일관된 응답)
-        max_tokens: Optional[int] = None,
-        system_prompt: Optional[str] = None,
-    ) -> str:
+    # 백그라운드 루프에서 실행되는 응답 생성
+    # (동시 요청 자리는 시도마다 잡고 놓으므로 재시도 대기 중에는 다른 요청이 진행됨)
+    async def _create(self, messages: List[dict], **params) -> Tuple[str, str]:
+        # 프로세스 전체에서 동시에 진행 중인 요청이 OPENAI_MAX_CONCURRENCY개를 넘지 않도록 대기
+        async with _request_limit():
+            response = await self.client.chat.completions.create(
+                messages=messages, **params
+            )
+
+        choice = response.choices[0]  # 여러응답중 보통 첫번째껄 사용한다고함
+        return choice.message.content, choice.finish_reason
+
+    # 스트림 요청도 연결 단계에서 실패하면 최대3번 시도 (받기 시작한 스트림은 다시 요청하지 않음)
+    @retry(
+        stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
+    )
+    async def _open_stream(self, messages: List[dict], **params):
+        # 시도마다 동시 요청 자리를 잡고, 실패하면 재시도 대기 전에 돌려줌
+        # 성공하면 자리를 잡은 채로 스트림을 반환 (_stream_into가 스트림을 닫은 뒤 돌려줌)
+        await _request_limit().acquire()
+        try:
+            return await self.client.chat.completions.create(
+                messages=messages, stream=True, **params
+            )
+        except BaseException:
+            _request_limit().release()
+            raise
+
+    async def _stream_into(self, sink: queue.Queue, messages: List[dict], **params):
+        """받은 텍스트 조각을 sink에 넣고, 끝나면 _StreamEnd (오류는 예외 객체)"""
+        finish_reason = None
+        try:
+            stream = await self._open_stream(messages, **params)
+            try:
+                # 끝까지 읽거나 중간에 취소되어도 스트림을 닫아 HTTP 연결을 풀에 돌려줌
+                async with stream:
+                    async for chunk in stream:
+                        if not chunk.choices:
+                            continue
+                        if chunk.choices[0].delta.content:
+                            sink.put(chunk.choices[0].delta.content)
+                        if chunk.choices[0].finish_reason:
+                            finish_reason = chunk.choices[0].finish_reason
+            finally:
+                _request_limit().release()
+        except Exception as e:
+            sink.put(e)
+        finally:
+            sink.put(_StreamEnd(finish_reason))
+
+    def _iter_stream(self, messages: List[dict], **params) -> Iterator[str]:
+        # 끝까지 읽으면 제너레이터의 반환값(StopIteration.value)이 finish_reason
+        sink = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._stream_into(sink, messages, **params), self.loop
+        )
+        try:
+            while True:
+                item = sink.get()
+                if isinstance(item, _StreamEnd):
+                    return item.finish_reason
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # 호출자가 중간에 그만 읽으면 요청을 취소해서 연결과 동시 요청 자리를 돌려줌
+            future.cancel()
+
+    @staticmethod
+    def _messages(prompt, system_prompt):
         messages = []
         if system_prompt:  # 시스템 프롬프트가 있을 시 먼저 추가
             messages.append({"role": "system", "content": system_prompt})
         # 사용자 프롬프트 추가
         messages.append({"role": "user", "content": prompt})
+        return messages
 
-        # 응답생성
-        response = self.client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
+    def _submit(self, prompt, model, temperature, max_tokens, system_prompt):
+        return asyncio.run_coroutine_threadsafe(
+            self._create(
+                self._messages(prompt, system_prompt),
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            ),
+            self.loop,
         )
 
-        return response.choices[0].message.content  # 여러응답중 보통 첫번째껄 사용한다고함
+    # 비동기 응답 생성 메서드 (어느 이벤트 루프에서 await해도 됨)
+    async def agenerate_response(
+        self,
+        prompt: str,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.1,  # 응답의 창의성 수준 (0.1은 매우 일관된 응답)
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
+        with_finish_reason: bool = False,  # True면 (응답, finish_reason) 반환
+    ) -> Union[str, Tuple[str, str]]:
+        future = self._submit(prompt, model, temperature, max_tokens, system_prompt)
+        content, finish_reason = await asyncio.wrap_future(future)
+        return (content, finish_reason) if with_finish_reason else content
+
+    # 응답 생성 메서드 (기존 동기 호출용, 백그라운드 루프의 결과를 기다림)
+    def generate_response(
+        self,
+        prompt: str,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.1,  # 응답의 창의성 수준 (0.1은 매우 일관된 응답)
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
+        stream: bool = False,  # True면 받은 텍스트 조각을 순서대로 내주는 iterator 반환
+        with_finish_reason: bool = False,  # True면 (응답, finish_reason) 반환 (stream=False일 때)
+    ) -> Union[str, Tuple[str, str], Iterator[str]]:
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self.loop:  # 루프 안에서 결과를 기다리면 교착 상태가 됨
+            raise RuntimeError("Use agenerate_response inside the event loop")
+        if stream:
+            return self._iter_stream(
+                self._messages(prompt, system_prompt),
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        future = self._submit(prompt, model, temperature, max_tokens, system_prompt)
+        content, finish_reason = future.result()
+        return (content, finish_reason) if with_finish_reason else content
+
+    def close(self):
+        """HTTP 연결 풀 정리"""
+        asyncio.run_coroutine_threadsafe(self.client.close(), self.loop).result()
@@ -1,18 +1,85 @@
 import os
+import threading
 from datetime import datetime
 from ragdata_repo import (
     subscription_parser,
     policy_parser,
+    policy_search,
     financial_product_parser,
 )
-from llm.response_generator import OpenAIResponseGenerator
+from llm.json_stream import parse_json_object
+from llm.prompt_context import select_policies
+from config.settings import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_MB,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL,
+    POLICY_RETRIEVAL,
+    POLICY_SEARCH_TOP_K,
+    POLICY_TOKEN_BUDGET,
+)
 from dotenv import load_dotenv
 import json
-import pandas as pd
 
 load_dotenv()
 API_KEY = os.getenv("API_KEY")
-openai_client = OpenAIResponseGenerator(api_key=API_KEY)
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+# 응답 JSON에 있어야 하는 섹션 (프롬프트의 출력 형식과 같은 순서)
+PLAN_KEYS = (
+    "user_analysis",
+    "recommended_policies",
+    "recommended_financial_products",
+    "recommended_housing_products",
+    "monthly_savings_plan",
+    "step_by_step_plan",
+)
+
+
+def get_openai_client():
+    # OpenAI 클라이언트는 처음 응답을 생성할 때 만듦 (openai 패키지 import 포함)
+    global _openai_client
+    if _openai_client is not None:
+        return _openai_client
+
+    # 여러 세션이 동시에 처음 요청해도 클라이언트(연결 풀)는 하나만 만듦
+    with _openai_client_lock:
+        if _openai_client is None:
+            _openai_client = _create_openai_client()
+    return _openai_client
+
+
+def _create_openai_client():
+    from llm.response_generator import OpenAIResponseGenerator
+
+    client = OpenAIResponseGenerator(api_key=API_KEY)
+    if LLM_CACHE_ENABLED:
+        # 같은 프로필/문서로 만든 같은 프롬프트는 저장된 응답 사용
+        from llm.response_cache import (
+            CachedResponseGenerator,
+            ResponseCache,
+            default_cache_path,
+        )
+
+        client = CachedResponseGenerator(
+            client,
+            ResponseCache(
+                LLM_CACHE_PATH or default_cache_path,
+                ttl_seconds=LLM_CACHE_TTL,
+                max_bytes=LLM_CACHE_MAX_MB << 20,
+            ),
+            # 끝까지 받은 완성된 플랜 JSON만 저장
+            validate=is_complete_plan,
+        )
+    return client
+
+
+def is_complete_plan(text):
+    """응답이 모든 섹션을 가진 플랜 JSON인지"""
+    plan = parse_json_object(text)
+    return plan is not None and all(key in plan for key in PLAN_KEYS)
+
 
 class RequestData:
     def __init__(
@@ -51,30 +118,52 @@ class RequestData:
         }
 
 
-def get_document(request_data: RequestData):
-    # 정책 임베딩(고민에 맞는)
-    #embedding_policies_doc = search_policies(request_data.concerns)
-
-    # 정책 파싱
-    parser_policies_doc = policy_parser(
-        {
-            "current_date": request_data.current_date.strftime("%Y-%m-%d"),
-            "user_age": request_data.user_age,
-            "user_region": request_data.user_region,
-            "debug": request_data.debug,
-            "debugDate": request_data.debugDate,
-        }
+def build_prompts(request_data: RequestData):
+    """사용자 정보로 검색/파싱한 문서를 넣은 (프롬프트, 시스템 프롬프트)"""
+    policy_input = {
+        "current_date": request_data.current_date.strftime("%Y-%m-%d"),
+        "user_age": request_data.user_age,
+        "user_region": request_data.user_region,
+        "debug": request_data.debug,
+        "debugDate": request_data.debugDate,
+    }
+    if POLICY_RETRIEVAL == "fused":
+        # 정책 파싱 + 임베딩(고민에 맞는): 자격이 되는 정책만 고민 사항과의 유사도로 검색
+        parser_policies_doc = policy_search(
+            {**policy_input, "concerns": request_data.concerns},
+            k=POLICY_SEARCH_TOP_K,
+        )
+    else:
+        # 정책 파싱
+        parser_policies_doc = policy_parser(policy_input)
+    # 고민 사항과 관련도가 높은 정책부터 토큰 예산 안에서 선택 (fused는 유사도 순서 그대로)
+    selected_policies, policy_report = select_policies(
+        parser_policies_doc,
+        request_data.concerns,
+        request_data.special_supply_conditions,
+        POLICY_TOKEN_BUDGET,
+        rank=POLICY_RETRIEVAL != "fused",
     )
+    if request_data.debug:
+        print("정책 선택", policy_report)
+
     # 금융 파싱(추가예정)
     parser_financial_doc = financial_product_parser(
         {"main_bank": request_data.mainbank}
     )
+    # DataFrame (pandas는 financial_parser에서 불러옴)
+    if hasattr(parser_financial_doc, "to_json"):
+        # 유형별 금리순 상위 상품을 구조화된 레코드로 전달 (DataFrame의 str()은 긴 문장을 잘라냄)
+        parser_financial_doc = parser_financial_doc.to_json(
+            orient="records", force_ascii=False
+        )
 
     # 청약 파싱
     parser_subscription_doc = subscription_parser(
         {
             "user_region": request_data.user_region,
             "special_supply_conditions": request_data.special_supply_conditions,
+            "current_date": request_data.current_date.strftime("%Y-%m-%d"),
         }
     )
 
@@ -83,8 +172,7 @@ def get_document(request_data: RequestData):
     # print("청약", parser_subscription_doc)
 #   
 
-    response = openai_client.generate_response(
-        prompt=f'''
+    prompt = f'''
         당신은 2030 청년 대상의 주거 문제를 해결하는 고객 맞춤형 금융 전문가입니다.
         다음 내용을 포함한 종합 금융 플랜을 작성해주세요:
         사용자의 나이, 지역, 고민을 분석하고,  그에 맞는 정책,금융 상품,청약을 정보를 제공합니다.
@@ -207,12 +295,12 @@ def get_document(request_data: RequestData):
     """
             
 
-        ''',
-        system_prompt=f"""
+        '''
+    system_prompt = f"""
 아래 문서를 기반으로 답변 해주세요.
 ===============================================
 policies_doc : 
-{str(parser_policies_doc)}
+{json.dumps(selected_policies, ensure_ascii=False)}
 ===============================================
 financial_doc : 
 {str(parser_financial_doc)}
@@ -221,10 +309,25 @@ subscription_doc :
 {str(parser_subscription_doc)}
 ===============================================
 
-        """,
+        """
+    return prompt, system_prompt
+
+
+def get_document(
+    request_data: RequestData, stream: bool = False, refresh: bool = False
+):
+    """
+    주거 마련 계획 JSON 생성
+
+    stream=True면 응답 텍스트 조각 iterator를 반환 (llm.json_stream으로 완성된 섹션부터 파싱)
+    refresh=True면 저장된 응답을 쓰지 않고 새로 생성 (응답 캐시를 사용할 때)
+    """
+    prompt, system_prompt = build_prompts(request_data)
+    client = get_openai_client()
+    params = {"refresh": True} if refresh and LLM_CACHE_ENABLED else {}
+    return client.generate_response(
+        prompt=prompt, system_prompt=system_prompt, stream=stream, **params
     )
-    
-    return response
 
 
 if __name__ == "__main__":
@@ -1,14 +1,56 @@
 # subscription_parser, policy_parser, llamaindex_search 모듈에서 필요한 함수들을 가져옴
-from .subscription_parser import subscription_parser  # 구독 관련 데이터를 처리하는 파서
-from .policy_parser import policy_parser  # 정책 데이터를 처리하는 파서
-from .llamaindex_search import search_policies  # 정책 검색 기능을 제공하는 함수
-from .financial_parser import financial_product_parser
+# 모듈은 처음 사용할 때 불러옴 (policy_parser만 쓰는 경우 pandas, llama_index, 임베딩 모델을 불러오지 않도록)
+import importlib
+import sys
+import types
+
+# 공개 함수 -> 정의된 서브모듈
+_LAZY_ATTRS = {
+    "subscription_parser": ".subscription_parser",  # 구독 관련 데이터를 처리하는 파서
+    "policy_parser": ".policy_parser",  # 정책 데이터를 처리하는 파서
+    "policy_parser_batch": ".policy_parser",  # 여러 프로필을 한 번에 처리하는 정책 파서
+    "policy_search": ".policy_parser",  # 자격 필터 후 고민사항 임베딩으로 정책 검색
+    "search_policies": ".llamaindex_search",  # 정책 검색 기능을 제공하는 함수
+    "financial_product_parser": ".financial_parser",
+}
 
 # __all__을 사용하여 이 모듈에서 공개할 함수 목록을 정의
 # 다른 모듈에서 "from module_name import *"로 가져올 때 아래 함수들만 가져오도록 제한함
 __all__ = [
     "subscription_parser",
     "policy_parser",
+    "policy_parser_batch",
+    "policy_search",
     "search_policies",
     "financial_product_parser",
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+    value = getattr(module, name)
+    # 다음부터는 일반 속성으로 바로 찾도록 저장
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _LazyPackage(types.ModuleType):
+    def __setattr__(self, name, value):
+        # policy_parser처럼 함수와 이름이 같은 서브모듈을 불러오면 import 시스템이 패키지 속성을
+        # 서브모듈로 바꾸므로, 즉시 불러오던 때처럼 함수가 보이도록 함수를 저장
+        if (
+            name in _LAZY_ATTRS
+            and isinstance(value, types.ModuleType)
+            and value.__name__ == f"{self.__name__}.{name}"
+        ):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyPackage
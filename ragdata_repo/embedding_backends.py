@@ -0,0 +1,222 @@
+import os
+from typing import Any, List
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from pydantic import PrivateAttr
+
+# 정책 문장/검색어 임베딩 백엔드
+# - "huggingface": 기존 HuggingFaceEmbedding (PyTorch, fp32)
+# - "onnx": ONNX Runtime으로 내보낸 같은 모델 (선택적으로 int8 동적 양자화)
+# 두 백엔드 모두 llama_index의 BaseEmbedding이라 VectorStoreIndex에 그대로 넘길 수 있음
+
+current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+onnx_model_dir = os.path.join(current_dir, "data/onnx")
+
+EMBED_BACKENDS = ("huggingface", "onnx")
+
+# all-mpnet-base-v2의 sentence-transformers 설정과 같은 최대 토큰 수
+MAX_SEQ_LENGTH = 384
+
+
+def embed_model_id(backend, model_name, quantize=False):
+    """인덱스 manifest에 기록할 임베딩 식별자 (백엔드/양자화가 바뀌면 인덱스를 다시 만들도록)"""
+    if backend == "huggingface":
+        return model_name
+    return f"{backend}{'-int8' if quantize else ''}:{model_name}"
+
+
+def onnx_model_path(model_name, quantize=False):
+    model_dir = os.path.join(onnx_model_dir, model_name.replace("/", "__"))
+    return os.path.join(model_dir, "model.int8.onnx" if quantize else "model.onnx")
+
+
+def export_onnx(model_name, quantize=False):
+    """
+    HuggingFace 모델을 ONNX로 내보내고, quantize면 가중치를 int8로 동적 양자화
+
+    토크나이저도 같은 디렉토리에 저장해서 이후에는 torch 없이 ONNX Runtime만으로 임베딩할 수 있다.
+
+    Returns:
+        str: ONNX 모델 경로
+    """
+    fp32_path = onnx_model_path(model_name)
+    model_dir = os.path.dirname(fp32_path)
+    os.makedirs(model_dir, exist_ok=True)
+
+    if not os.path.exists(fp32_path):
+        # 내보낼 때만 torch가 필요함 (이미 내보낸 모델을 양자화할 때는 불필요)
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModel.from_pretrained(model_name)
+        model.eval()
+        sample = tokenizer(["정책 검색 예시 문장"], return_tensors="pt")
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            fp32_path + ".tmp",
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=14,
+        )
+        os.replace(fp32_path + ".tmp", fp32_path)
+        tokenizer.save_pretrained(model_dir)
+
+    if not quantize:
+        return fp32_path
+
+    int8_path = onnx_model_path(model_name, quantize=True)
+    if not os.path.exists(int8_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(fp32_path, int8_path + ".tmp", weight_type=QuantType.QInt8)
+        os.replace(int8_path + ".tmp", int8_path)
+    return int8_path
+
+
+class OnnxEmbedding(BaseEmbedding):
+    """
+    ONNX Runtime 임베딩 (sentence-transformers와 같은 mean pooling + L2 정규화)
+
+    embed_batch_size개씩 묶어서 추론하고, 스레드 수는 threads로 제한한다.
+    """
+
+    onnx_path: str
+    threads: int = 1
+    _session: Any = PrivateAttr()
+    _tokenizer: Any = PrivateAttr()
+    _input_names: Any = PrivateAttr()
+
+    def __init__(
+        self,
+        model_name: str,
+        quantize: bool = False,
+        embed_batch_size: int = 32,
+        threads: int = 1,
+        **kwargs: Any,
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        onnx_path = onnx_model_path(model_name, quantize)
+        if not os.path.exists(onnx_path):
+            print(f"Exporting {model_name} to ONNX ({'int8' if quantize else 'fp32'})")
+            export_onnx(model_name, quantize)
+
+        super().__init__(
+            model_name=model_name,
+            onnx_path=onnx_path,
+            embed_batch_size=embed_batch_size,
+            threads=threads,
+            **kwargs,
+        )
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(
+            onnx_path, options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {
+            model_input.name for model_input in self._session.get_inputs()
+        }
+        self._tokenizer = AutoTokenizer.from_pretrained(os.path.dirname(onnx_path))
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "OnnxEmbedding"
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        import numpy as np
+
+        embeddings = []
+        for start in range(0, len(texts), self.embed_batch_size):
+            batch = self._tokenizer(
+                texts[start : start + self.embed_batch_size],
+                padding=True,
+                truncation=True,
+                max_length=MAX_SEQ_LENGTH,
+                return_tensors="np",
+            )
+            inputs = {
+                name: batch[name].astype(np.int64)
+                for name in self._input_names
+                if name in batch
+            }
+            hidden = self._session.run(None, inputs)[0]
+
+            # 패딩 토큰을 제외한 평균 후 L2 정규화
+            mask = batch["attention_mask"][..., None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(
+                np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None
+            )
+            embeddings.extend(pooled.tolist())
+        return embeddings
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed([query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts)
+
+
+def get_query_embedding_batch(embed_model, queries):
+    """
+    여러 검색어를 embed_batch_size개씩 묶어서 임베딩
+
+    llama_index의 BaseEmbedding에는 검색어 일괄 임베딩이 없으므로, 검색어/문장 임베딩이
+    같은 백엔드(지시문이 없는 HuggingFace, ONNX)는 문장 일괄 임베딩을 쓰고
+    그 외에는 get_query_embedding을 하나씩 호출한다.
+    """
+    same_as_text = embed_model.class_name() in (
+        "HuggingFaceEmbedding",
+        "OnnxEmbedding",
+    ) and not (
+        getattr(embed_model, "query_instruction", None)
+        or getattr(embed_model, "text_instruction", None)
+    )
+    if same_as_text:
+        return embed_model.get_text_embedding_batch(list(queries))
+    return [embed_model.get_query_embedding(query) for query in queries]
+
+
+def get_embed_model(backend, model_name, quantize=False, batch_size=32, threads=1):
+    """
+    설정한 백엔드의 임베딩 모델 생성
+
+    Args:
+        backend (str): "huggingface" 또는 "onnx"
+        model_name (str): HuggingFace 모델 이름
+        quantize (bool): onnx 백엔드에서 int8 동적 양자화 모델 사용
+        batch_size (int): 한 번에 임베딩할 문장 수
+        threads (int): onnx 백엔드의 추론 스레드 수 (0이면 CPU 코어 수)
+    """
+    if backend == "huggingface":
+        # torch를 불러오므로 이 백엔드를 쓸 때만 import
+        from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+        return HuggingFaceEmbedding(model_name=model_name, embed_batch_size=batch_size)
+    if backend == "onnx":
+        return OnnxEmbedding(
+            model_name,
+            quantize=quantize,
+            embed_batch_size=batch_size,
+            threads=threads or os.cpu_count() or 1,
+        )
+    raise ValueError(
+        f"Unknown embedding backend {backend!r} (choose from {EMBED_BACKENDS})"
+    )
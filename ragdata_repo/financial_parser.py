@@ -1,6 +1,9 @@
 import os
+import re
+
 import pandas as pd
-import openai  # LLM 호출용 라이브러리 (OpenAI API 예시)
+
+from config.settings import FINANCIAL_TOP_K
 
 
 # 저장된 금융상품 데이터 로드
@@ -12,19 +15,183 @@ def load_financial_products_from_file(data_save_path):
         return pd.DataFrame()
 
 
-# 금융상품 필터링 함수 (첫 번째 콤마 앞에서 은행명 확인)
-def filter_financial_products(data, user_input):
-    filtered_data = data.copy()
+# 은행명 정규화: 주거래은행 선택지 이름 -> 데이터에서 같은 은행을 가리키는 표기
+# 한글 표기는 "신한"처럼 짧게 두면 다른 회사명에도 걸리므로 은행 이름 전체로 적고,
+# 영문 약칭(KB, SC 등)은 앞뒤에 다른 영문자가 없을 때만 매칭
+BANK_ALIASES = {
+    "국민은행": ("국민은행", "KB"),
+    "기업은행": ("기업은행", "IBK"),
+    "농협은행": ("농협은행",),
+    "신한은행": ("신한은행",),
+    "우리은행": ("우리은행",),
+    "카카오뱅크": ("카카오뱅크",),
+    "하나은행": ("하나은행", "KEB"),
+    "토스뱅크": ("토스뱅크",),
+    "KDB산업은행": ("산업은행", "KDB"),
+    "SC제일은행": ("제일은행", "스탠다드차타드", "SC"),
+}
 
-    if "main_bank" in user_input:
-        # sentence 열에서 첫 번째 콤마 앞의 문자열 추출 및 필터링
-        filtered_data = filtered_data[
-            filtered_data["sentence"]
-            .apply(lambda x: x.split(",")[0] if isinstance(x, str) else "")
-            .str.contains(user_input["main_bank"], na=False)
+
+def _alias_pattern(alias):
+    if alias.isascii():
+        return rf"(?<![A-Za-z]){re.escape(alias)}(?![A-Za-z])"
+    return re.escape(alias)
+
+
+BANK_PATTERNS = {
+    bank: re.compile("|".join(_alias_pattern(alias) for alias in aliases))
+    for bank, aliases in BANK_ALIASES.items()
+}
+
+
+def canonical_bank_name(name):
+    """은행 표기를 대표 은행명으로 변환 (알 수 없는 은행은 공백만 제거해서 반환)"""
+    compact = "".join(str(name).split())
+    for bank, pattern in BANK_PATTERNS.items():
+        if pattern.search(compact):
+            return bank
+    return compact
+
+
+# 상품 유형 판별 키워드 (앞에 있는 유형이 우선)
+PRODUCT_TYPE_KEYWORDS = (("적금", "적금"), ("예금", "예금"), ("대출", "대출"))
+
+_RATE = r"(\d+(?:\.\d+)?)\s*%"
+BASE_RATE_PATTERN = r"기본\s*(?:금리|이율)\D{0,10}?" + _RATE
+MAX_RATE_PATTERN = r"(?:최고|최대|우대)\s*(?:금리|이율)\D{0,10}?" + _RATE
+TERM_PATTERN = r"(\d+)\s*개월"
+_AMOUNT = r"(\d[\d,]*(?:\.\d+)?)\s*(억원|만원|원)"
+# "한도 1억원" / "월 50만원 한도" 두 가지 표기
+LIMIT_PATTERNS = (
+    r"(?:한도|최대|최고)\D{0,10}?" + _AMOUNT,
+    _AMOUNT + r"\s*(?:한도|이내|까지)",
+)
+LIMIT_UNITS = {"억원": 100_000_000, "만원": 10_000, "원": 1}
+
+# sentence 대신 프롬프트에 넣을 구조화 컬럼
+STRUCTURED_COLUMNS = [
+    "product_type",
+    "base_rate",
+    "max_rate",
+    "term_months",
+    "limit_amount",
+]
+
+
+def extract_product_fields(data):
+    """
+    sentence 컬럼에서 상품 유형, 기본/최고 금리, 기간(개월), 한도(원)를 추출
+
+    금리 표기에 "기본"/"최고" 같은 라벨이 없으면 문장 안의 % 값 중 최솟값을 기본 금리,
+    최댓값을 최고 금리로 사용한다.
+    """
+    sentences = data["sentence"].fillna("").astype(str)
+    fields = pd.DataFrame(index=data.index)
+
+    fields["product_type"] = "기타"
+    for keyword, product_type in reversed(PRODUCT_TYPE_KEYWORDS):
+        fields.loc[
+            sentences.str.contains(keyword, regex=False), "product_type"
+        ] = product_type
+
+    all_rates = sentences.str.extractall(_RATE)[0].astype(float).groupby(level=0)
+    base_rate = sentences.str.extract(BASE_RATE_PATTERN)[0].astype(float)
+    max_rate = sentences.str.extract(MAX_RATE_PATTERN)[0].astype(float)
+    fields["base_rate"] = base_rate.fillna(all_rates.min())
+    fields["max_rate"] = max_rate.fillna(all_rates.max()).fillna(fields["base_rate"])
+
+    fields["term_months"] = (
+        sentences.str.extract(TERM_PATTERN)[0].astype(float).astype("Int64")
+    )
+
+    limit = sentences.str.extract(LIMIT_PATTERNS[0])
+    for pattern in LIMIT_PATTERNS[1:]:
+        limit = limit.fillna(sentences.str.extract(pattern))
+    amount = limit[0].str.replace(",", "", regex=False).astype(float)
+    fields["limit_amount"] = (amount * limit[1].map(LIMIT_UNITS)).astype("Int64")
+    return fields
+
+
+def sort_by_rate(products):
+    """예/적금은 최고 금리가 높은 순, 대출은 금리가 낮은 순 (금리를 알 수 없는 상품은 뒤로)"""
+    is_loan = products["product_type"] == "대출"
+    rank = products["max_rate"].where(~is_loan, -products["base_rate"])
+    order = rank.sort_values(ascending=False, kind="stable", na_position="last").index
+    return products.loc[order]
+
+
+def top_products(products, top_k=FINANCIAL_TOP_K):
+    """
+    유형별로 금리가 높은 상위 top_k개 상품의 sentence와 구조화 컬럼
+    (인덱스 로드 시 이미 금리순으로 정렬되어 있으므로 정렬 없이 앞에서부터 자름)
+    """
+    if "product_type" not in products.columns:
+        return products
+    top = products.groupby("product_type", sort=False).head(top_k)
+    return top[["sentence"] + STRUCTURED_COLUMNS]
+
+
+class FinancialProductIndex:
+    """
+    금융상품 데이터를 대표 은행명별로 나눠 둔 인덱스
+
+    은행명과 금리 등 구조화 컬럼은 로드 시점에 sentence에서 한 번만 추출하고,
+    각 파티션은 금리순(sort_by_rate)으로 정렬해 둔다.
+    조회 시에는 미리 나눠 둔 DataFrame을 복사 없이 그대로 반환한다.
+    (반환된 DataFrame은 인덱스와 공유되므로 호출자가 수정하지 않아야 함)
+    """
+
+    def __init__(self, data):
+        self.partitions = {}
+        if "sentence" not in data.columns:
+            self.data = data
+            return
+
+        data = sort_by_rate(pd.concat([data, extract_product_fields(data)], axis=1))
+        self.data = data
+
+        banks = data["sentence"].map(
+            lambda x: canonical_bank_name(x.split(",")[0]) if isinstance(x, str) else ""
+        )
+        for bank, positions in banks.groupby(banks).indices.items():
+            self.partitions[bank] = data.take(positions)
+
+    def lookup(self, main_bank):
+        partition = self.partitions.get(canonical_bank_name(main_bank))
+        if partition is not None:
+            return partition
+
+        # 대표 은행명으로 찾지 못하면 기존 방식처럼 은행명에 입력값이 포함된 파티션을 모음
+        matches = [
+            partition
+            for bank, partition in self.partitions.items()
+            if main_bank and main_bank in bank
         ]
+        if not matches:
+            return self.data.iloc[0:0]
+        return matches[0] if len(matches) == 1 else sort_by_rate(pd.concat(matches))
+
 
-    return filtered_data
+# 데이터 파일 경로별 인덱스 캐시: 경로 -> ((수정 시각, 크기), FinancialProductIndex)
+_index_cache = {}
+
+
+def load_financial_index(data_save_path):
+    """금융상품 데이터를 한 번만 읽어 인덱스를 만들고, 파일이 바뀌지 않았다면 재사용"""
+    signature = None
+    if os.path.exists(data_save_path):
+        stat = os.stat(data_save_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _index_cache.get(data_save_path)
+    if cached and signature and cached[0] == signature:
+        return cached[1]
+
+    print("Loading financial product data...")
+    index = FinancialProductIndex(load_financial_products_from_file(data_save_path))
+    if signature:
+        _index_cache[data_save_path] = (signature, index)
+    return index
 
 
 # # LLM 호출 함수
@@ -49,15 +216,19 @@ def filter_financial_products(data, user_input):
 
 # 메인 실행 함수
 def main(data_save_path, user_input):
-    # 저장된 금융상품 데이터 로드
-    print("Loading financial product data...")
-    combined_data = load_financial_products_from_file(data_save_path)
+    top_k = user_input.get("top_k", FINANCIAL_TOP_K)
+
+    # 은행별로 나눠 둔 금융상품 인덱스 로드 (파일이 바뀌지 않았다면 이전 인덱스 재사용)
+    index = load_financial_index(data_save_path)
 
     # 금융상품 필터링
-    filtered_products = filter_financial_products(combined_data, user_input)
+    if "main_bank" in user_input:
+        filtered_products = index.lookup(user_input["main_bank"])
+    else:
+        filtered_products = index.data
     if filtered_products.empty:
         return "조건에 맞는 금융상품 정보를 찾을 수 없습니다."
-    return filtered_products
+    return top_products(filtered_products, top_k)
 
     # # LLM을 사용하여 추천 생성
     # recommendation = generate_recommendation_with_llm(filtered_products, user_prompt)
@@ -67,6 +238,7 @@ def main(data_save_path, user_input):
 """
 user_input: dict
     - main_bank: str
+    - top_k: int (선택, 유형별 상품 수)
 user_prompt: str
     - 사용자 정의 프롬프트
 """
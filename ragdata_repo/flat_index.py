@@ -0,0 +1,159 @@
+import os
+
+import numpy as np
+
+# 정책 문장 검색용 flat 내적 인덱스
+# 정규화된 임베딩을 연속된 float32 행렬 하나에 두고, 행렬-벡터 곱 한 번과 argpartition으로 정확한 top-k를 구함
+# 문장 텍스트는 UTF-8 바이트 하나로 이어 붙여 오프셋으로 O(1)에 꺼냄
+
+
+def normalize_rows(matrix):
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def top_k_rows(scores, k):
+    """점수가 높은 순으로 k개 행 번호 (같은 점수면 앞 행 먼저)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
+
+
+def top_k_rows_batch(scores, k):
+    """행(검색어)마다 점수가 높은 순으로 k개 열 번호, (검색어 수, k) 배열"""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((len(scores), 0), dtype=np.int64)
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.lexsort((candidates, -candidate_scores), axis=-1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+# search_batch에서 한 번에 만드는 (검색어 x 문장) 점수 행렬의 최대 원소 수 (float32 기준 약 256MB)
+MAX_SCORE_ELEMENTS = 64 * 1024 * 1024
+
+
+class FlatIndex:
+    """
+    문장 임베딩 flat 인덱스
+
+    Attributes:
+        embeddings (np.ndarray): (문장 수, 차원) float32, 행마다 L2 정규화
+        doc_ids (np.ndarray): 행별 정책 번호 (CSV의 index 컬럼)
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        doc_ids,
+        texts=None,
+        text_blob=None,
+        text_offsets=None,
+        normalized=False,
+    ):
+        # 저장된 인덱스는 이미 정규화되어 있으므로 다시 복사하지 않음
+        if normalized:
+            self.embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        else:
+            self.embeddings = normalize_rows(embeddings)
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        if texts is not None:
+            encoded = [text.encode("utf-8") for text in texts]
+            text_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(data) for data in encoded], out=text_offsets[1:])
+            text_blob = b"".join(encoded)
+        self.text_blob = bytes(text_blob)
+        self.text_offsets = np.asarray(text_offsets, dtype=np.int64)
+
+        # 정책 번호 -> 그 정책의 첫 문장 행 (기존 search_policies와 같이 정책의 첫 문장을 결과로 보여줌)
+        unique_ids, first_rows = np.unique(self.doc_ids, return_index=True)
+        self.first_row = dict(zip(unique_ids.tolist(), first_rows.tolist()))
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    @classmethod
+    def from_documents(cls, documents, embed_model):
+        """llama_index Document 목록을 embed_model로 임베딩해서 인덱스 생성"""
+        from llama_index.core.schema import MetadataMode
+
+        # VectorStoreIndex와 같이 메타데이터("doc_id: ...")를 포함한 내용을 임베딩
+        contents = [
+            doc.get_content(metadata_mode=MetadataMode.EMBED) for doc in documents
+        ]
+        embeddings = embed_model.get_text_embedding_batch(contents, show_progress=True)
+        texts = [doc.text for doc in documents]
+        doc_ids = [doc.metadata["doc_id"] for doc in documents]
+        return cls(np.asarray(embeddings, dtype=np.float32), doc_ids, texts=texts)
+
+    def text(self, row):
+        start, end = self.text_offsets[row], self.text_offsets[row + 1]
+        return self.text_blob[start:end].decode("utf-8")
+
+    def policy_text(self, doc_id):
+        return self.text(self.first_row[doc_id])
+
+    def search(self, query_embedding, k):
+        """
+        Returns:
+            tuple: (행 번호 배열, 코사인 유사도 배열), 유사도 내림차순
+        """
+        query = normalize_rows(query_embedding)
+        scores = self.embeddings @ query
+        rows = top_k_rows(scores, k)
+        return rows, scores[rows]
+
+    def search_batch(self, query_embeddings, k):
+        """
+        여러 검색어를 행렬 곱으로 한 번에 검색
+
+        점수 행렬이 MAX_SCORE_ELEMENTS를 넘지 않도록 검색어를 나눠서 곱한다.
+
+        Returns:
+            tuple: ((검색어 수, k) 행 번호 배열, (검색어 수, k) 코사인 유사도 배열)
+        """
+        queries = normalize_rows(query_embeddings)
+        chunk_size = max(1, MAX_SCORE_ELEMENTS // max(len(self), 1))
+        rows, scores = [], []
+        for start in range(0, len(queries), chunk_size):
+            chunk_scores = queries[start : start + chunk_size] @ self.embeddings.T
+            chunk_rows = top_k_rows_batch(chunk_scores, k)
+            rows.append(chunk_rows)
+            scores.append(np.take_along_axis(chunk_scores, chunk_rows, axis=1))
+        if not rows:
+            return np.empty((0, 0), dtype=np.int64), np.empty((0, 0), np.float32)
+        return np.concatenate(rows), np.concatenate(scores)
+
+    def save(self, path):
+        # 임시 파일에 쓴 뒤 교체 (np.savez는 확장자 .npz를 붙이므로 파일 객체로 씀)
+        with open(path + ".tmp", "wb") as f:
+            np.savez(
+                f,
+                embeddings=self.embeddings,
+                doc_ids=self.doc_ids,
+                text_blob=np.frombuffer(self.text_blob, dtype=np.uint8),
+                text_offsets=self.text_offsets,
+            )
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                data["embeddings"],
+                data["doc_ids"],
+                text_blob=data["text_blob"].tobytes(),
+                text_offsets=data["text_offsets"],
+                normalized=True,
+            )
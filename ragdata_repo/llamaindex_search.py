@@ -1,8 +1,27 @@
+import argparse
+import hashlib
+import json
+import numpy as np
 import pandas as pd
-from llama_index.core import Document, VectorStoreIndex
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from llama_index.core import VectorStoreIndex
+from llama_index.core import Document
 import os
+import threading
+
+from config.settings import (
+    EMBED_BACKEND,
+    EMBED_BATCH_SIZE,
+    EMBED_QUANTIZE,
+    EMBED_THREADS,
+    QUERY_CACHE_PERSIST,
+    QUERY_CACHE_SIZE,
+)
+from .embedding_backends import (
+    embed_model_id,
+    get_embed_model,
+    get_query_embedding_batch,
+)
+from .flat_index import FlatIndex
+from .query_cache import QueryEmbeddingCache, normalize_query
 
 # CSV 파일 로드
 # csv_file_path = (
@@ -12,56 +31,267 @@ import os
 
 current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 csv_file_path = os.path.join(current_dir, "data/policy_saving_sentences.csv")
-df = pd.read_csv(csv_file_path)
 
-# Document 객체 생성
-documents = []
-for _, row in df.iterrows():
-    sentence = row["sentence"]
-    index = row["index"]
-    doc = Document(text=sentence, metadata={"doc_id": index})  # 청크 텍스트  # 원본 문서 전체 포함
-    documents.append(doc)
+# 임베딩된 인덱스 저장 위치 (python -m ragdata_repo.llamaindex_search --build 로 생성)
+index_persist_dir = os.path.join(current_dir, "data/policy_index")
+# 검색어 임베딩 캐시 저장 위치 (QUERY_CACHE_PERSIST=1일 때)
+query_cache_path = os.path.join(current_dir, "data/query_embedding_cache.npz")
 
-# Hugging Face 임베딩 모델 로드
-embed_model = HuggingFaceEmbedding(
-    model_name="sentence-transformers/all-mpnet-base-v2"
-)  # "sentence-transformers/all-mpnet-base-v2" #sentence-transformers/all-MiniLM-L6-v2", #"dunzhang/stella_en_1.5B_v5"
+EMBED_MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"  # "sentence-transformers/all-mpnet-base-v2" #sentence-transformers/all-MiniLM-L6-v2", #"dunzhang/stella_en_1.5B_v5"
 
-# VectorStoreIndex 생성
-index = VectorStoreIndex.from_documents(documents, embed_model=embed_model)
+# 저장 형식이 바뀌면 값을 올려서 기존 인덱스를 다시 만들게 함 (2: FlatIndex npz)
+INDEX_FORMAT_VERSION = 2
 
+# 검색 결과로 돌려줄 문장 수
+SEARCH_TOP_K = 5
 
-def search_policies(query: str):
-    # 리트리버 생성
-    retriever = index.as_retriever(verbose=True, top_k=5)
 
-    # 검색 수행
-    results = retriever.retrieve(query)
+def load_documents(csv_path):
+    # Document 객체 생성
+    df = pd.read_csv(csv_path)
+    documents = []
+    for _, row in df.iterrows():
+        sentence = row["sentence"]
+        # numpy 정수는 인덱스 저장(JSON) 시 직렬화되지 않으므로 int로 변환
+        index = int(row["index"])
+        # 청크 텍스트  # 원본 문서 전체 포함
+        doc = Document(text=sentence, metadata={"doc_id": index})
+        documents.append(doc)
+    return documents
 
-    search_results = []
-    for idx, result in enumerate(results):
-        doc_id = result.metadata.get("doc_id")
-        matching_docs = [
-            doc for doc in documents if doc.metadata.get("doc_id") == doc_id
+
+def csv_sha256(csv_path):
+    digest = hashlib.sha256()
+    with open(csv_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def index_manifest(csv_path, model_name, documents):
+    """저장된 인덱스가 현재 CSV/임베딩 모델로 만든 것인지 확인하기 위한 정보"""
+    return {
+        "version": INDEX_FORMAT_VERSION,
+        "csv_sha256": csv_sha256(csv_path),
+        "model_name": model_name,
+        "documents": len(documents),
+    }
+
+
+def build_index(documents, embed_model, persist_dir, manifest):
+    """전체 문장을 임베딩해 인덱스를 만들고 manifest와 함께 저장"""
+    index = FlatIndex.from_documents(documents, embed_model)
+    os.makedirs(persist_dir, exist_ok=True)
+    index.save(os.path.join(persist_dir, "flat_index.npz"))
+
+    # 인덱스 파일을 모두 쓴 뒤 manifest를 기록 (중간에 중단되면 다음 로드에서 다시 만듦)
+    manifest_path = os.path.join(persist_dir, "manifest.json")
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return index
+
+
+def load_index(persist_dir, manifest):
+    """저장된 인덱스의 manifest가 일치하면 임베딩 없이 불러오고, 아니면 None"""
+    manifest_path = os.path.join(persist_dir, "manifest.json")
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            saved_manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if saved_manifest != manifest:
+        print(
+            f"Policy index at {persist_dir} is stale (CSV or embedding model changed)"
+        )
+        return None
+
+    return FlatIndex.load(os.path.join(persist_dir, "flat_index.npz"))
+
+
+# 처음 검색할 때 불러온 임베딩 모델, 정책 문장, 인덱스 (CSV가 바뀌면 문장과 인덱스를 다시 불러옴)
+_search_cache = {}
+# Streamlit 세션(스레드)이 동시에 처음 검색해도 모델과 인덱스를 한 번만 불러오도록 잠금
+# (load_search_index 안에서 load_embed_model을 부르므로 RLock)
+_load_lock = threading.RLock()
+
+
+def load_embed_model():
+    """
+    임베딩 모델과 검색어 임베딩 캐시를 처음 필요할 때 불러옴 (문장 인덱스는 불러오지 않음)
+
+    Returns:
+        dict: {"embed_model", "model_id", "query_cache", ...} (_search_cache)
+    """
+    if "embed_model" in _search_cache:
+        return _search_cache
+
+    with _load_lock:
+        if "embed_model" not in _search_cache:
+            # 임베딩 모델 로드 (백엔드는 config/settings.py의 EMBED_* 설정)
+            model_id = embed_model_id(EMBED_BACKEND, EMBED_MODEL_NAME, EMBED_QUANTIZE)
+            embed_model = get_embed_model(
+                EMBED_BACKEND,
+                EMBED_MODEL_NAME,
+                quantize=EMBED_QUANTIZE,
+                batch_size=EMBED_BATCH_SIZE,
+                threads=EMBED_THREADS,
+            )
+            query_cache = QueryEmbeddingCache(
+                model_id,
+                max_size=QUERY_CACHE_SIZE,
+                persist_path=query_cache_path if QUERY_CACHE_PERSIST else None,
+            )
+            # 잠금 없이 확인하는 다른 스레드가 일부만 채워진 상태를 보지 않도록 embed_model을 마지막에 저장
+            _search_cache.update(
+                model_id=model_id, query_cache=query_cache, embed_model=embed_model
+            )
+    return _search_cache
+
+
+def load_search_index(rebuild=False):
+    """
+    정책 문장과 인덱스를 처음 필요할 때 불러옴
+
+    Args:
+        rebuild (bool): 저장된 인덱스가 있어도 다시 임베딩해서 저장
+
+    Returns:
+        dict: {"key", "documents", "embed_model", "model_id", "query_cache", "index"}
+    """
+    stat = os.stat(csv_file_path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    if not rebuild and _search_cache.get("key") == key:
+        return _search_cache
+
+    with _load_lock:
+        # 잠금을 기다리는 동안 다른 스레드가 이미 불러왔으면 그대로 사용
+        if not rebuild and _search_cache.get("key") == key:
+            return _search_cache
+
+        embed_model = load_embed_model()["embed_model"]
+        model_id = _search_cache["model_id"]
+
+        # 인덱스 로드 (저장된 인덱스가 없거나 CSV/모델/백엔드가 바뀌었으면 새로 만들어 저장)
+        documents = load_documents(csv_file_path)
+        manifest = index_manifest(csv_file_path, model_id, documents)
+        index = None if rebuild else load_index(index_persist_dir, manifest)
+        if index is None:
+            print(
+                "Building policy index (python -m ragdata_repo.llamaindex_search --build)"
+            )
+            index = build_index(documents, embed_model, index_persist_dir, manifest)
+
+        # 인덱스를 먼저 저장하고 key를 마지막에 저장 (key가 같으면 인덱스가 준비된 것)
+        _search_cache.update(documents=documents, index=index, key=key)
+    return _search_cache
+
+
+def embed_query(query: str):
+    """검색어 임베딩 (같은 검색어는 캐시에서 가져와 모델을 다시 돌리지 않음)"""
+    embedder = load_embed_model()
+    return embedder["query_cache"].get_or_embed(
+        query, embedder["embed_model"].get_query_embedding
+    )
+
+
+def embed_queries(queries):
+    """
+    여러 검색어 임베딩, (검색어 수, 차원) 행렬
+
+    캐시에 없는 검색어만 (정규화 후 중복 제거) 모아서 배치로 임베딩한다.
+    """
+    embedder = load_embed_model()
+    query_cache = embedder["query_cache"]
+    embeddings = [query_cache.get(query) for query in queries]
+
+    missing = {}
+    for query, embedding in zip(queries, embeddings):
+        if embedding is None:
+            missing.setdefault(normalize_query(query), query)
+    if missing:
+        embedded = get_query_embedding_batch(
+            embedder["embed_model"], list(missing.values())
+        )
+        new_embeddings = {}
+        for key, query, embedding in zip(missing, missing.values(), embedded):
+            query_cache.put(query, embedding)
+            new_embeddings[key] = embedding
+        embeddings = [
+            new_embeddings[normalize_query(query)] if embedding is None else embedding
+            for query, embedding in zip(queries, embeddings)
         ]
+    return np.asarray(embeddings, dtype=np.float32)
 
-        if not matching_docs:
-            continue
 
-        original_text = matching_docs[0].text
+def query_cache_stats():
+    """검색어 임베딩 캐시 크기와 적중/실패 횟수 (아직 검색하지 않았으면 None)"""
+    query_cache = _search_cache.get("query_cache")
+    return query_cache.stats() if query_cache else None
+
+
+def format_results(index, rows, scores):
+    """검색된 행을 search_policies 결과 형식으로 변환"""
+    search_results = []
+    for idx, (row, score) in enumerate(zip(rows, scores)):
+        # 검색된 문장이 속한 정책의 첫 문장을 결과로 사용
+        doc_id = int(index.doc_ids[row])
+        original_text = index.policy_text(doc_id)
         search_results.append(
             {
                 "policy_number": idx + 1,
                 "text": original_text,
-                "similarity_score": round(result.score, 3),
+                "similarity_score": round(float(score), 3),
             }
         )
 
     return search_results
 
 
+def search_policies(query: str, k: int = SEARCH_TOP_K):
+    search_index = load_search_index()
+    index = search_index["index"]
+
+    # 검색어 임베딩 후 전체 문장과의 내적으로 top-k 검색
+    query_embedding = embed_query(query)
+    rows, scores = index.search(query_embedding, k)
+    return format_results(index, rows, scores)
+
+
+def search_policies_batch(queries, k: int = SEARCH_TOP_K):
+    """
+    여러 검색어를 한 번에 검색 (오프라인 평가/배치 작업용)
+
+    검색어를 배치로 임베딩하고, (검색어 x 문장) 점수를 행렬 곱으로 계산한다.
+
+    Returns:
+        list: 입력 순서대로 각 검색어의 search_policies 결과
+    """
+    queries = list(queries)
+    if not queries:
+        return []
+    index = load_search_index()["index"]
+    rows, scores = index.search_batch(embed_queries(queries), k)
+    return [
+        format_results(index, query_rows, query_scores)
+        for query_rows, query_scores in zip(rows, scores)
+    ]
+
+
 # 함수 사용 예시
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="정책 문장 검색")
+    parser.add_argument(
+        "--build",
+        action="store_true",
+        help="정책 문장을 다시 임베딩해서 인덱스를 저장하고 종료",
+    )
+    args = parser.parse_args()
+    if args.build:
+        documents = load_search_index(rebuild=True)["documents"]
+        print(f"Saved policy index ({len(documents)} sentences) to {index_persist_dir}")
+        raise SystemExit
+
     query = "전세를 알아보려고 하는데 전세 사기가 걱정돼요"
     results = search_policies(query)
 
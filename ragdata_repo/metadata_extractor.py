@@ -0,0 +1,189 @@
+import re
+
+# 청약 공고문 메타데이터 추출기: 필드 라벨과 특별공급 키워드를 한 번의 스캔으로 찾고,
+# 미리 컴파일한 필드 패턴은 라벨이 처음 나오는 위치부터만 검색
+# subscription_extract의 extract_metadata_api / extract_metadata_crawl이 사용
+
+
+def _first_group(match):
+    return match.group(1).strip()
+
+
+def _second_group(match):
+    return match.group(2).strip()
+
+
+def _crawl_region(match):
+    region_name = match.group(1) or match.group(2)
+    if "확인" in region_name:
+        return None
+    return region_name.strip()
+
+
+def _field(name, pattern, anchors, value=_first_group, flags=0, from_line_start=False):
+    """
+    필드 하나의 추출 규칙
+
+    Args:
+        name (str): 메타데이터 키
+        pattern (str): 기존 re.search에 쓰던 패턴 그대로
+        anchors (tuple): 패턴 매칭이 시작될 수 있는 라벨 (여러 개면 그중 하나로 시작, 라벨이 없으면 매칭 불가)
+        value (callable): 매치에서 값을 꺼내는 함수
+        flags (int): 정규식 플래그
+        from_line_start (bool): 라벨 앞 내용까지 캡처하는 패턴이면 True (라벨이 있는 줄의 처음부터 검색)
+    """
+    return {
+        "name": name,
+        "regex": re.compile(pattern, flags),
+        "anchors": anchors,
+        "value": value,
+        "from_line_start": from_line_start,
+    }
+
+
+# API 공고 필드 (패턴은 기존 extract_metadata_api와 동일)
+API_FIELDS = [
+    _field("supply_name", r"입주자모집공고주요정보\s*(.+)", ("입주자모집공고주요정보",)),
+    _field("region_name", r"공급위치\s*(.+)", ("공급위치",)),
+    _field("application_schedule", r"당첨자 발표일\s*(\d{4}-\d{2}-\d{2})", ("당첨자 발표일",)),
+    _field("enter_day", r"입주예정월 :\s*(\d{4}\.\d{2})", ("입주예정월 :",)),
+]
+API_KEYWORDS = ["다자녀", "신혼부", "생애최", "노부모", "신생아", "청년"]
+
+# Crawl 공고 필드 (패턴은 기존 extract_metadata_crawl과 동일)
+CRAWL_FIELDS = [
+    _field(
+        "supply_name",
+        r"(.+?)\.pdf 바로보기",
+        (".pdf 바로보기",),
+        from_line_start=True,
+    ),
+    _field(
+        "region_name",
+        r"모집지역\s*:\s*(.+?)$|소재지\s*:\s*(.+?)$",
+        ("모집지역", "소재지"),
+        value=_crawl_region,
+        flags=re.MULTILINE,
+    ),
+    _field("supply_type", r"유형\s*:\s*(.+?)\s", ("유형",)),
+    _field("area", r"전용면적\(㎡\)\s*:\s*(\d+\.\d+)", ("전용면적(㎡)",)),
+    _field(
+        "application_schedule",
+        r"접수기간\s*:\s*(\d{4}\.\d{2}\.\d{2})\s*~\s*(\d{4}\.\d{2}\.\d{2})",
+        ("접수기간",),
+        value=_second_group,
+    ),
+]
+CRAWL_KEYWORDS = ["다자녀", "신혼", "생애", "노부모", "신생아", "청년"]
+
+
+class MetadataExtractor:
+    """
+    공고문 텍스트에서 필드와 특별공급 키워드를 추출
+
+    모든 필드의 라벨(anchors)과 키워드를 대안으로 묶은 정규식으로 텍스트를 앞에서부터 한 번 훑어서
+    용어별로 처음 나오는 위치를 찾는다. 찾은 용어는 대안에서 빼고 바로 다음 위치부터 이어서 검색하므로
+    (용어 조합별 정규식은 처음 쓸 때 컴파일해서 보관) 반복해서 나오는 키워드가 스캔을 늦추지 않고,
+    모든 용어를 찾으면 나머지 텍스트는 보지 않는다.
+
+    필드 패턴은 라벨이 처음 나오는 위치부터 검색하고, 라벨이 하나도 없으면 실행하지 않는다.
+    라벨 앞 내용을 캡처하는 패턴(from_line_start)은 라벨이 있는 줄의 처음부터 검색한다.
+    라벨 앞에서는 매칭이 시작될 수 없으므로 결과는 전체 텍스트 re.search와 같다.
+    """
+
+    def __init__(self, fields, keywords, keywords_key="special_supply_conditions"):
+        self.fields = fields
+        self.keywords = keywords
+        self.keywords_key = keywords_key
+        # 스캔할 용어 (라벨 + 키워드, 중복 제거)
+        self.terms = tuple(
+            dict.fromkeys(
+                [anchor for field in fields for anchor in field["anchors"]] + keywords
+            )
+        )
+        # 같은 위치에서 함께 시작할 수 있는 용어 (한쪽이 다른 쪽의 접두사)
+        self._same_start = {
+            term: [
+                other
+                for other in self.terms
+                if other.startswith(term) or term.startswith(other)
+            ]
+            for term in self.terms
+        }
+        self._scanners = {}
+
+    def _scanner(self, terms):
+        scanner = self._scanners.get(terms)
+        if scanner is None:
+            scanner = re.compile(
+                "|".join(
+                    re.escape(term) for term in sorted(terms, key=len, reverse=True)
+                )
+            )
+            self._scanners[terms] = scanner
+        return scanner
+
+    def locate(self, text, start=0, terms=None):
+        """
+        text[start:]를 한 번 훑어서 용어별로 처음 나오는 위치
+
+        Args:
+            terms (iterable): 찾을 용어 (기본값: 모든 라벨과 키워드)
+
+        Returns:
+            dict: 용어 -> 처음 나오는 위치 (나오지 않는 용어는 없음)
+        """
+        remaining = frozenset(self.terms if terms is None else terms)
+        positions = {}
+        pos = start
+        while remaining:
+            match = self._scanner(remaining).search(text, pos)
+            if match is None:
+                break
+            pos = match.start()
+            for term in self._same_start[match.group()]:
+                if term in remaining and text.startswith(term, pos):
+                    positions[term] = pos
+            remaining = remaining.difference(positions)
+            pos += 1
+        return positions
+
+    def extract(self, text):
+        """
+        Returns:
+            dict: 필드별 값(없으면 None)과 keywords_key에 텍스트에 나온 키워드 목록(keywords 순서)
+        """
+        positions = self.locate(text)
+        values = {}
+        for field in self.fields:
+            match = self.search(field, text, positions=positions)
+            values[field["name"]] = field["value"](match) if match else None
+
+        values[self.keywords_key] = [
+            keyword for keyword in self.keywords if keyword in positions
+        ]
+        return values
+
+    def search(self, field, text, start=0, positions=None):
+        """
+        text[start:]에서 필드 패턴의 첫 매치 (라벨이 없으면 None)
+
+        Args:
+            start (int): 검색 시작 위치 (줄의 처음)
+            positions (dict): 같은 text, start로 locate한 결과 (없으면 이 필드의 라벨만 찾음)
+        """
+        if positions is None:
+            positions = self.locate(text, start, field["anchors"])
+        found = [
+            positions[anchor] for anchor in field["anchors"] if anchor in positions
+        ]
+        if not found:
+            return None
+        pos = min(found)
+        if field["from_line_start"]:
+            pos = max(text.rfind("\n", 0, pos) + 1, start)
+        return field["regex"].search(text, pos)
+
+
+api_extractor = MetadataExtractor(API_FIELDS, API_KEYWORDS)
+crawl_extractor = MetadataExtractor(CRAWL_FIELDS, CRAWL_KEYWORDS)
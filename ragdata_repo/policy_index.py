@@ -0,0 +1,292 @@
+import os
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime
+
+from .policy_parser import convert_to_date
+from .policy_store import sync_policies
+
+# 정책 자격 인덱스
+# 정책 i의 자격 여부를 정수 비트셋의 i번째 비트로 표현하고,
+# (나이, 지역, 날짜) 조회를 미리 계산된 비트셋의 AND 연산으로 처리
+
+# 바이트 값 -> 켜져 있는 비트 위치 목록 (비트셋을 정책 id 목록으로 변환할 때 사용)
+_BYTE_BITS = [tuple(i for i in range(8) if byte >> i & 1) for byte in range(256)]
+
+
+def bits_to_ids(bits):
+    """비트셋에서 켜져 있는 비트 위치를 오름차순 목록으로 반환"""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    ids = []
+    for offset, byte in enumerate(data):
+        if byte:
+            base = offset * 8
+            ids.extend(base + i for i in _BYTE_BITS[byte])
+    return ids
+
+
+def ids_to_bits(ids):
+    """정책 위치 목록을 비트셋으로 변환 (큰 정수에 비트를 하나씩 OR 하지 않도록 바이트 배열로 생성)"""
+    if not ids:
+        return 0
+    data = bytearray(max(ids) // 8 + 1)
+    for position in ids:
+        data[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(data, "little")
+
+
+def period_bounds(period):
+    """is_policy_active와 같은 기준으로 기간의 (시작일, 종료일)을 반환 (None은 제한 없음)"""
+    if not period or period.get("type") == "special_case":
+        return None, None
+
+    start = end = None
+    if period.get("start"):
+        start_info = period["start"]
+        start = convert_to_date(
+            start_info.get("year"), start_info.get("month"), start_info.get("day")
+        )
+    if period.get("end"):
+        end_info = period["end"]
+        end = convert_to_date(
+            end_info.get("year"), end_info.get("month"), end_info.get("day")
+        )
+    return start, end
+
+
+def to_datetime(value):
+    """ "YYYY-MM-DD" 문자열, date, datetime(pandas.Timestamp 포함)을 datetime으로 변환"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def iter_profiles(profiles):
+    """
+    프로필 목록을 (나이, 지역, 날짜) 튜플로 순회
+
+    profiles는 policy_parser 입력과 같은 키(user_age, user_region, current_date)를 가진
+    dict 목록, (나이, 지역, 날짜) 튜플 목록, 또는 같은 컬럼을 가진 DataFrame
+    """
+    if hasattr(profiles, "columns"):
+        return zip(
+            profiles["user_age"], profiles["user_region"], profiles["current_date"]
+        )
+    return (
+        (
+            (profile["user_age"], profile["user_region"], profile["current_date"])
+            if isinstance(profile, dict)
+            else tuple(profile)
+        )
+        for profile in profiles
+    )
+
+
+class RangeBits:
+    """
+    low <= x <= high 조건에 대한 구간 비트셋
+
+    하한/상한 경계값마다 누적 비트셋을 만들어 두고, 조회 시 이분 탐색 두 번으로
+    "하한을 넘은 정책"과 "상한을 넘긴 정책"의 비트셋을 찾는다. (None은 제한 없음)
+    """
+
+    def __init__(self, bounds):
+        unbounded_low = []
+        lows = defaultdict(list)
+        highs = defaultdict(list)
+        for position, (low, high) in enumerate(bounds):
+            if low is None:
+                unbounded_low.append(position)
+            else:
+                lows[low].append(position)
+            if high is not None:
+                highs[high].append(position)
+
+        self._unbounded_low = ids_to_bits(unbounded_low)
+        self._low_keys, self._low_bits = self._cumulative(lows)
+        self._high_keys, self._high_bits = self._cumulative(highs)
+
+    @staticmethod
+    def _cumulative(ids_by_key):
+        keys = sorted(ids_by_key)
+        cumulative = []
+        bits = 0
+        for key in keys:
+            bits |= ids_to_bits(ids_by_key[key])
+            cumulative.append(bits)
+        return keys, cumulative
+
+    def query(self, x):
+        bits = self._unbounded_low
+        # 하한이 x 이하인 정책
+        i = bisect_right(self._low_keys, x)
+        if i:
+            bits |= self._low_bits[i - 1]
+        # 상한이 x 미만인 정책은 제외
+        j = bisect_left(self._high_keys, x)
+        if j:
+            bits &= ~self._high_bits[j - 1]
+        return bits
+
+
+class PolicyIndex:
+    """parse_policy_details 결과로 만든 (나이, 지역, 날짜) 자격 비트셋 인덱스"""
+
+    def __init__(self, parsed_policies):
+        self.policies = parsed_policies
+        # policy_store에서 온 정책은 안정적인 policy_id를, 그 외에는 위치를 id로 사용
+        self.ids = [
+            policy.get("policy_id", position)
+            for position, policy in enumerate(parsed_policies)
+        ]
+
+        managing = defaultdict(list)
+        residence = defaultdict(list)
+        age_bounds = []
+        active_bounds = []
+        for position, policy in enumerate(parsed_policies):
+            for region in policy["managing_regions"]:
+                managing[region].append(position)
+            for region in policy["residence_regions"]:
+                residence[region].append(position)
+
+            age_range = policy["age_range"]
+            age_bounds.append((age_range["min_age"], age_range["max_age"]))
+
+            # 신청 기간과 운영 기간이 모두 진행 중이어야 하므로 두 구간의 교집합을 사용
+            starts, ends = [], []
+            for key in ("support_period", "operating_period"):
+                start, end = period_bounds(policy.get(key))
+                if start:
+                    starts.append(start)
+                if end:
+                    ends.append(end)
+            active_bounds.append(
+                (max(starts) if starts else None, min(ends) if ends else None)
+            )
+
+        self._managing = {region: ids_to_bits(ids) for region, ids in managing.items()}
+        self._residence = {
+            region: ids_to_bits(ids) for region, ids in residence.items()
+        }
+        self._age_bits = RangeBits(age_bounds)
+        self._active_bits = RangeBits(active_bounds)
+
+        # 나이/지역은 값의 종류가 적으므로 조회 결과를 캐시
+        self._age_cache = {}
+        self._region_cache = {}
+
+    def __len__(self):
+        return len(self.policies)
+
+    def age_bits(self, user_age):
+        bits = self._age_cache.get(user_age)
+        if bits is None:
+            bits = self._age_cache[user_age] = self._age_bits.query(user_age)
+        return bits
+
+    def region_bits(self, user_region):
+        bits = self._region_cache.get(user_region)
+        if bits is None:
+            managing, residence = self._managing, self._residence
+            bits = (managing.get("전국", 0) | managing.get(user_region, 0)) & (
+                residence.get("전국", 0) | residence.get(user_region, 0)
+            )
+            self._region_cache[user_region] = bits
+        return bits
+
+    def active_bits(self, current_date):
+        return self._active_bits.query(current_date)
+
+    def query_bits(self, user_age, user_region, current_date):
+        return (
+            self.age_bits(user_age)
+            & self.region_bits(user_region)
+            & self.active_bits(current_date)
+        )
+
+    def query(self, user_age, user_region, current_date):
+        """자격이 되는 정책 id 목록 (원본 순서)"""
+        ids = self.ids
+        return [
+            ids[position]
+            for position in bits_to_ids(
+                self.query_bits(user_age, user_region, current_date)
+            )
+        ]
+
+    def query_batch(self, profiles):
+        """
+        여러 프로필의 자격 정책 id를 한 번에 계산
+
+        프로필마다 비트셋 AND를 하는 루프이고 벡터화된 연산은 아니다.
+        나이/지역/날짜별 비트셋은 고유 값마다 한 번만 계산하고, 같은 (나이, 지역, 날짜)
+        조합은 결과를 공유하므로 중복된 프로필이 많을수록 빨라진다.
+        (프로필이 모두 다르면 단건 query를 반복하는 것과 거의 같은 비용)
+
+        Returns:
+            list[tuple]: 입력 순서대로 각 프로필의 자격 정책 id
+        """
+        ids = self.ids
+        date_bits = {}
+        results_by_key = {}
+        results = []
+        for user_age, user_region, current_date in iter_profiles(profiles):
+            key = (user_age, user_region, current_date)
+            result = results_by_key.get(key)
+            if result is None:
+                active = date_bits.get(current_date)
+                if active is None:
+                    active = date_bits[current_date] = self.active_bits(
+                        to_datetime(current_date)
+                    )
+                bits = self.age_bits(user_age) & self.region_bits(user_region) & active
+                result = results_by_key[key] = tuple(
+                    ids[position] for position in bits_to_ids(bits)
+                )
+            results.append(result)
+        return results
+
+    def recommendation(self, position):
+        """filter_available_policies 결과와 같은 형식의 정책 dict"""
+        policy = self.policies[position]
+        return {
+            "title": policy["title"],
+            "description": policy["description"],
+            "link": policy["original_link"],
+            "details": policy["details"],
+        }
+
+    def recommend(self, user_age, user_region, current_date):
+        """filter_available_policies와 같은 형식의 추천 정책 목록"""
+        return [
+            self.recommendation(position)
+            for position in bits_to_ids(
+                self.query_bits(user_age, user_region, current_date)
+            )
+        ]
+
+
+# 정책 파일 경로별 인덱스 캐시: 경로 -> ((수정 시각, 크기), PolicyIndex)
+_index_cache = {}
+
+
+def load_policy_index(policy_path):
+    """
+    정책 파일로 인덱스를 만들고, 파일이 바뀌지 않았다면 이전 인덱스를 재사용
+
+    파일이 바뀐 경우에도 새로 추가되거나 내용이 바뀐 정책만 다시 파싱 (policy_store.sync_policies)
+    """
+    stat = os.stat(policy_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _index_cache.get(policy_path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    parsed_policies, _ = sync_policies(policy_path)
+    index = PolicyIndex(parsed_policies)
+    _index_cache[policy_path] = (signature, index)
+    return index
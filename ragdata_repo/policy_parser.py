@@ -3,47 +3,211 @@ from collections import defaultdict
 # 사업 운영 기간 파서
 import json
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 import re
 from datetime import datetime, date
 
-# 날짜 패턴별 정규표현식
-date_patterns = {
+from .region_matcher import RegionMatcher, region_matcher, regions
+
+
+# 결과 필드 매핑 헬퍼: 값은 정규표현식 그룹 인덱스, ("20", i)는 두 자리 연도 그룹 앞에 "20"을 붙임
+def _ymd(year, month, day):
+    return {"year": year, "month": month, "day": day}
+
+
+def _ym(year, month):
+    return {"year": year, "month": month}
+
+
+def _y(year):
+    return {"year": year}
+
+
+def _short(index):
+    return ("20", index)
+
+
+# 날짜 문법 테이블: (패턴 이름, 정규표현식, 결과 타입, 결과 필드 매핑)
+# 테이블 순서가 곧 우선순위이며, 앞에 있는 패턴이 먼저 매칭됨
+DATE_GRAMMAR = [
+    # 0. 특수 케이스 (가장 먼저 체크)
+    (
+        "special_cases",
+        r"(연중|예산소진시까지|계속사업|현재|상시|미정|-)",
+        "special_case",
+        {"value": 0},
+    ),
     # 1. YYYY.MM.DD. ~ YYYY.MM.DD. 형식
-    "full_date_dots": r"(\d{4})\.(\d{1,2})\.(\d{1,2})\.?\s*~\s*(\d{4})\.(\d{1,2})\.(\d{1,2})\.?",
-    "A": "(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일\s*~\s*(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일",
+    (
+        "full_date_dots",
+        r"(\d{4})\.(\d{1,2})\.(\d{1,2})\.?\s*~\s*(\d{4})\.(\d{1,2})\.(\d{1,2})\.?",
+        "full_date",
+        {"start": _ymd(0, 1, 2), "end": _ymd(3, 4, 5)},
+    ),
+    (
+        "A",
+        r"(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일\s*~\s*(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일",
+        "A",
+        {"start": _ymd(0, 1, 2), "end": _ymd(3, 4, 5)},
+    ),
     # 2. YYYY. MM. ~ YYYY. MM. 형식
-    "year_month_dots": r"(\d{4})\.\s*(\d{1,2})\.\s*~\s*(\d{4})\.\s*(\d{1,2})\.",
+    (
+        "year_month_dots",
+        r"(\d{4})\.\s*(\d{1,2})\.\s*~\s*(\d{4})\.\s*(\d{1,2})\.",
+        "year_month",
+        {"start": _ym(0, 1), "end": _ym(2, 3)},
+    ),
     # 3. YYYY-MM-DD~YYYY-MM-DD 형식
-    "full_date_hyphens": r"(\d{4})-(\d{2})-(\d{2})\s*~\s*(\d{4})-(\d{2})-(\d{2})",
+    (
+        "full_date_hyphens",
+        r"(\d{4})-(\d{2})-(\d{2})\s*~\s*(\d{4})-(\d{2})-(\d{2})",
+        "full_date",
+        {"start": _ymd(0, 1, 2), "end": _ymd(3, 4, 5)},
+    ),
     # 4. YYYY. M. ~ MM. 형식 (같은 해 다른 달)
-    "same_year_months": r"(\d{4})\.\s*(\d{1,2})\.\s*~\s*(\d{1,2})\.",
+    (
+        "same_year_months",
+        r"(\d{4})\.\s*(\d{1,2})\.\s*~\s*(\d{1,2})\.",
+        "same_year_months",
+        {"start": _ym(0, 1), "end": _ym(0, 2)},
+    ),
     # 5. 'YY. ~ 'YY. 형식
-    "short_years": r"\'(\d{2})\.\s*~\s*\'(\d{2})\.",
+    (
+        "short_years",
+        r"\'(\d{2})\.\s*~\s*\'(\d{2})\.",
+        "years_only",
+        {"start": _y(_short(0)), "end": _y(_short(1))},
+    ),
     # 6. 'YY. MM. ~ 'YY. MM. 형식
-    "short_year_month": r"\'(\d{2})\.\s*(\d{1,2})\.\s*~\s*\'(\d{2})\.\s*(\d{1,2})\.",
+    (
+        "short_year_month",
+        r"\'(\d{2})\.\s*(\d{1,2})\.\s*~\s*\'(\d{2})\.\s*(\d{1,2})\.",
+        "year_month",
+        {"start": _ym(_short(0), 1), "end": _ym(_short(2), 3)},
+    ),
     # 7. YYYY년 MM월 ~ YYYY년 MM월 형식
-    "korean_date": r"(\d{4})[년]\s*(\d{1,2})[월]\s*~\s*(\d{4})[년]\s*(\d{1,2})[월]",
+    (
+        "korean_date",
+        r"(\d{4})[년]\s*(\d{1,2})[월]\s*~\s*(\d{4})[년]\s*(\d{1,2})[월]",
+        "year_month",
+        {"start": _ym(0, 1), "end": _ym(2, 3)},
+    ),
     # 8. YYYY.M ~ YYYY.MM 형식
-    "year_month_minimal": r"(\d{4})\.(\d{1,2})\s*~\s*(\d{4})\.(\d{1,2})",
-    # 9. [NEW] YYYY. ~ YYYY. 형식 (연도만)
-    "years_only": r"(\d{4})\.\s*~\s*(\d{4})\.",
+    (
+        "year_month_minimal",
+        r"(\d{4})\.(\d{1,2})\s*~\s*(\d{4})\.(\d{1,2})",
+        "year_month",
+        {"start": _ym(0, 1), "end": _ym(2, 3)},
+    ),
+    # 9. YYYY. ~ YYYY. 형식 (연도만)
+    (
+        "years_only",
+        r"(\d{4})\.\s*~\s*(\d{4})\.",
+        "years_only",
+        {"start": _y(0), "end": _y(1)},
+    ),
     # 5. 'YY.MM. ~ MM.' 형식 (연도 축약)
-    "short_year_month_dots": r"'(\d{2})\.(\d{1,2})\.?\s*~\s*(\d{1,2})\.'",
-    # 10. [NEW] YYYY. MM. DD.(요일) 형식
-    "date_with_day": r"(\d{4})\.\s*(\d{1,2})\.\s*(\d{1,2})\.\s*\([월화수목금토일]\)",
+    (
+        "short_year_month_dots",
+        r"'(\d{2})\.(\d{1,2})\.?\s*~\s*(\d{1,2})\.'",
+        "short_year_month_dots",
+        {"start": _ym(0, 1), "end": _ym(0, 2)},
+    ),
+    # 10. YYYY. MM. DD.(요일) 형식
+    (
+        "date_with_day",
+        r"(\d{4})\.\s*(\d{1,2})\.\s*(\d{1,2})\.\s*\([월화수목금토일]\)",
+        "single_date_with_day",
+        {"date": _ymd(0, 1, 2)},
+    ),
     # 3. YYYY년 MM월 DD일 ~ YYYY년 MM월 DD일(예정) 형식
-    "full_date_korean_with_optional_scheduled": r"(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일\s*~\s*(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일(?:\(예정\))?",
-    # 11. [NEW] 특수 케이스 패턴
-    "special_cases": r"(연중|예산소진시까지|계속사업|현재|상시|미정|-)",
-    "bullet_full_year_month": r"[□○•]\s*(\d{4})\.(\d{1,2})\.\s*~\s*(\d{4})\.(\d{1,2})",  # □2024.3.~2024.12 패턴
-    "bullet_short_year_month": r"[□○•][사업|추진]기간:\s*\'(\d{2})\.(\d{1,2})\.\s*~\s*(\d{1,2})\.(?:\s*※.*)?",  # ○사업기간:'24.1.~12. 패턴
-    "bullet_period_short": r"[○•]\s*(?:추진|사업)기간:\s*\'(\d{2})\.(\d{1,2})\.\s*~\s*(\d{1,2})\.(?:\s*※.*)?",  # ○추진기간:'24.1.~12.
-    "bullet_period_years": r"[•○]\s*사업기간:\s*\'(\d{2})\.(\d{1,2})\.\s*~\s*\'(\d{2})\.(\d{1,2})\.(?:\s*\([^)]+\))?",  # •사업기간:'24.2.~'26.12.
-    "year_month_short": r"(\d{4})\.(\d{2})~(\d{2})",  # 2024.02~12
-    "year_month_korean": r"(\d{4})\.(\d{1,2})월?\s*~\s*(\d{4})\.(\d{1,2})월?",  # 2024.1월~2024.12월
-    "bullet_period_years_with_note": r"[•○]\s*사업기간:\s*\'(\d{2})\.(\d{1,2})\.\s*~\s*\'(\d{2})\.(\d{1,2})\.\s*\(※[^)]+\)",
-}
+    (
+        "full_date_korean_with_optional_scheduled",
+        r"(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일\s*~\s*(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일(?:\(예정\))?",
+        "full_date_korean_with_optional_scheduled",
+        {"start": _ymd(0, 1, 2), "end": _ymd(3, 4, 5)},
+    ),
+    # □2024.3.~2024.12 패턴
+    (
+        "bullet_full_year_month",
+        r"[□○•]\s*(\d{4})\.(\d{1,2})\.\s*~\s*(\d{4})\.(\d{1,2})",
+        "year_month",
+        {"start": _ym(0, 1), "end": _ym(2, 3)},
+    ),
+    # ○사업기간:'24.1.~12. 패턴
+    (
+        "bullet_short_year_month",
+        r"[□○•][사업|추진]기간:\s*\'(\d{2})\.(\d{1,2})\.\s*~\s*(\d{1,2})\.(?:\s*※.*)?",
+        "same_year_months",
+        {"start": _ym(_short(0), 1), "end": _ym(_short(0), 2)},
+    ),
+    # ○추진기간:'24.1.~12.
+    (
+        "bullet_period_short",
+        r"[○•]\s*(?:추진|사업)기간:\s*\'(\d{2})\.(\d{1,2})\.\s*~\s*(\d{1,2})\.(?:\s*※.*)?",
+        "same_year_months",
+        {"start": _ym(_short(0), 1), "end": _ym(_short(0), 2)},
+    ),
+    # •사업기간:'24.2.~'26.12.
+    (
+        "bullet_period_years",
+        r"[•○]\s*사업기간:\s*\'(\d{2})\.(\d{1,2})\.\s*~\s*\'(\d{2})\.(\d{1,2})\.(?:\s*\([^)]+\))?",
+        "year_month",
+        {"start": _ym(_short(0), 1), "end": _ym(_short(2), 3)},
+    ),
+    # 2024.02~12
+    (
+        "year_month_short",
+        r"(\d{4})\.(\d{2})~(\d{2})",
+        "same_year_months",
+        {"start": _ym(0, 1), "end": _ym(0, 2)},
+    ),
+    # 2024.1월~2024.12월
+    (
+        "year_month_korean",
+        r"(\d{4})\.(\d{1,2})월?\s*~\s*(\d{4})\.(\d{1,2})월?",
+        "year_month",
+        {"start": _ym(0, 1), "end": _ym(2, 3)},
+    ),
+    (
+        "bullet_period_years_with_note",
+        r"[•○]\s*사업기간:\s*\'(\d{2})\.(\d{1,2})\.\s*~\s*\'(\d{2})\.(\d{1,2})\.\s*\(※[^)]+\)",
+        "year_month",
+        {"start": _ym(_short(0), 1), "end": _ym(_short(2), 3)},
+    ),
+]
+
+# 날짜 패턴별 정규표현식 (이름 -> 패턴)
+date_patterns = {name: pattern for name, pattern, _, _ in DATE_GRAMMAR}
+
+
+# 문법 테이블을 import 시점에 한 번만 컴파일: (패턴 이름, 컴파일된 패턴, 결과 타입, 필드 매핑)
+# 하나의 lookahead alternation으로 합치면 re의 리터럴 접두사 최적화가 꺼져 더 느리므로
+# 우선순위 순서대로 컴파일된 패턴 목록을 사용함
+_DATE_RULES = [
+    (name, re.compile(pattern), result_type, fields)
+    for name, pattern, result_type, fields in DATE_GRAMMAR
+]
+
+
+@lru_cache(maxsize=4096)
+def _match_date_grammar(date_str):
+    """날짜 문자열에 처음 매칭되는 (규칙 인덱스, 그룹 값) 반환. 같은 문자열은 캐시된 결과 사용"""
+    for rule_index, (_, regex, _, _) in enumerate(_DATE_RULES):
+        match = regex.search(date_str)
+        if match:
+            return rule_index, match.groups()
+    return None
+
+
+def _build_date_field(spec, groups):
+    if isinstance(spec, dict):
+        return {key: _build_date_field(value, groups) for key, value in spec.items()}
+    if isinstance(spec, tuple):
+        prefix, index = spec
+        return prefix + groups[index]
+    return groups[spec]
 
 
 def convert_to_date(year, month=1, day=1):
@@ -84,155 +248,27 @@ def parse_date_string(date_str):
     """
     주어진 날짜 문자열에서 시작일과 종료일을 추출
 
+    DATE_GRAMMAR 순서대로 처음 매칭되는 패턴을 찾고 (문자열별로 메모이제이션),
+    결과 형태는 테이블의 필드 매핑에 따라 만든다.
+
     Args:
         date_str (str): 날짜 문자열
 
     Returns:
         dict: 파싱된 날짜 정보 또는 특수 케이스 문자열
     """
-    # 특수 케이스 먼저 체크
-    special_match = re.search(date_patterns["special_cases"], date_str)
-    if special_match:
-        return {"type": "special_case", "value": special_match.group(1)}
-
-    for pattern_name, pattern in date_patterns.items():
-        if pattern_name == "special_cases":
-            continue
-
-        match = re.search(pattern, date_str)
-        if match:
-            groups = match.groups()
-
-            # 패턴별 결과 처리
-            if pattern_name == "full_date_dots":
-                return {
-                    "type": "full_date",
-                    "start": {"year": groups[0], "month": groups[1], "day": groups[2]},
-                    "end": {"year": groups[3], "month": groups[4], "day": groups[5]},
-                }
-            elif pattern_name in [
-                "year_month_dots",
-                "korean_date",
-                "year_month_minimal",
-            ]:
-                return {
-                    "type": "year_month",
-                    "start": {"year": groups[0], "month": groups[1]},
-                    "end": {"year": groups[2], "month": groups[3]},
-                }
-            elif pattern_name == "full_date_hyphens":
-                return {
-                    "type": "full_date",
-                    "start": {"year": groups[0], "month": groups[1], "day": groups[2]},
-                    "end": {"year": groups[3], "month": groups[4], "day": groups[5]},
-                }
-            elif pattern_name == "same_year_months":
-                return {
-                    "type": "same_year_months",
-                    "start": {"year": groups[0], "month": groups[1]},
-                    "end": {"year": groups[0], "month": groups[2]},
-                }
-            elif pattern_name == "short_years":
-                start_year = "20" + groups[0]
-                end_year = "20" + groups[1]
-                return {
-                    "type": "years_only",
-                    "start": {"year": start_year},
-                    "end": {"year": end_year},
-                }
-            elif pattern_name == "short_year_month":
-                start_year = "20" + groups[0]
-                end_year = "20" + groups[2]
-                return {
-                    "type": "year_month",
-                    "start": {"year": start_year, "month": groups[1]},
-                    "end": {"year": end_year, "month": groups[3]},
-                }
-            elif pattern_name == "years_only":
-                return {
-                    "type": "years_only",
-                    "start": {"year": groups[0]},
-                    "end": {"year": groups[1]},
-                }
-            elif pattern_name == "date_with_day":
-                return {
-                    "type": "single_date_with_day",
-                    "date": {"year": groups[0], "month": groups[1], "day": groups[2]},
-                }
-            elif pattern_name == "full_date_korean_with_optional_scheduled":
-                return {
-                    "type": "full_date_korean_with_optional_scheduled",
-                    "start": {"year": groups[0], "month": groups[1], "day": groups[2]},
-                    "end": {"year": groups[3], "month": groups[4], "day": groups[5]},
-                }
-            elif pattern_name == "A":
-                return {
-                    "type": "A",
-                    "start": {"year": groups[0], "month": groups[1], "day": groups[2]},
-                    "end": {"year": groups[3], "month": groups[4], "day": groups[5]},
-                }
-            elif pattern_name == "short_year_month_dots":
-                return {
-                    "type": "short_year_month_dots",
-                    "start": {"year": groups[0], "month": groups[1]},
-                    "end": {"year": groups[0], "month": groups[2]},
-                }
-            elif pattern_name == "bullet_full_year_month":
-                return {
-                    "type": "year_month",
-                    "start": {"year": groups[0], "month": groups[1]},
-                    "end": {"year": groups[2], "month": groups[3]},
-                }
-
-            elif pattern_name == "bullet_short_year_month":
-                start_year = "20" + groups[0]
-                return {
-                    "type": "same_year_months",
-                    "start": {"year": start_year, "month": groups[1]},
-                    "end": {"year": start_year, "month": groups[2]},
-                }
-            # parse_date_string 함수 내 if-elif 문에 추가
-            elif pattern_name == "bullet_period_short":
-                start_year = "20" + groups[0]
-                return {
-                    "type": "same_year_months",
-                    "start": {"year": start_year, "month": groups[1]},
-                    "end": {"year": start_year, "month": groups[2]},
-                }
-
-            elif pattern_name == "bullet_period_years":
-                start_year = "20" + groups[0]
-                end_year = "20" + groups[2]
-                return {
-                    "type": "year_month",
-                    "start": {"year": start_year, "month": groups[1]},
-                    "end": {"year": end_year, "month": groups[3]},
-                }
+    matched = _match_date_grammar(date_str)
+    if matched is None:
+        return None
 
-            elif pattern_name == "year_month_short":
-                return {
-                    "type": "same_year_months",
-                    "start": {"year": groups[0], "month": groups[1]},
-                    "end": {"year": groups[0], "month": groups[2]},
-                }
+    rule_index, groups = matched
+    _, _, result_type, fields = _DATE_RULES[rule_index]
 
-            elif pattern_name == "year_month_korean":
-                return {
-                    "type": "year_month",
-                    "start": {"year": groups[0], "month": groups[1]},
-                    "end": {"year": groups[2], "month": groups[3]},
-                }
-            # parse_date_string 함수 내 if-elif 문에 추가
-            elif pattern_name == "bullet_period_years_with_note":
-                start_year = "20" + groups[0]
-                end_year = "20" + groups[2]
-                return {
-                    "type": "year_month",
-                    "start": {"year": start_year, "month": groups[1]},
-                    "end": {"year": end_year, "month": groups[3]},
-                }
-
-    return None
+    # 캐시된 그룹 값으로 매번 새 dict를 만들어 호출자가 결과를 수정해도 캐시에 영향이 없도록 함
+    result = {"type": result_type}
+    for key, spec in fields.items():
+        result[key] = _build_date_field(spec, groups)
+    return result
 
 
 def parse_operating_periods(text):
@@ -291,306 +327,74 @@ def extract_age_range(text):
     return min_age, max_age
 
 
-regions = {
-    ("서울"): [
-        "종로",
-        "중구",
-        "용산",
-        "성동",
-        "광진",
-        "동대문",
-        "중랑",
-        "성북",
-        "강북",
-        "도봉",
-        "노원",
-        "은평",
-        "서대문",
-        "마포",
-        "양천",
-        "강서",
-        "구로",
-        "금천",
-        "영등포",
-        "동작",
-        "관악",
-        "서초",
-        "강남",
-        "송파",
-        "강동",
-    ],
-    ("부산"): [
-        "중구",
-        "서구",
-        "동구",
-        "영도",
-        "부산진",
-        "동래",
-        "남구",
-        "북구",
-        "해운대",
-        "사하",
-        "금정",
-        "강서",
-        "연제",
-        "수영",
-        "사상",
-        "기장",
-    ],
-    ("대구"): ["중구", "동구", "서구", "남구", "북구", "수성", "달서", "달성"],
-    ("인천"): ["중구", "동구", "미추홀", "연수", "남동", "부평", "계양", "서구", "강화", "옹진"],
-    ("광주"): ["동구", "서구", "남구", "북구", "광산"],
-    ("대전"): ["동구", "중구", "서구", "유성", "대덕"],
-    ("울산"): ["중구", "남구", "동구", "북구", "울주"],
-    ("세종"): ["세종"],
-    ("경기"): [
-        "수원",
-        "성남",
-        "안양",
-        "안산",
-        "용인",
-        "부천",
-        "광명",
-        "평택",
-        "과천",
-        "오산",
-        "시흥",
-        "군포",
-        "의왕",
-        "하남",
-        "이천",
-        "안성",
-        "김포",
-        "화성",
-        "광주",
-        "양주",
-        "포천",
-        "여주",
-        "연천",
-        "가평",
-        "양평",
-    ],
-    ("강원"): [
-        "춘천",
-        "원주",
-        "강릉",
-        "동해",
-        "태백",
-        "속초",
-        "삼척",
-        "홍천",
-        "횡성",
-        "영월",
-        "평창",
-        "정선",
-        "철원",
-        "화천",
-        "양구",
-        "인제",
-        "고성",
-        "양양",
-    ],
-    ("충북", "충청북도"): ["청주", "충주", "제천", "보은", "옥천", "영동", "증평", "진천", "괴산", "음성", "단양"],
-    ("충남", "충청남도"): [
-        "천안",
-        "공주",
-        "보령",
-        "아산",
-        "서산",
-        "논산",
-        "계룡",
-        "당진",
-        "금산",
-        "부여",
-        "서천",
-        "청양",
-        "홍성",
-        "예산",
-        "태안",
-    ],
-    ("전북", "전라북도"): [
-        "전주",
-        "군산",
-        "익산",
-        "정읍",
-        "남원",
-        "김제",
-        "완주",
-        "진안",
-        "무주",
-        "장수",
-        "임실",
-        "순창",
-        "고창",
-        "부안",
-    ],
-    ("전남", "전라남도"): [
-        "목포",
-        "여수",
-        "순천",
-        "나주",
-        "광양",
-        "담양",
-        "곡성",
-        "구례",
-        "고흥",
-        "보성",
-        "화순",
-        "장흥",
-        "강진",
-        "해남",
-        "영암",
-        "무안",
-        "함평",
-        "영광",
-        "장성",
-        "완도",
-        "진도",
-        "신안",
-    ],
-    ("경북", "경상북도"): [
-        "포항",
-        "경주",
-        "김천",
-        "안동",
-        "구미",
-        "영주",
-        "영천",
-        "상주",
-        "문경",
-        "경산",
-        "군위",
-        "의성",
-        "청송",
-        "영양",
-        "영덕",
-        "청도",
-        "고령",
-        "성주",
-        "칠곡",
-        "예천",
-        "봉화",
-        "울진",
-        "울릉",
-    ],
-    ("경남", "경상남도"): [
-        "창원",
-        "진주",
-        "통영",
-        "사천",
-        "김해",
-        "밀양",
-        "거제",
-        "양산",
-        "의령",
-        "함안",
-        "창녕",
-        "고성",
-        "남해",
-        "하동",
-        "산청",
-        "함양",
-        "거창",
-        "합천",
-    ],
-    ("제주"): ["제주", "서귀포"],
-}
-
-
 def classify_regions(entries, regions):
-    result = defaultdict(list)
+    """각 항목을 대표 시도 코드(매칭 없으면 "전국")별로 분류"""
+    if regions is region_matcher.regions:
+        matcher = region_matcher
+    else:
+        matcher = RegionMatcher(regions)
 
+    result = defaultdict(list)
     for entry in entries:
-        matched = False
-        for regionss in regions.keys():
-            if type(regionss) == tuple:
-                for region in regionss:
-                    if region in entry:
-                        result[regionss[0]].append(entry)
-                        matched = True
-                        break
-                if matched:
-                    break
-            else:
-                if regionss in entry:
-                    result[regionss].append(entry)
-                    matched = True
-                    break
-        if not matched:
-            for region, subregions in regions.items():
-                if any(subregion in entry for subregion in subregions):
-                    result[region].append(entry)
-                    matched = True
-                    break
-        if not matched:
-            result["전국"].append(entry)
+        result[matcher.classify(entry)].append(entry)
 
     return result
 
 
+def parse_policy(policy, debug=False, debugDate=False):
+    """Parse and extract relevant details from a single policy"""
+    details = {detail["Title"]: detail["Content"] for detail in policy["Details"]}
+
+    parsed_policy = {
+        "title": policy["Policy Title"],
+        "description": policy["Description"],
+    }
+
+    # Parse support period
+    support_period = "".join(details.get("사업 신청 기간", "__").split())
+    if support_period:
+        parsed_policy["support_period"] = parse_date_string(support_period)
+
+    # Parse operating period
+    operating_period = "".join(details.get("사업 운영 기간", "__").split())
+    if operating_period:
+        parsed_policy["operating_period"] = parse_date_string(operating_period)
+    if debugDate:
+        if parsed_policy["operating_period"] == None:
+            print(operating_period)
+        if parsed_policy["support_period"] == None:
+            print(support_period)
+
+    # Parse age requirements
+    age_str = details.get("연령", "제한없음")
+    min_age, max_age = extract_age_range(age_str)
+    parsed_policy["age_range"] = {
+        "min_age": min_age,
+        "max_age": max_age if max_age != 9999 else None,
+    }
+
+    # Parse managing organization and region
+    managing_org = details.get("주관 기관", "")
+    residence_info = details.get("거주지 및 소득", "")
+
+    # 문자열 하나당 지역 오토마톤을 한 번만 통과
+    parsed_policy["managing_regions"] = {region_matcher.classify(managing_org)}
+    parsed_policy["residence_regions"] = {region_matcher.classify(residence_info)}
+
+    parsed_policy["original_link"] = policy.get("Original Link", "")
+    parsed_policy["details"] = details
+
+    if debug:
+        print(
+            f'{age_str}: {parsed_policy["age_range"]}, {support_period}: {parsed_policy["support_period"]}, {operating_period}: {parsed_policy["operating_period"]}, {managing_org}:{parsed_policy["managing_regions"]}, {residence_info}:{parsed_policy["residence_regions"]}'
+        )
+
+    return parsed_policy
+
+
 def parse_policy_details(policy_data, debug=False, debugDate=False):
     """Parse and extract relevant details from each policy"""
-    parsed_policies = []
-
-    for policy in policy_data:
-        details = {detail["Title"]: detail["Content"] for detail in policy["Details"]}
-
-        parsed_policy = {
-            "title": policy["Policy Title"],
-            "description": policy["Description"],
-        }
-
-        # Parse support period
-        support_period = "".join(details.get("사업 신청 기간", "__").split())
-        if support_period:
-            parsed_policy["support_period"] = parse_date_string(support_period)
-
-        # Parse operating period
-        operating_period = "".join(details.get("사업 운영 기간", "__").split())
-        if operating_period:
-            parsed_policy["operating_period"] = parse_date_string(operating_period)
-        if debugDate:
-            if parsed_policy["operating_period"] == None:
-                print(operating_period)
-            if parsed_policy["support_period"] == None:
-                print(support_period)
-
-        # Parse age requirements
-        age_str = details.get("연령", "제한없음")
-        min_age, max_age = extract_age_range(age_str)
-        parsed_policy["age_range"] = {
-            "min_age": min_age,
-            "max_age": max_age if max_age != 9999 else None,
-        }
-
-        # Parse managing organization and region
-        managing_org = details.get("주관 기관", "")
-        residence_info = details.get("거주지 및 소득", "")
-
-        org_regions = classify_regions([managing_org], regions)
-        residence_regions = classify_regions([residence_info], regions)
-
-        parsed_policy["managing_regions"] = set()
-        for region, entries in org_regions.items():
-            if entries:
-                parsed_policy["managing_regions"].add(region)
-
-        parsed_policy["residence_regions"] = set()
-        for region, entries in residence_regions.items():
-            if entries:
-                parsed_policy["residence_regions"].add(region)
-
-        parsed_policy["original_link"] = policy.get("Original Link", "")
-        parsed_policy["details"] = details
-
-        parsed_policies.append(parsed_policy)
-
-        if debug:
-            print(
-                f'{age_str}: {parsed_policy["age_range"]}, {support_period}: {parsed_policy["support_period"]}, {operating_period}: {parsed_policy["operating_period"]}, {managing_org}:{parsed_policy["managing_regions"]}, {residence_info}:{parsed_policy["residence_regions"]}'
-            )
-
-    return parsed_policies
+    return [parse_policy(policy, debug, debugDate) for policy in policy_data]
 
 
 def filter_available_policies(parsed_policies, user_age, user_region, current_date):
@@ -658,23 +462,71 @@ def get_policy_recommendations(policy_data, user_age, user_region, current_date_
     return available_policies
 
 
+# 정책 원본 데이터 경로
+policy_data_path = (
+    "/Users/hyottz/Desktop/24f-houseplan/24f_daiv_houseplan/data/filtered_policies.json"
+)
+
+
 def policy_parser(user_input: dict):
-    with open(
-        "/Users/hyottz/Desktop/24f-houseplan/24f_daiv_houseplan/data/filtered_policies.json",
-        "r",
-        encoding="utf-8",
-    ) as f:
-        json_data = f.read()
-    data = json.loads(json_data)
-    recommendations = get_policy_recommendations(
-        data,
+    # policy_index가 이 모듈의 파싱 함수를 사용하므로 순환 import를 피하기 위해 함수 안에서 import
+    from .policy_index import load_policy_index
+
+    # 파일이 바뀌지 않았다면 이전 요청에서 만든 인덱스를 그대로 사용
+    index = load_policy_index(policy_data_path)
+    current_date = datetime.strptime(user_input["current_date"], "%Y-%m-%d")
+    recommendations = index.recommend(
         user_input["user_age"],
         user_input["user_region"],
-        user_input["current_date"],
+        current_date,
     )
     return recommendations
 
 
+def policy_parser_batch(profiles):
+    """
+    여러 사용자 프로필의 자격 정책 id를 한 번에 계산 (야간 배치 작업용)
+
+    정책 파일 파싱과 인덱스 생성을 한 번만 하고, 같은 (나이, 지역, 날짜) 프로필은
+    결과를 공유한다. 프로필별 계산 자체는 단건 조회와 같음 (PolicyIndex.query_batch)
+
+    Args:
+        profiles: user_age, user_region, current_date 키를 가진 dict 목록,
+            (나이, 지역, 날짜) 튜플 목록, 또는 같은 컬럼을 가진 DataFrame
+
+    Returns:
+        list[tuple]: 입력 순서대로 각 프로필의 자격 정책 id
+    """
+    from .policy_index import load_policy_index
+
+    index = load_policy_index(policy_data_path)
+    return index.query_batch(profiles)
+
+
+def policy_search(user_input: dict, k: int = 10):
+    """
+    자격이 되는 정책 중 고민사항(concerns)과 임베딩 유사도가 높은 k개 (policy_parser + 정책 임베딩 검색)
+
+    Args:
+        user_input (dict): policy_parser 입력 + "concerns"
+        k (int): 반환할 정책 수
+
+    Returns:
+        list: policy_parser 결과 형식에 "similarity_score"를 더한 목록 (유사도 내림차순)
+    """
+    # 임베딩 모델을 불러오므로 이 함수를 쓸 때만 import
+    from .policy_vectors import search_eligible_policies
+
+    return search_eligible_policies(
+        policy_data_path,
+        user_input["user_age"],
+        user_input["user_region"],
+        user_input["current_date"],
+        user_input["concerns"],
+        k,
+    )
+
+
 if __name__ == "__main__":
     user_input = {
         "current_date": "2025-01-10",
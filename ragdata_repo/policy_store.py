@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+
+from .policy_parser import parse_policy
+
+# 정책 증분 수집
+# 정책마다 안정적인 id와 내용 해시를 붙여, 원본 파일이 바뀌었을 때
+# 새로 추가되거나 내용이 바뀐 정책만 다시 파싱하고 파싱 결과는 파일로 유지
+
+# 파싱 규칙이 바뀌면 값을 올려서 저장된 파싱 결과를 모두 무효화
+PARSED_POLICY_VERSION = 2
+
+# 원본에서 다시 만들 수 있는 필드를 제외한, 저장해 두는 파싱 결과 필드
+PARSED_FIELDS = (
+    "support_period",
+    "operating_period",
+    "age_range",
+    "managing_regions",
+    "residence_regions",
+)
+REGION_FIELDS = ("managing_regions", "residence_regions")
+
+
+def policy_key(policy):
+    """원본 링크(없으면 정책 제목)로 만든 안정적인 정책 id"""
+    source = policy.get("Original Link") or policy["Policy Title"]
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+
+def content_hash(policy):
+    serialized = json.dumps(policy, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
+def default_cache_path(policy_path):
+    return os.path.splitext(policy_path)[0] + ".parsed.json"
+
+
+def load_parsed_cache(cache_path):
+    """저장된 파싱 결과 로드: 정책 id -> {"hash": 내용 해시, "parsed": 파싱 결과}"""
+    if not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable parsed policy cache {cache_path}: {e}")
+        return {}
+    if cache.get("version") != PARSED_POLICY_VERSION:
+        return {}
+    return cache["policies"]
+
+
+def save_parsed_cache(cache_path, entries):
+    # 저장 도중 중단되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": PARSED_POLICY_VERSION, "policies": entries},
+            f,
+            ensure_ascii=False,
+        )
+    os.replace(tmp_path, cache_path)
+
+
+def _to_stored(parsed_policy):
+    stored = {key: parsed_policy[key] for key in PARSED_FIELDS if key in parsed_policy}
+    for key in REGION_FIELDS:
+        stored[key] = sorted(stored[key])
+    return stored
+
+
+def _from_stored(policy, stored):
+    """저장된 파싱 결과와 원본 정책으로 parse_policy와 같은 형태의 dict를 만듦"""
+    parsed_policy = {
+        "title": policy["Policy Title"],
+        "description": policy["Description"],
+    }
+    parsed_policy.update(stored)
+    for key in REGION_FIELDS:
+        parsed_policy[key] = set(stored[key])
+    parsed_policy["original_link"] = policy.get("Original Link", "")
+    parsed_policy["details"] = {
+        detail["Title"]: detail["Content"] for detail in policy["Details"]
+    }
+    return parsed_policy
+
+
+def sync_policies(policy_path, cache_path=None):
+    """
+    정책 원본 파일을 읽고, 저장된 파싱 결과와 비교해 바뀐 정책만 다시 파싱
+
+    Args:
+        policy_path (str): filtered_policies.json 경로
+        cache_path (str): 파싱 결과 저장 경로 (기본값: 원본 옆의 *.parsed.json)
+
+    Returns:
+        tuple: (원본 순서의 파싱된 정책 목록, 변경 통계 dict)
+    """
+    cache_path = cache_path or default_cache_path(policy_path)
+    with open(policy_path, "r", encoding="utf-8") as f:
+        policy_data = json.load(f)
+
+    cached_entries = load_parsed_cache(cache_path)
+    entries = {}
+    parsed_policies = []
+    stats = {"added": 0, "changed": 0, "unchanged": 0, "removed": 0}
+
+    for policy in policy_data:
+        policy_id = policy_key(policy)
+        # 같은 링크/제목이 여러 번 나오면 등장 순서로 구분
+        duplicate = 1
+        base_id = policy_id
+        while policy_id in entries:
+            duplicate += 1
+            policy_id = f"{base_id}-{duplicate}"
+
+        digest = content_hash(policy)
+        cached = cached_entries.get(policy_id)
+        if cached and cached["hash"] == digest:
+            parsed_policy = _from_stored(policy, cached["parsed"])
+            stats["unchanged"] += 1
+        else:
+            parsed_policy = parse_policy(policy)
+            stats["changed" if cached else "added"] += 1
+
+        parsed_policy["policy_id"] = policy_id
+        entries[policy_id] = {"hash": digest, "parsed": _to_stored(parsed_policy)}
+        parsed_policies.append(parsed_policy)
+
+    stats["removed"] = len(set(cached_entries) - set(entries))
+    if stats["added"] or stats["changed"] or stats["removed"]:
+        save_parsed_cache(cache_path, entries)
+
+    return parsed_policies, stats
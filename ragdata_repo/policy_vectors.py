@@ -0,0 +1,177 @@
+import argparse
+import hashlib
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from .flat_index import normalize_rows, top_k_rows
+from .llamaindex_search import embed_query, load_embed_model
+from .policy_index import bits_to_ids, load_policy_index
+
+# 자격 필터 + 임베딩 검색 결합
+# PolicyIndex의 정책마다 임베딩을 하나씩 두고(같은 위치 순서), (나이, 지역, 날짜) 비트셋으로
+# 자격이 되는 정책만 고른 뒤 그 행들만 고민사항 임베딩과 내적해서 top-k를 구함
+
+# 정책 임베딩에 쓸 상세 항목 (고민사항과 비교할 정책의 주제/혜택)
+EMBED_DETAIL_FIELDS = ("정책 소개", "지원 내용")
+# 항목별 최대 글자 수 (임베딩 모델의 최대 토큰 수를 넘는 부분은 어차피 잘림)
+MAX_EMBED_FIELD_CHARS = 500
+
+
+def policy_embedding_text(policy):
+    """정책 임베딩 입력: 제목, 설명, 주요 상세 항목"""
+    parts = [policy["title"], policy["description"]]
+    for field in EMBED_DETAIL_FIELDS:
+        value = policy["details"].get(field)
+        if value:
+            parts.append(str(value).strip()[:MAX_EMBED_FIELD_CHARS])
+    return "\n".join(str(part) for part in parts if part)
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def default_vectors_path(policy_path):
+    return os.path.splitext(policy_path)[0] + ".vectors.npz"
+
+
+def load_vector_cache(vectors_path, model_id):
+    """저장된 정책 임베딩: (정책 id, 텍스트 해시) -> 임베딩. 모델이 다르면 빈 dict"""
+    try:
+        with np.load(vectors_path) as data:
+            if str(data["model_id"]) != model_id:
+                return {}
+            keys = zip(data["policy_ids"].tolist(), data["hashes"].tolist())
+            return dict(zip(keys, data["embeddings"]))
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Ignoring unreadable policy vectors {vectors_path}: {e}")
+        return {}
+
+
+def save_vector_cache(vectors_path, model_id, policy_ids, hashes, embeddings):
+    # 저장 도중 중단되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = vectors_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            model_id=np.array(model_id),
+            policy_ids=np.array(policy_ids, dtype=str),
+            hashes=np.array(hashes, dtype=str),
+            embeddings=embeddings,
+        )
+    os.replace(tmp_path, vectors_path)
+
+
+def sync_policy_vectors(index, embed_model, model_id, vectors_path):
+    """
+    PolicyIndex 정책 순서와 같은 행 순서의 정규화된 임베딩 행렬
+
+    정책 id와 임베딩 텍스트 해시가 같은 정책은 저장된 임베딩을 재사용하고,
+    새로 추가되거나 내용이 바뀐 정책만 임베딩한다.
+    """
+    policy_ids = [str(policy_id) for policy_id in index.ids]
+    texts = [policy_embedding_text(policy) for policy in index.policies]
+    hashes = [text_hash(text) for text in texts]
+
+    cached = load_vector_cache(vectors_path, model_id)
+    missing = [
+        position
+        for position, key in enumerate(zip(policy_ids, hashes))
+        if key not in cached
+    ]
+    new_embeddings = {}
+    if missing:
+        print(f"Embedding {len(missing)} of {len(texts)} policies")
+        embedded = embed_model.get_text_embedding_batch(
+            [texts[position] for position in missing]
+        )
+        new_embeddings = dict(zip(missing, embedded))
+
+    rows = [
+        new_embeddings[position] if position in new_embeddings else cached[key]
+        for position, key in enumerate(zip(policy_ids, hashes))
+    ]
+    embeddings = normalize_rows(np.asarray(rows, dtype=np.float32))
+    if missing or len(cached) != len(rows):
+        save_vector_cache(vectors_path, model_id, policy_ids, hashes, embeddings)
+    return embeddings
+
+
+# 정책 파일 경로별 임베딩 캐시: 경로 -> (PolicyIndex, 모델 식별자, 임베딩 행렬)
+_vectors_cache = {}
+# 여러 세션이 동시에 처음 검색해도 정책 임베딩은 한 번만 동기화
+_vectors_lock = threading.Lock()
+
+
+def load_policy_vectors(policy_path):
+    """정책 파일의 PolicyIndex와 정렬된 정책 임베딩 (인덱스가 다시 만들어지면 다시 동기화)"""
+    index = load_policy_index(policy_path)
+    embedder = load_embed_model()
+    cached = _vectors_cache.get(policy_path)
+    if cached and cached[0] is index and cached[1] == embedder["model_id"]:
+        return index, cached[2]
+
+    with _vectors_lock:
+        cached = _vectors_cache.get(policy_path)
+        if cached and cached[0] is index and cached[1] == embedder["model_id"]:
+            return index, cached[2]
+
+        embeddings = sync_policy_vectors(
+            index,
+            embedder["embed_model"],
+            embedder["model_id"],
+            default_vectors_path(policy_path),
+        )
+        _vectors_cache[policy_path] = (index, embedder["model_id"], embeddings)
+    return index, embeddings
+
+
+def search_eligible_policies(
+    policy_path, user_age, user_region, current_date, query, k
+):
+    """
+    자격이 되는 정책 중 고민사항과 가장 비슷한 k개
+
+    자격 비트셋으로 후보 위치를 먼저 구하고, 후보 행만 모아서 점수를 계산한다.
+
+    Returns:
+        list: policy_parser 결과와 같은 형식에 "similarity_score"를 더한 dict 목록 (유사도 내림차순)
+    """
+    index, embeddings = load_policy_vectors(policy_path)
+    if isinstance(current_date, str):
+        current_date = datetime.strptime(current_date, "%Y-%m-%d")
+
+    candidates = np.array(
+        bits_to_ids(index.query_bits(user_age, user_region, current_date)),
+        dtype=np.int64,
+    )
+    if not len(candidates):
+        return []
+
+    query_embedding = normalize_rows(embed_query(query))
+    scores = embeddings[candidates] @ query_embedding
+    results = []
+    for row in top_k_rows(scores, k):
+        recommendation = index.recommendation(int(candidates[row]))
+        recommendation["similarity_score"] = round(float(scores[row]), 3)
+        results.append(recommendation)
+    return results
+
+
+if __name__ == "__main__":
+    # 정책 파일이 바뀐 뒤 한 번 실행해서 새로 추가되거나 바뀐 정책의 임베딩을 미리 저장
+    # (POLICY_RETRIEVAL=fused일 때 첫 요청에서 정책을 임베딩하지 않도록)
+    from .policy_parser import policy_data_path
+
+    parser = argparse.ArgumentParser(description="정책 임베딩 저장")
+    parser.add_argument("--path", default=policy_data_path, help="정책 JSON 파일 경로")
+    args = parser.parse_args()
+    index, embeddings = load_policy_vectors(args.path)
+    print(
+        f"Saved {len(embeddings)} policy vectors to {default_vectors_path(args.path)}"
+    )
@@ -0,0 +1,139 @@
+import atexit
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+# 검색어 임베딩 LRU 캐시
+# 같은 고민사항("전세 사기가 걱정돼요")이 반복되면 임베딩 모델을 다시 돌리지 않고 저장된 벡터를 사용
+# persist_path를 주면 npz로 저장해 재시작 후에도 사용 (임베딩 모델 식별자가 다르면 버림)
+
+
+def normalize_query(query):
+    """캐시 키: 유니코드 NFC 정규화, 앞뒤/연속 공백 정리 (토크나이저 입장에서 같은 문장)"""
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+class QueryEmbeddingCache:
+    """
+    Attributes:
+        max_size (int): 최대 저장 개수 (가장 오래 쓰지 않은 검색어부터 버림)
+        hits (int), misses (int): 캐시 적중/실패 횟수
+    """
+
+    def __init__(self, model_id, max_size=1024, persist_path=None, save_every=16):
+        self.model_id = model_id
+        self.max_size = max_size
+        self.persist_path = persist_path
+        self.save_every = save_every
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._unsaved = 0
+        # Streamlit은 세션마다 스레드가 달라서 잠금 필요
+        self._lock = threading.Lock()
+
+        if persist_path and max_size > 0:
+            self.load()
+            atexit.register(self.save)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, query):
+        key = normalize_query(query)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, query, embedding):
+        if self.max_size <= 0:
+            return
+        key = normalize_query(query)
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.flags.writeable = False
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            self._unsaved += 1
+            save = self.persist_path and self._unsaved >= self.save_every
+        if save:
+            self.save()
+
+    def get_or_embed(self, query, embed):
+        """캐시에 없으면 embed(query)로 임베딩해서 저장"""
+        embedding = self.get(query)
+        if embedding is None:
+            embedding = np.asarray(embed(query), dtype=np.float32)
+            self.put(query, embedding)
+        return embedding
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def save(self):
+        if not self.persist_path:
+            return
+        with self._lock:
+            if not self._unsaved:
+                return
+            queries = list(self._entries)
+            embeddings = list(self._entries.values())
+            self._unsaved = 0
+
+        # 프로세스 여러 개가 같은 파일을 쓸 수 있으므로 프로세스별 임시 파일에 쓴 뒤 교체
+        os.makedirs(os.path.dirname(self.persist_path), exist_ok=True)
+        tmp_path = f"{self.persist_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                model_id=np.array(self.model_id),
+                queries=np.array(queries, dtype=str),
+                embeddings=np.array(embeddings, dtype=np.float32),
+            )
+        os.replace(tmp_path, self.persist_path)
+
+    def load(self):
+        try:
+            with np.load(self.persist_path) as data:
+                if str(data["model_id"]) != self.model_id:
+                    print(
+                        f"Ignoring query cache {self.persist_path} (embedding model changed)"
+                    )
+                    return
+                queries = data["queries"].tolist()
+                embeddings = data["embeddings"]
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Error loading query cache {self.persist_path}: {e}")
+            return
+
+        # 저장된 순서(오래된 것 -> 최근)대로 넣어서 LRU 순서 유지
+        with self._lock:
+            for query, embedding in zip(
+                queries[-self.max_size :], embeddings[-self.max_size :]
+            ):
+                embedding = np.array(embedding)
+                embedding.flags.writeable = False
+                self._entries[query] = embedding
@@ -0,0 +1,361 @@
+from collections import deque
+
+# 지역 분류기: 광역 시도 이름(별칭 포함)과 시군구 이름을 Aho-Corasick 오토마톤 하나로 매칭
+# 정책의 "주관 기관" / "거주지 및 소득", 청약 데이터의 region_name 분류에 공통으로 사용
+
+# 광역 시도 -> 시군구 테이블 (튜플 키는 (대표 코드, 별칭...) 형태)
+regions = {
+    ("서울"): [
+        "종로",
+        "중구",
+        "용산",
+        "성동",
+        "광진",
+        "동대문",
+        "중랑",
+        "성북",
+        "강북",
+        "도봉",
+        "노원",
+        "은평",
+        "서대문",
+        "마포",
+        "양천",
+        "강서",
+        "구로",
+        "금천",
+        "영등포",
+        "동작",
+        "관악",
+        "서초",
+        "강남",
+        "송파",
+        "강동",
+    ],
+    ("부산"): [
+        "중구",
+        "서구",
+        "동구",
+        "영도",
+        "부산진",
+        "동래",
+        "남구",
+        "북구",
+        "해운대",
+        "사하",
+        "금정",
+        "강서",
+        "연제",
+        "수영",
+        "사상",
+        "기장",
+    ],
+    ("대구"): ["중구", "동구", "서구", "남구", "북구", "수성", "달서", "달성"],
+    ("인천"): ["중구", "동구", "미추홀", "연수", "남동", "부평", "계양", "서구", "강화", "옹진"],
+    ("광주"): ["동구", "서구", "남구", "북구", "광산"],
+    ("대전"): ["동구", "중구", "서구", "유성", "대덕"],
+    ("울산"): ["중구", "남구", "동구", "북구", "울주"],
+    ("세종"): ["세종"],
+    ("경기"): [
+        "수원",
+        "성남",
+        "안양",
+        "안산",
+        "용인",
+        "부천",
+        "광명",
+        "평택",
+        "과천",
+        "오산",
+        "시흥",
+        "군포",
+        "의왕",
+        "하남",
+        "이천",
+        "안성",
+        "김포",
+        "화성",
+        "광주",
+        "양주",
+        "포천",
+        "여주",
+        "연천",
+        "가평",
+        "양평",
+    ],
+    ("강원"): [
+        "춘천",
+        "원주",
+        "강릉",
+        "동해",
+        "태백",
+        "속초",
+        "삼척",
+        "홍천",
+        "횡성",
+        "영월",
+        "평창",
+        "정선",
+        "철원",
+        "화천",
+        "양구",
+        "인제",
+        "고성",
+        "양양",
+    ],
+    ("충북", "충청북도"): ["청주", "충주", "제천", "보은", "옥천", "영동", "증평", "진천", "괴산", "음성", "단양"],
+    ("충남", "충청남도"): [
+        "천안",
+        "공주",
+        "보령",
+        "아산",
+        "서산",
+        "논산",
+        "계룡",
+        "당진",
+        "금산",
+        "부여",
+        "서천",
+        "청양",
+        "홍성",
+        "예산",
+        "태안",
+    ],
+    ("전북", "전라북도"): [
+        "전주",
+        "군산",
+        "익산",
+        "정읍",
+        "남원",
+        "김제",
+        "완주",
+        "진안",
+        "무주",
+        "장수",
+        "임실",
+        "순창",
+        "고창",
+        "부안",
+    ],
+    ("전남", "전라남도"): [
+        "목포",
+        "여수",
+        "순천",
+        "나주",
+        "광양",
+        "담양",
+        "곡성",
+        "구례",
+        "고흥",
+        "보성",
+        "화순",
+        "장흥",
+        "강진",
+        "해남",
+        "영암",
+        "무안",
+        "함평",
+        "영광",
+        "장성",
+        "완도",
+        "진도",
+        "신안",
+    ],
+    ("경북", "경상북도"): [
+        "포항",
+        "경주",
+        "김천",
+        "안동",
+        "구미",
+        "영주",
+        "영천",
+        "상주",
+        "문경",
+        "경산",
+        "군위",
+        "의성",
+        "청송",
+        "영양",
+        "영덕",
+        "청도",
+        "고령",
+        "성주",
+        "칠곡",
+        "예천",
+        "봉화",
+        "울진",
+        "울릉",
+    ],
+    ("경남", "경상남도"): [
+        "창원",
+        "진주",
+        "통영",
+        "사천",
+        "김해",
+        "밀양",
+        "거제",
+        "양산",
+        "의령",
+        "함안",
+        "창녕",
+        "고성",
+        "남해",
+        "하동",
+        "산청",
+        "함양",
+        "거창",
+        "합천",
+    ],
+    ("제주"): ["제주", "서귀포"],
+}
+
+
+# 시도 이름 뒤에 붙는 행정구역 접미사 ("경기도 광주시"에서 "경기"와 "광주" 사이)
+PROVINCE_SUFFIXES = ("", "도", "특별시", "광역시", "특별자치시", "특별자치도")
+
+
+class RegionMatcher:
+    """
+    지역 테이블로 만든 다중 패턴 오토마톤
+
+    문자열을 한 번 훑으면서 모든 시도 별칭과 시군구 이름을 동시에 찾고,
+    기존 classify_regions와 같은 우선순위로 대표 시도 코드를 반환한다.
+    (시도 별칭 매칭이 시군구 매칭보다 우선, 같은 종류끼리는 테이블 순서가 빠른 시도가 우선)
+
+    단, 시도 이름이면서 다른 시도의 시군구 이름이기도 한 매칭("광주")이 그 시도 이름
+    바로 뒤에 오면("경기도 광주시") 시도가 아니라 앞 시도의 시군구로 본다.
+    """
+
+    def __init__(self, regions):
+        self.regions = regions
+        self.provinces = []
+        self._goto = [{}]
+        self._fail = [0]
+        # 상태별로 도달 가능한 매칭 중 가장 우선순위가 높은 (종류, 시도 순서) 라벨
+        self._best = [None]
+        # 상태별로 끝나는 패턴 목록 (패턴 길이, (종류, 시도 순서)), 실패 링크로 이어지는 접미사 포함
+        self._outputs = [[]]
+        # 시도 이름이면서 시군구 이름인 패턴이 끝나는 상태 (이 상태를 지나면 위치를 따져서 분류)
+        self._ambiguous = set()
+
+        for rank, (key, districts) in enumerate(regions.items()):
+            aliases = key if isinstance(key, tuple) else (key,)
+            self.provinces.append(aliases[0])
+            for alias in aliases:
+                self._add_pattern(alias, (0, rank))
+            for district in districts:
+                self._add_pattern(district, (1, rank))
+
+        self._build_fail_links()
+
+    def _add_pattern(self, pattern, label):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+                self._outputs.append([])
+            state = next_state
+        if self._best[state] is None or label < self._best[state]:
+            self._best[state] = label
+        self._outputs[state].append((len(pattern), label))
+        if len({kind for _, (kind, _) in self._outputs[state]}) > 1:
+            self._ambiguous.add(state)
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail_state = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail_state
+
+                # 실패 링크로 이어지는 접미사 매칭까지 합쳐서 최선 라벨과 출력을 미리 계산
+                # (BFS 순서라서 실패 링크 상태는 이미 계산되어 있음)
+                inherited = self._best[fail_state]
+                if inherited is not None and (
+                    self._best[next_state] is None or inherited < self._best[next_state]
+                ):
+                    self._best[next_state] = inherited
+                self._outputs[next_state] = (
+                    self._outputs[next_state] + self._outputs[fail_state]
+                )
+                if fail_state in self._ambiguous:
+                    self._ambiguous.add(next_state)
+
+    def _matches(self, text):
+        """(시작 위치, 끝 위치, (종류, 시도 순서)) 목록"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matches = []
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, label in outputs[state]:
+                matches.append((end - length, end, label))
+        return matches
+
+    def classify(self, text):
+        """문자열의 대표 시도 코드를 반환 (어떤 지역과도 매칭되지 않으면 "전국")"""
+        if not isinstance(text, str):
+            return "전국"
+
+        goto, fail, best_labels = self._goto, self._fail, self._best
+        best = None
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if state in self._ambiguous:
+                return self._classify_by_position(text)
+            label = best_labels[state]
+            if label is not None and (best is None or label < best):
+                best = label
+
+        if best is None:
+            return "전국"
+        return self.provinces[best[1]]
+
+    def _classify_by_position(self, text):
+        # 모호한 이름("광주")이 나온 문자열만 매칭 위치를 모두 모아서 분류
+        matches = self._matches(text)
+        # 시도 이름이 끝난 위치 -> 시도 순서
+        province_ends = {end: label[1] for _, end, label in matches if label[0] == 0}
+
+        def follows_province(start, rank):
+            # text[start:]가 rank 시도 이름(+접미사) 바로 뒤에서 시작하는지
+            prefix = text[:start].rstrip()
+            return any(
+                prefix.endswith(suffix)
+                and province_ends.get(len(prefix) - len(suffix)) == rank
+                for suffix in PROVINCE_SUFFIXES
+            )
+
+        # 같은 구간이 시군구로도 매칭되고 그 시군구의 시도 바로 뒤라면 시도 매칭에서 제외
+        district_of = {
+            (start, end)
+            for start, end, (kind, rank) in matches
+            if kind == 1 and follows_province(start, rank)
+        }
+        labels = [
+            label
+            for start, end, label in matches
+            if not (label[0] == 0 and (start, end) in district_of)
+        ]
+
+        if not labels:
+            return "전국"
+        return self.provinces[min(labels)[1]]
+
+
+region_matcher = RegionMatcher(regions)
@@ -1,7 +1,17 @@
+import argparse
+import csv
+import hashlib
+import json
 import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
 import pdfplumber
-import pandas as pd
-import re
+
+try:
+    from .metadata_extractor import api_extractor, crawl_extractor
+except ImportError:  # python ragdata_repo/subscription_extract.py로 직접 실행한 경우
+    from metadata_extractor import api_extractor, crawl_extractor
 
 # 현재 작업 디렉토리 확인
 # current_dir = "/Users/hyottz/Desktop/24f-houseplan/24f_daiv_houseplan"
@@ -10,29 +20,124 @@ current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # 상대 경로 설정
 api_data_path = os.path.join(current_dir, "data/api_data")
 crawl_data_path = os.path.join(current_dir, "data/crawl_data")
+extract_cache_path = os.path.join(current_dir, "data/.extract_cache")
 
+# 텍스트/메타데이터 추출 로직이 바뀌면 값을 올려서 캐시된 추출 결과를 모두 무효화
+EXTRACTOR_VERSION = 1
 
-# PDF 파일 읽기 함수
+
+# PDF 파일 읽기 함수 (실행마다 같은 순서가 되도록 경로를 정렬)
 def read_pdf_files(directory_path):
     pdf_files = []
     for root, _, files in os.walk(directory_path):
         for file in files:
             if file.endswith(".pdf"):
                 pdf_files.append(os.path.join(root, file))
-    return pdf_files
+    return sorted(pdf_files)
+
+
+# 조기 종료 모드에서 모두 찾으면 읽기를 멈추는 필드
+# (특별공급조건은 키워드가 '없음'을 확인하려면 끝까지 읽어야 하므로 포함하지 않음)
+REQUIRED_FIELDS = {
+    "api": ("supply_name", "region_name", "application_schedule", "enter_day"),
+    "crawl": (
+        "supply_name",
+        "region_name",
+        "supply_type",
+        "area",
+        "application_schedule",
+    ),
+}
+
+
+# 조기 종료 모드에서 아직 찾지 못한 필드는 새 페이지와 그 앞 텍스트의 마지막 몇 줄만 다시 검색
+# (라벨과 값이 페이지 경계에서 나뉜 경우를 위해 앞 페이지 끝부분을 함께 검색)
+RESCAN_LINES = 3
+
+
+def _tail_start(text, lines):
+    """줄바꿈으로 끝나는 text에서 마지막 lines줄이 시작하는 위치"""
+    pos = len(text) - 1
+    for _ in range(lines):
+        pos = text.rfind("\n", 0, pos)
+        if pos < 0:
+            return 0
+    return pos + 1
+
+
+def _field_found(extractor, field, text, start, positions):
+    match = extractor.search(field, text, start, positions)
+    return match is not None and field["value"](match) is not None
+
+
+def read_pdf_text_early_stop(pdf_path, kind, max_pages=None):
+    """
+    필요한 메타데이터 필드를 모두 찾을 때까지만 페이지를 차례로 읽음
 
+    페이지마다 뒤에 줄바꿈을 붙이므로, 읽은 부분에서 찾은 필드 값은 전체 텍스트에서 찾은 값과 같다.
+    특별공급조건은 읽은 페이지에 나온 키워드만 반영된다.
+    이미 찾은 필드는 다시 검색하지 않고, 못 찾은 필드는 새로 읽은 부분(+ 앞 텍스트의 마지막
+    RESCAN_LINES줄)에서만 검색하므로 페이지 수에 비례하는 시간이 든다.
+    (라벨과 값이 RESCAN_LINES줄보다 멀리 떨어진 채 페이지 경계에 걸치면 못 찾은 것으로 보고
+    더 읽을 뿐이며, 메타데이터는 parse_pdfs에서 읽은 텍스트 전체로 추출한다)
 
-# 텍스트 추출 함수
-def extract_text_from_pdf(pdf_path):
+    Args:
+        pdf_path (str): PDF 경로
+        kind (str): "api" 또는 "crawl"
+        max_pages (int): 파일당 최대로 읽을 페이지 수 (기본값: 제한 없음)
+
+    Returns:
+        tuple: (텍스트, 읽은 페이지 수, 전체 페이지 수)
+    """
+    extractor = api_extractor if kind == "api" else crawl_extractor
+    missing = [
+        field for field in extractor.fields if field["name"] in REQUIRED_FIELDS[kind]
+    ]
+    text = ""
+    start = 0
+    pages_read = 0
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+        for page in pdf.pages[:max_pages]:
+            text += page.extract_text() + "\n"
+            pages_read += 1
+            page.close()
+            # 못 찾은 필드의 라벨을 한 번에 찾고, 라벨이 있는 필드만 패턴 검색
+            positions = extractor.locate(
+                text,
+                start,
+                [anchor for field in missing for anchor in field["anchors"]],
+            )
+            missing = [
+                field
+                for field in missing
+                if not _field_found(extractor, field, text, start, positions)
+            ]
+            if not missing:
+                break
+            start = _tail_start(text, RESCAN_LINES)
+    return text.strip(), pages_read, page_count
+
+
+def read_pdf_pages(pdf_path, kind=None, max_pages=None):
+    # kind가 주어지면 조기 종료 모드, 아니면 (최대 max_pages까지) 전체 페이지를 읽음
+    if kind:
+        return read_pdf_text_early_stop(pdf_path, kind, max_pages)
+    text = ""
+    with pdfplumber.open(pdf_path) as pdf:
+        pages = pdf.pages[:max_pages]
+        for page in pages:
+            text += page.extract_text() + "\n"
+        return text.strip(), len(pages), len(pdf.pages)
+
+
+# 프로세스 풀 작업 단위: 실패해도 예외 대신 오류 메시지를 돌려줘서 전체 실행이 중단되지 않게 함
+def _extract_worker(job):
+    pdf_path, kind, max_pages = job
     try:
-        text = ""
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-        return text.strip()
+        return (pdf_path, *read_pdf_pages(pdf_path, kind, max_pages), None)
     except Exception as e:
-        print(f"Error reading {pdf_path}: {e}")
-        return None
+        return pdf_path, None, 0, 0, f"{type(e).__name__}: {e}"
 
 
 # API 메타데이터 추출 함수
@@ -46,32 +151,8 @@ def extract_metadata_api(text, max_supply_price):
         "max_supply_price": max_supply_price,
     }
 
-    # 공급명 추출
-    supply_name_match = re.search(r"입주자모집공고주요정보\s*(.+)", text)
-    if supply_name_match:
-        metadata["supply_name"] = supply_name_match.group(1).strip()
-
-    # 지역명 추출
-    region_name_match = re.search(r"공급위치\s*(.+)", text)
-    if region_name_match:
-        metadata["region_name"] = region_name_match.group(1).strip()
-
-    # 청약일정 추출
-    schedule_match = re.search(r"당첨자 발표일\s*(\d{4}-\d{2}-\d{2})", text)
-    if schedule_match:
-        metadata["application_schedule"] = schedule_match.group(1).strip()
-
-    # 특별공급조건 추출
-    special_conditions_keywords = ["다자녀", "신혼부", "생애최", "노부모", "신생아", "청년"]
-    for keyword in special_conditions_keywords:
-        if keyword in text:
-            metadata["special_supply_conditions"].append(keyword)
-
-    # 입주예정월 추출
-    enter_day_match = re.search(r"입주예정월 :\s*(\d{4}\.\d{2})", text)
-    if enter_day_match:
-        metadata["enter_day"] = enter_day_match.group(1).strip()
-
+    # 공급명, 지역명, 청약일정, 특별공급조건, 입주예정월 추출 (라벨과 키워드를 한 번 스캔한 뒤 필드마다 라벨 위치부터 검색)
+    metadata.update(api_extractor.extract(text))
     return metadata
 
 
@@ -86,79 +167,473 @@ def extract_metadata_crawl(text):
         "special_supply_conditions": [],
     }
 
-    # 공급명 추출
-    supply_name_match = re.search(r"(.+?)\.pdf 바로보기", text)
-    if supply_name_match:
-        metadata["supply_name"] = supply_name_match.group(1).strip()
+    # 공급명, 지역명, 공급유형, 면적, 청약일정, 특별공급조건 추출 (라벨과 키워드를 한 번 스캔한 뒤 필드마다 라벨 위치부터 검색)
+    metadata.update(crawl_extractor.extract(text))
+    return metadata
 
-    # 지역명 추출
-    region_name_match = re.search(
-        r"모집지역\s*:\s*(.+?)$|소재지\s*:\s*(.+?)$", text, re.MULTILINE
-    )
-    if region_name_match:
-        region_name = region_name_match.group(1) or region_name_match.group(2)
-        if "확인" not in region_name:
-            metadata["region_name"] = region_name.strip()
-
-    # 공급유형 추출
-    supply_type_match = re.search(r"유형\s*:\s*(.+?)\s", text)
-    if supply_type_match:
-        metadata["supply_type"] = supply_type_match.group(1).strip()
-
-    # 면적 추출
-    area_match = re.search(r"전용면적\(㎡\)\s*:\s*(\d+\.\d+)", text)
-    if area_match:
-        metadata["area"] = area_match.group(1).strip()
-
-    # 청약일정 추출
-    schedule_match = re.search(
-        r"접수기간\s*:\s*(\d{4}\.\d{2}\.\d{2})\s*~\s*(\d{4}\.\d{2}\.\d{2})", text
+
+def extract_metadata(kind, text):
+    if kind == "api":
+        max_supply_price = None
+        return extract_metadata_api(text, max_supply_price)
+    return extract_metadata_crawl(text)
+
+
+def extraction_mode(early_stop=False, max_pages=None):
+    # 같은 PDF라도 읽는 방식이 다르면 결과가 다르므로 캐시 키에 포함
+    mode = "early" if early_stop else "full"
+    if max_pages:
+        mode += f"-p{max_pages}"
+    return mode
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_json(path, data):
+    # 중간에 중단되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class ExtractionCache:
+    """
+    PDF 내용 해시(+ 추출기 버전)별 추출 결과 캐시
+
+    entries/ 아래에 PDF마다 추출 텍스트와 메타데이터를 저장하고,
+    manifest.json에 경로별 (크기, 수정 시각, 해시)를 기록해 바뀌지 않은 파일은 다시 해시하지 않는다.
+    """
+
+    def __init__(self, cache_dir):
+        self.entry_dir = os.path.join(cache_dir, "entries")
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        os.makedirs(self.entry_dir, exist_ok=True)
+
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable extract cache manifest: {e}")
+        # 이번 실행에서 발견된 파일 (prune 시 manifest로 저장)과 조회한 캐시 키
+        self.seen = {}
+        self.live_keys = set()
+
+    def key(self, kind, pdf_path, mode="full"):
+        stat = os.stat(pdf_path)
+        known = self.manifest.get(pdf_path)
+        if (
+            known
+            and known["size"] == stat.st_size
+            and known["mtime_ns"] == stat.st_mtime_ns
+        ):
+            digest = known["hash"]
+        else:
+            digest = file_sha256(pdf_path)
+        self.seen[pdf_path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": digest,
+        }
+        key = f"{kind}-{digest}-{mode}-v{EXTRACTOR_VERSION}"
+        self.live_keys.add(key)
+        return key
+
+    def _entry_path(self, key):
+        return os.path.join(self.entry_dir, key + ".json")
+
+    def get(self, key):
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, entry):
+        _write_json(self._entry_path(key), entry)
+
+    def prune(self, live_keys):
+        """이번 실행에서 쓰이지 않은(삭제/변경된 PDF, 다른 추출 모드, 이전 추출기 버전) 항목을 삭제"""
+        removed = 0
+        for file_name in os.listdir(self.entry_dir):
+            if file_name[: -len(".json")] not in live_keys:
+                os.remove(os.path.join(self.entry_dir, file_name))
+                removed += 1
+        _write_json(self.manifest_path, self.seen)
+        return removed
+
+    def save_manifest(self):
+        """항목을 정리하지 않고 이번 실행에서 확인한 파일 정보만 manifest에 반영"""
+        self.manifest.update(self.seen)
+        _write_json(self.manifest_path, self.manifest)
+
+
+# 출력 CSV 컬럼 (API/Crawl 메타데이터 필드의 합집합, 순서 고정)
+CSV_COLUMNS = [
+    "supply_name",
+    "region_name",
+    "application_schedule",
+    "special_supply_conditions",
+    "enter_day",
+    "max_supply_price",
+    "supply_type",
+    "area",
+]
+PAGE_REPORT_COLUMNS = ["source", "kind", "pages_read", "page_count"]
+
+
+def discover_pdfs():
+    """추출할 PDF를 (종류, 경로)로 하나씩 돌려줌 (API 먼저, 각각 경로 순)"""
+    for kind, directory_path in (("api", api_data_path), ("crawl", crawl_data_path)):
+        for pdf_path in read_pdf_files(directory_path):
+            yield kind, pdf_path
+
+
+def _finish_extract(kind, pdf_path, cache_key, entry, task):
+    result = {"kind": kind, "source": pdf_path, "cache_key": cache_key}
+    if entry is not None:
+        result.update(
+            text=None,
+            metadata=entry["metadata"],
+            pages_read=entry.get("pages_read"),
+            page_count=entry.get("page_count"),
+            error=None,
+            cached=True,
+        )
+        return result
+
+    outcome = task.result() if isinstance(task, Future) else _extract_worker(task)
+    _, text, pages_read, page_count, error = outcome
+    result.update(
+        text=text,
+        metadata=None,
+        pages_read=pages_read,
+        page_count=page_count,
+        error=error,
+        cached=False,
     )
-    if schedule_match:
-        metadata["application_schedule"] = schedule_match.group(2).strip()
+    return result
 
-    # 특별공급조건 추출
-    special_conditions_keywords = ["다자녀", "신혼", "생애", "노부모", "신생아", "청년"]
-    for keyword in special_conditions_keywords:
-        if keyword in text:
-            metadata["special_supply_conditions"].append(keyword)
 
-    return metadata
+def extract_pdfs(
+    jobs, cache=None, workers=None, early_stop=False, max_pages=None, max_in_flight=None
+):
+    """
+    (종류, 경로)마다 캐시된 메타데이터를 읽거나 프로세스 풀에서 텍스트를 추출
 
+    프로세스 풀에는 최대 max_in_flight개까지만 작업을 넣어두고, 결과는 입력 순서대로 돌려준다.
 
-# PDF 파일 가져오기
-api_pdfs = read_pdf_files(api_data_path)
-crawl_pdfs = read_pdf_files(crawl_data_path)
+    Args:
+        jobs (iterable): discover_pdfs()가 돌려주는 (종류, 경로)
+        cache (ExtractionCache): 추출 캐시 (None이면 사용하지 않음)
+        workers (int): 프로세스 수 (기본값: CPU 코어 수, 1이면 현재 프로세스에서 순차 실행)
+        early_stop (bool): 필요한 필드를 모두 찾으면 나머지 페이지를 읽지 않음
+        max_pages (int): 파일당 최대로 읽을 페이지 수
+        max_in_flight (int): 동시에 처리 중인 파일 수 상한 (기본값: 프로세스 수 * 4)
 
-# API PDF 메타데이터 추출
-api_metadata = []
-if api_pdfs:
-    for pdf_path in api_pdfs:
-        print(f"Reading API PDF: {pdf_path}")
-        text = extract_text_from_pdf(pdf_path)
+    Yields:
+        dict: kind, source, cache_key, text, metadata(캐시 적중 시), pages_read, page_count, error, cached
+    """
+    mode = extraction_mode(early_stop, max_pages)
+    max_in_flight = max_in_flight or (workers or os.cpu_count() or 1) * 4
+    executor = None if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    window = deque()
+    try:
+        for kind, pdf_path in jobs:
+            cache_key = cache.key(kind, pdf_path, mode) if cache else None
+            entry = cache.get(cache_key) if cache else None
+            task = None
+            if entry is None:
+                task = (pdf_path, kind if early_stop else None, max_pages)
+                if executor:
+                    task = executor.submit(_extract_worker, task)
+            window.append((kind, pdf_path, cache_key, entry, task))
+            if len(window) >= max_in_flight:
+                yield _finish_extract(*window.popleft())
+        while window:
+            yield _finish_extract(*window.popleft())
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
 
-        max_supply_price = None
-        if text:
-            metadata = extract_metadata_api(text, max_supply_price)
-            api_metadata.append(metadata)
-
-# Crawl PDF 메타데이터 추출
-crawl_metadata = []
-if crawl_pdfs:
-    for pdf_path in crawl_pdfs:
-        print(f"Reading Crawl PDF: {pdf_path}")
-        text = extract_text_from_pdf(pdf_path)
-        if text:
-            metadata = extract_metadata_crawl(text)
-            crawl_metadata.append(metadata)
-
-# DataFrame으로 변환 및 결합
-api_data = pd.DataFrame(api_metadata)
-crawl_data = pd.DataFrame(crawl_metadata)
-combined_data = pd.concat([api_data, crawl_data], ignore_index=True)
-
-# CSV 저장
-output_path = os.path.join(current_dir, "data/combined_data.csv")
-combined_data.to_csv(output_path, index=False, encoding="utf-8-sig")
-
-print(f"Combined data saved to {output_path}")
+
+# pandas to_csv와 같은 형식으로 씀 (줄바꿈 "\n", None은 빈 칸)
+def to_csv_row(metadata):
+    row = {column: metadata.get(column) for column in CSV_COLUMNS}
+    # 리스트는 pandas와 같이 repr 문자열로 저장 (subscription_parser가 문자열로 읽어서 사용)
+    row["special_supply_conditions"] = str(metadata["special_supply_conditions"])
+    return row
+
+
+def parse_pdfs(results, cache=None):
+    """추출된 텍스트에서 메타데이터를 뽑아 CSV 행(row)을 붙이고, 새로 추출한 결과는 캐시에 저장"""
+    for result in results:
+        if result["error"] is None and not result["cached"]:
+            text = result["text"]
+            if text:
+                result["metadata"] = extract_metadata(result["kind"], text)
+            if cache:
+                cache.put(
+                    result["cache_key"],
+                    {
+                        "source": result["source"],
+                        "text": text,
+                        "metadata": result["metadata"],
+                        "pages_read": result["pages_read"],
+                        "page_count": result["page_count"],
+                    },
+                )
+        # 텍스트가 없는 PDF는 행을 만들지 않음
+        metadata = result["metadata"]
+        result["row"] = to_csv_row(metadata) if metadata else None
+        result["text"] = None
+        yield result
+
+
+def page_report_path(output_path):
+    """파일별 읽은 페이지 수를 기록하는 CSV 경로 (결과 CSV와 같은 디렉토리)"""
+    return os.path.join(os.path.dirname(output_path), "extract_pages.csv")
+
+
+def load_journal(journal_path, mode):
+    """
+    이전 실행의 진행 기록을 읽음
+
+    Returns:
+        tuple: (완료된 PDF 경로 set, 마지막으로 기록된 CSV 크기, 마지막으로 기록된 페이지 리포트 크기).
+            이어서 할 수 없으면 None
+    """
+    if not os.path.exists(journal_path):
+        return None
+    with open(journal_path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    try:
+        header = json.loads(lines[0])
+    except (IndexError, ValueError):
+        return None
+    if header.get("mode") != mode:
+        print(f"Journal was written in {header.get('mode')} mode, starting over")
+        return None
+    if "page_offset" not in header:
+        print("Journal has no page report offset, starting over")
+        return None
+
+    done = set()
+    offset, page_offset = header["offset"], header["page_offset"]
+    for line in lines[1:]:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # 기록 도중 중단된 마지막 줄
+            break
+        done.add(record["source"])
+        offset, page_offset = record["offset"], record["page_offset"]
+    return done, offset, page_offset
+
+
+def write_rows(results, output_path, journal_path, mode, progress=None):
+    """
+    결과를 한 행씩 CSV에 이어 쓰고, 행마다 진행 기록(journal)을 남김
+
+    journal에는 처리한 PDF와 그 시점의 CSV, 페이지 리포트 크기를 기록한다. progress(load_journal 결과)가
+    주어지면 두 파일을 마지막 기록 위치로 잘라서(중단 직전에 쓴 행 제거) 이어 쓴다.
+    (완료된 PDF는 호출하는 쪽에서 results에서 빼고 넘김) 모두 끝나면 journal을 지운다.
+
+    Returns:
+        tuple: (통계 dict, 실패 목록 [(경로, 오류 메시지)])
+    """
+    stats = {"written": 0, "empty": 0, "pages_read": 0, "page_count": 0}
+    failures = []
+    report_path = page_report_path(output_path)
+
+    if progress:
+        done, offset, page_offset = progress
+        os.truncate(output_path, offset)
+        os.truncate(report_path, page_offset)
+        print(f"Resuming: {len(done)} PDFs already done")
+        # 이어 쓸 때는 BOM을 다시 쓰지 않음
+        file_mode, encoding = "a", "utf-8"
+    else:
+        file_mode, encoding = "w", "utf-8-sig"
+
+    output = open(output_path, file_mode, encoding=encoding, newline="")
+    page_report = open(report_path, file_mode, encoding=encoding, newline="")
+    journal = open(journal_path, file_mode, encoding="utf-8")
+    writer = csv.DictWriter(output, fieldnames=CSV_COLUMNS, lineterminator="\n")
+    page_writer = csv.writer(page_report, lineterminator="\n")
+    if not progress:
+        writer.writeheader()
+        page_writer.writerow(PAGE_REPORT_COLUMNS)
+        output.flush()
+        page_report.flush()
+        journal.write(
+            json.dumps(
+                {
+                    "mode": mode,
+                    "offset": os.fstat(output.fileno()).st_size,
+                    "page_offset": os.fstat(page_report.fileno()).st_size,
+                }
+            )
+            + "\n"
+        )
+        journal.flush()
+
+    with output, page_report, journal:
+        for result in results:
+            if result["error"]:
+                # 실패한 PDF는 기록하지 않으므로 이어서 실행하면 다시 시도
+                print(f"Error reading {result['source']}: {result['error']}")
+                failures.append((result["source"], result["error"]))
+                continue
+
+            if result["row"]:
+                writer.writerow(result["row"])
+                stats["written"] += 1
+            else:
+                stats["empty"] += 1
+            page_writer.writerow([result[column] for column in PAGE_REPORT_COLUMNS])
+            stats["pages_read"] += result["pages_read"] or 0
+            stats["page_count"] += result["page_count"] or 0
+
+            output.flush()
+            page_report.flush()
+            journal.write(
+                json.dumps(
+                    {
+                        "source": result["source"],
+                        "offset": os.fstat(output.fileno()).st_size,
+                        "page_offset": os.fstat(page_report.fileno()).st_size,
+                    }
+                )
+                + "\n"
+            )
+            journal.flush()
+
+            processed = stats["written"] + stats["empty"] + len(failures)
+            if processed % 100 == 0:
+                print(f"Processed {processed} PDFs")
+
+    os.remove(journal_path)
+    return stats, failures
+
+
+def main(
+    workers=None,
+    use_cache=True,
+    early_stop=False,
+    max_pages=None,
+    resume=False,
+    max_in_flight=None,
+):
+    """PDF 탐색 → 텍스트 추출 → 메타데이터 파싱 → CSV 쓰기를 파일 단위로 흘려보내는 파이프라인"""
+    output_path = os.path.join(current_dir, "data/combined_data.csv")
+    journal_path = output_path + ".journal"
+    mode = extraction_mode(early_stop, max_pages)
+
+    # 이어서 실행할 때는 완료된 PDF를 캐시 조회/추출 전에 건너뜀
+    progress = load_journal(journal_path, mode) if resume else None
+    if progress and any(
+        not os.path.exists(path) or os.path.getsize(path) < offset
+        for path, offset in (
+            (output_path, progress[1]),
+            (page_report_path(output_path), progress[2]),
+        )
+    ):
+        print("Output is shorter than the journal, starting over")
+        progress = None
+    done = progress[0] if progress else set()
+    jobs = (job for job in discover_pdfs() if job[1] not in done)
+
+    # 내용이 바뀌지 않은 PDF는 캐시된 메타데이터를 사용
+    cache = ExtractionCache(extract_cache_path) if use_cache else None
+    results = extract_pdfs(
+        jobs,
+        cache,
+        workers,
+        early_stop=early_stop,
+        max_pages=max_pages,
+        max_in_flight=max_in_flight,
+    )
+    stats, failures = write_rows(
+        parse_pdfs(results, cache), output_path, journal_path, mode, progress
+    )
+
+    if cache:
+        if progress:
+            # 건너뛴 PDF의 캐시 항목은 이번 실행에서 확인하지 않았으므로 정리하지 않음
+            cache.save_manifest()
+        else:
+            # 실패한 PDF는 캐시 항목이 없으므로 조회한 키 전체를 남겨도 됨
+            removed = cache.prune(cache.live_keys)
+            if removed:
+                print(f"Pruned {removed} stale cache entries")
+
+    print(
+        f"Combined data saved to {output_path} "
+        f"({stats['written']} rows, {len(done)} resumed, {stats['empty']} empty)"
+    )
+    if stats["page_count"]:
+        ratio = stats["pages_read"] / stats["page_count"]
+        print(
+            f"Read {stats['pages_read']}/{stats['page_count']} pages ({ratio:.1%}) "
+            "in this run"
+        )
+    if failures:
+        print(f"{len(failures)} PDFs failed:")
+        for pdf_path, error in failures:
+            print(f"  {pdf_path}: {error}")
+    return stats, failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="청약 공고 PDF 메타데이터 추출")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="PDF 텍스트 추출 프로세스 수 (기본값: CPU 코어 수, 1이면 순차 실행)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="추출 캐시를 사용하지 않고 모든 PDF를 다시 추출",
+    )
+    parser.add_argument(
+        "--early-stop",
+        action="store_true",
+        help="필요한 메타데이터 필드를 모두 찾으면 나머지 페이지는 읽지 않음",
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=None,
+        help="파일당 최대로 읽을 페이지 수 (기본값: 제한 없음)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="중단된 이전 실행의 진행 기록이 있으면 완료된 PDF를 건너뛰고 이어서 씀",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="동시에 처리 중인 PDF 수 상한 (기본값: 프로세스 수 * 4)",
+    )
+    args = parser.parse_args()
+    main(
+        workers=args.workers,
+        use_cache=not args.no_cache,
+        early_stop=args.early_stop,
+        max_pages=args.max_pages,
+        resume=args.resume,
+        max_in_flight=args.max_in_flight,
+    )
@@ -1,6 +1,14 @@
+import ast
+import json
 import os
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime
+
 import pandas as pd
 
+from .region_matcher import region_matcher
+
 
 # 저장된 메타데이터 로드
 def load_metadata_from_file(metadata_save_path):
@@ -11,34 +19,206 @@ def load_metadata_from_file(metadata_save_path):
         return pd.DataFrame()
 
 
-# 데이터 필터링 함수
-def filter_data(data, user_input):
-    filtered_data = data.copy()
-    if "region_name" in user_input:
-        filtered_data = filtered_data[
-            filtered_data["region_name"].str.contains(
-                user_input["user_region"], na=False
-            )
+# 특별공급조건 대표 키워드
+# 데이터의 축약 키워드("신혼부", "생애최")와 사용자 선택지("신혼부부", "생애최초첫청약")를 같은 조건으로 묶음
+SPECIAL_CONDITIONS = ("다자녀", "신혼", "생애", "노부모", "신생아", "청년")
+
+
+def canonical_condition(condition):
+    for canonical in SPECIAL_CONDITIONS:
+        if canonical in condition:
+            return canonical
+    return None
+
+
+def parse_conditions(value):
+    """CSV에 문자열로 저장된 특별공급조건 목록("['청년', '신혼부']")을 list로 변환"""
+    if isinstance(value, list):
+        return value
+    if not isinstance(value, str) or not value.strip():
+        return []
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        parsed = value.split(",")
+    if isinstance(parsed, str):
+        parsed = [parsed]
+    return [str(condition).strip() for condition in parsed if str(condition).strip()]
+
+
+# application_schedule 저장 형식 (API: 당첨자 발표일 "YYYY-MM-DD", 크롤링: 접수 마감일 "YYYY.MM.DD")
+# API 데이터에는 접수 마감일이 없어서 당첨자 발표일을 마감 여부의 기준으로 대신 사용함
+# (발표일은 접수 마감 뒤이므로, 발표일 전이라도 이미 접수가 끝난 청약이 포함될 수 있음)
+SCHEDULE_FORMATS = ("%Y-%m-%d", "%Y.%m.%d")
+
+
+def parse_schedule(value):
+    """청약 일정 문자열을 date로 변환 (알 수 없는 형식이면 None)"""
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    for schedule_format in SCHEDULE_FORMATS:
+        try:
+            return datetime.strptime(value, schedule_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def to_date(value):
+    """YYYY-MM-DD 문자열, date, datetime을 date로 변환"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def to_compact_record(row):
+    """값이 없는 필드를 뺀 청약 레코드"""
+    record = {}
+    for key, value in row.items():
+        if key == "special_supply_conditions":
+            value = parse_conditions(value)
+            if value:
+                record[key] = value
+        elif not pd.isna(value):
+            record[key] = value.item() if hasattr(value, "item") else value
+    return record
+
+
+class SubscriptionIndex:
+    """
+    청약 메타데이터를 대표 시도 코드와 특별공급조건별 id 집합으로 색인
+
+    조회는 지역 집합과 (조건 집합들의 합집합)의 교집합으로 처리하고,
+    결과는 로드 시점에 만들어 둔 간결한 레코드로 반환한다.
+    청약 일정은 로드 시점에 날짜로 변환해 정렬해 두고, 기준일 이후 일정은 이분 탐색으로 찾는다.
+    청약마다 정렬된 일정에서의 순위를 저장해 두므로, 다른 조건으로 고른 후보는
+    후보 수만큼만 비교해서 마감 여부를 거른다.
+
+    일정(application_schedule)은 API 데이터에서는 당첨자 발표일이라 실제 접수 마감일이 아니라
+    근사값이다. (SCHEDULE_FORMATS 참고)
+    """
+
+    def __init__(self, data):
+        self.records = [
+            to_compact_record(row) for row in data.to_dict(orient="records")
         ]
-    if "special_supply_conditions" in user_input:
-        filtered_data = filtered_data[
-            filtered_data["special_supply_conditions"].str.contains(
-                "|".join(user_input["special_supply_conditions"]), na=False
+        self.by_region = defaultdict(set)
+        self.by_condition = defaultdict(set)
+        # 일정을 알 수 없는 청약은 마감 여부를 판단할 수 없으므로 항상 포함
+        self.undated_ids = []
+        schedule = []
+
+        for record_id, record in enumerate(self.records):
+            deadline = parse_schedule(record.get("application_schedule"))
+            if deadline is None:
+                self.undated_ids.append(record_id)
+            else:
+                schedule.append((deadline, record_id))
+
+            region_name = record.get("region_name")
+            if region_name:
+                self.by_region[region_matcher.classify(region_name)].add(record_id)
+            for condition in record.get("special_supply_conditions", []):
+                canonical = canonical_condition(condition)
+                if canonical:
+                    self.by_condition[canonical].add(record_id)
+
+        schedule.sort()
+        self.deadlines = [deadline for deadline, _ in schedule]
+        self.deadline_ids = [record_id for _, record_id in schedule]
+        # 청약 id -> 정렬된 일정에서의 순위 (일정이 없으면 어떤 위치보다도 뒤인 len(schedule))
+        self.schedule_rank = [len(schedule)] * len(self.records)
+        for rank, record_id in enumerate(self.deadline_ids):
+            self.schedule_rank[record_id] = rank
+
+    def open_position(self, current_date):
+        """정렬된 일정에서 기준일 당일 또는 이후 일정이 시작되는 위치 (이 위치 이상의 순위가 마감 전)"""
+        return bisect_left(self.deadlines, to_date(current_date))
+
+    def open_ids(self, current_date):
+        """기준일 당일 또는 이후에 일정이 있는(마감되지 않은) 청약 id 목록 (일정이 없는 청약 포함)"""
+        return self.deadline_ids[self.open_position(current_date) :] + self.undated_ids
+
+    def query_ids(
+        self, user_region=None, special_supply_conditions=None, current_date=None
+    ):
+        candidates = None
+        if user_region:
+            candidates = set(self.by_region.get(user_region, ()))
+
+        if special_supply_conditions:
+            if isinstance(special_supply_conditions, str):
+                special_supply_conditions = [special_supply_conditions]
+            # 조건 중 하나라도 해당하면 포함 (기존 "|".join 필터와 같은 의미)
+            matched = set()
+            for condition in special_supply_conditions:
+                matched |= self.by_condition.get(canonical_condition(condition), set())
+            candidates = matched if candidates is None else candidates & matched
+
+        if current_date:
+            if candidates is None:
+                candidates = self.open_ids(current_date)
+            else:
+                # 후보마다 일정 순위만 비교 (마감 전 청약 전체로 집합을 만들지 않음)
+                position = self.open_position(current_date)
+                rank = self.schedule_rank
+                candidates = [
+                    record_id for record_id in candidates if rank[record_id] >= position
+                ]
+
+        if candidates is None:
+            return list(range(len(self.records)))
+        return sorted(candidates)
+
+    def query(
+        self, user_region=None, special_supply_conditions=None, current_date=None
+    ):
+        return [
+            self.records[record_id]
+            for record_id in self.query_ids(
+                user_region, special_supply_conditions, current_date
             )
         ]
-    return filtered_data
+
+
+# 메타데이터 파일 경로별 인덱스 캐시: 경로 -> ((수정 시각, 크기), SubscriptionIndex)
+_index_cache = {}
+
+
+def load_subscription_index(metadata_save_path):
+    """청약 메타데이터를 한 번만 읽어 인덱스를 만들고, 파일이 바뀌지 않았다면 재사용"""
+    signature = None
+    if os.path.exists(metadata_save_path):
+        stat = os.stat(metadata_save_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _index_cache.get(metadata_save_path)
+    if cached and signature and cached[0] == signature:
+        return cached[1]
+
+    print("Loading metadata...")
+    index = SubscriptionIndex(load_metadata_from_file(metadata_save_path))
+    if signature:
+        _index_cache[metadata_save_path] = (signature, index)
+    return index
 
 
 # 메인 실행 함수
 def main(metadata_save_path, user_input):
-    # 저장된 메타데이터 로드
-    print("Loading metadata...")
-    combined_data = load_metadata_from_file(metadata_save_path)
+    # 지역/특별공급조건별로 색인된 메타데이터 로드 (파일이 바뀌지 않았다면 이전 인덱스 재사용)
+    index = load_subscription_index(metadata_save_path)
 
     # 추천 결과 필터링
-    recommended_supplies = filter_data(combined_data, user_input)
+    recommended_supplies = index.query(
+        user_input.get("user_region"),
+        user_input.get("special_supply_conditions"),
+        user_input.get("current_date"),
+    )
 
-    if not recommended_supplies.empty:
+    if recommended_supplies:
         return recommended_supplies
     else:
         return "조건에 맞는 청약 정보를 찾을 수 없습니다."
@@ -46,8 +226,9 @@ def main(metadata_save_path, user_input):
 
 """
 user_input: dict
-    - region_name: str
+    - user_region: str
     - special_supply_conditions: list[str]
+    - current_date: str ("YYYY-MM-DD", 선택. 이 날짜 이전에 마감된 청약은 제외)
 """
 
 
@@ -56,12 +237,18 @@ def subscription_parser(user_input: dict):
     current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     metadata_save_path = os.path.join(current_dir, "data/combined_data.csv")
     result = main(metadata_save_path, user_input)
-    result_json = result.to_json(orient="records", force_ascii=False)
+    if isinstance(result, str):
+        return result
+    result_json = json.dumps(result, ensure_ascii=False)
     return result_json
 
 
 if __name__ == "__main__":
     # 사용자 입력 예시
-    user_input = {"user_region": "인천", "special_supply_conditions": ["청년"]}
+    user_input = {
+        "user_region": "인천",
+        "special_supply_conditions": ["청년"],
+        "current_date": "2025-01-10",
+    }
     # 메인 실행 및 결과 출력
     print(subscription_parser(user_input))
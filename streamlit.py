@@ -10,6 +10,8 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from main import get_document, RequestData
+from llm.json_stream import iter_sections
+
 
 def calculate_age_group(age):
     if age < 20:
@@ -21,11 +23,7 @@ def calculate_age_group(age):
     else:
         return "40대 이상"
 
-def display_financial_plan(response_data, user_name):
-    # Add refresh button at the top
-    if st.button("🔄 새로고침"):
-        st.rerun()
-        
+def display_plan_header(user_name):
     # Updated CSS with new styles
     st.markdown("""
         <style>
@@ -94,11 +92,12 @@ def display_financial_plan(response_data, user_name):
         </div>
     """, unsafe_allow_html=True)
 
+
+def display_user_analysis(user_analysis):
     # 1. 사용자 상황 분석
     with st.container():
         st.subheader("1️⃣ 사용자 상황 분석")
         
-        user_analysis = response_data["user_analysis"]
         col1, col2, col3 = st.columns(3)
         with col1:
             st.metric(label="**🎯이름**", value=user_analysis['name'])
@@ -113,14 +112,14 @@ def display_financial_plan(response_data, user_name):
             st.markdown("**💭 주요 고민 사항**")
             st.write(user_analysis['concerns'])
 
-    # Rest of the sections remain similar but with updated styling
-    # 2. 추천 정책 및 지원 사업
+
+def display_policies(policies):
     # 2. 추천 정책 및 지원 사업
     with st.container():
         st.subheader("2️⃣ 추천 정책 및 지원 사업")
 
         # 추천 정책 반복 출력
-        for policy in response_data["recommended_policies"]:
+        for policy in policies:
             with st.expander(f"🏠 {policy['policy_name']}"):
                 # 추천 이유
                 st.markdown("**💡 추천 이유**")
@@ -139,12 +138,13 @@ def display_financial_plan(response_data, user_name):
                     st.write(policy.get("benefits", {}).get("description", "정보 없음"))
 
 
+def display_financial_products(products):
     # 3. 추천 금융 상품 포트폴리오
     with st.container():
         st.subheader("3️⃣ 추천 금융 상품 포트폴리오")
 
         # 금융 상품을 순차적으로 표시
-        for product in response_data["recommended_financial_products"]:
+        for product in products:
             st.markdown(f"""
                 <div class='metric-card'>
                     <h3>📍 {product['product_name']}</h3>
@@ -154,17 +154,17 @@ def display_financial_plan(response_data, user_name):
                 </div>
             """, unsafe_allow_html=True)
 
-    
 
+def display_housing_products(products):
     # 4. 추천 주택 상품 포트폴리오
     with st.container():
         st.subheader("3️⃣ 추천 주택 상품 포트폴리오")
 
         # 주택 상품 개수만큼 열 생성
-        cols = st.columns(len(response_data["recommended_housing_products"]))
+        cols = st.columns(len(products))
 
         # 주택 상품 데이터를 순회하며 표시
-        for idx, (col, product) in enumerate(zip(cols, response_data["recommended_housing_products"])):
+        for idx, (col, product) in enumerate(zip(cols, products)):
             with col:
                 st.markdown(f"""
                     <div class='metric-card'>
@@ -175,11 +175,12 @@ def display_financial_plan(response_data, user_name):
                     </div>
                 """, unsafe_allow_html=True)
 
+
+def display_savings_plan(savings_plan):
     # 5. 월간 저축 계획
     with st.container():
         st.subheader("4️⃣ 월간 저축 계획")
         
-        savings_plan = response_data["monthly_savings_plan"]
         cols = st.columns(3)
         metrics = [
             ("🎯 목표액", savings_plan["goal_amount"]),
@@ -190,6 +191,8 @@ def display_financial_plan(response_data, user_name):
             with col:
                 st.metric(label=label, value=value)
 
+
+def display_steps(steps):
     # 6. 단계별 실행 계획
     with st.container():
         st.subheader("5️⃣ 단계별 실행 계획")
@@ -202,7 +205,7 @@ def display_financial_plan(response_data, user_name):
             "12_months_plus": "1년 이상"
         }
         
-        for step in response_data["step_by_step_plan"]:
+        for step in steps:
             timeline = step["timeline"]
             for key, label in timeline_labels.items():
                 if timeline[key]:
@@ -214,6 +217,51 @@ def display_financial_plan(response_data, user_name):
                     """, unsafe_allow_html=True)
 
 
+# 응답 JSON의 섹션 키 -> 화면 출력 함수 (화면에 보이는 순서)
+PLAN_SECTIONS = [
+    ("user_analysis", display_user_analysis),
+    ("recommended_policies", display_policies),
+    ("recommended_financial_products", display_financial_products),
+    ("recommended_housing_products", display_housing_products),
+    ("monthly_savings_plan", display_savings_plan),
+    ("step_by_step_plan", display_steps),
+]
+
+
+def display_financial_plan_stream(chunks, user_name):
+    """
+    응답 텍스트 조각을 받는 대로 파싱해서, JSON이 완성된 섹션부터 바로 화면에 출력
+
+    Returns:
+        dict: 받은 섹션 (키 -> 값)
+    """
+    # Add refresh button at the top
+    if st.button("🔄 새로고침"):
+        st.rerun()
+
+    display_plan_header(user_name)
+    # 섹션 순서대로 자리를 잡아 두고, 완성된 섹션부터 채움
+    placeholders = {key: st.empty() for key, _ in PLAN_SECTIONS}
+    display_functions = dict(PLAN_SECTIONS)
+    status = st.empty()
+    status.info("맞춤형 금융 플랜을 작성하고 있습니다...")
+
+    sections = {}
+    for key, value in iter_sections(chunks):
+        if key not in display_functions:
+            continue
+        if key == "user_analysis" and isinstance(value, dict):
+            value["name"] = user_name
+        sections[key] = value
+        with placeholders[key].container():
+            display_functions[key](value)
+    status.empty()
+
+    if not sections:
+        raise ValueError("응답에서 금융 플랜 JSON을 찾지 못했습니다.")
+    return sections
+
+
 def main():
     st.set_page_config(
         page_title="맞춤형 주거/금융 상담 서비스",
@@ -255,6 +303,8 @@ Ex 2) 학자금 대출이 남아있는데 월세까지 낼 생각하니 막막
             height=100
         )
         
+        # 저장된 답변이 마음에 들지 않으면 같은 입력으로 새로 생성
+        refresh = st.checkbox("저장된 답변 대신 새로 생성")
         submitted = st.form_submit_button("상담 받기")
     
     if submitted:
@@ -262,47 +312,23 @@ Ex 2) 학자금 대출이 남아있는데 월세까지 낼 생각하니 막막
             st.error("이름을 입력해주세요!")
             return
             
-        with st.spinner('맞춤형 금융 플랜을 생성하고 있습니다...'):
-            # Create request data with name and concerns
-            request_data = RequestData(
-                user_name=name,
-                user_age=age,
-                user_region=location,
-                special_supply_conditions=special_conditions,
-                mainbank=bank,
-                concerns=concerns
-            )
-            try:
-                response_data = get_document(request_data)
-
-                 # 응답이 문자열인지 확인
-                if isinstance(response_data, str):
-                        response_data = response_data.strip()
-
-                        # 백틱(```) 제거
-                        if response_data.startswith("```") and response_data.endswith("```"):
-                            response_data = response_data[3:-3].strip()
-                            
-                        # 'json' 접두사가 있는 경우 제거
-                        if response_data.startswith("json"):
-                            response_data = response_data[response_data.find("{"):].strip()  # '{'부터 시작하도록 자르기
-
-                        try:
-                            # JSON 문자열을 Python 딕셔너리로 변환
-                            response_data = json.loads(response_data)
-                        except json.JSONDecodeError as e:
-                            print(f"JSON 변환 실패: {str(e)}")
-                            print(f"문제 발생 데이터: {response_data}")  # 디버깅용 출력
-                            raise ValueError("JSON 문자열을 변환하는 데 실패했습니다.")
-                elif not isinstance(response_data, dict):
-                        raise ValueError("get_document 함수에서 반환된 데이터가 문자열 또는 딕셔너리가 아닙니다.")
-
-                # Add name to user_analysis in response_data
-                response_data["user_analysis"]["name"] = name
-                # Display the financial plan
-                display_financial_plan(response_data, name)
-            except Exception as e:
-                st.error(f"금융 플랜 생성 중 오류가 발생했습니다: {str(e)}")
+        # Create request data with name and concerns
+        request_data = RequestData(
+            user_name=name,
+            user_age=age,
+            user_region=location,
+            special_supply_conditions=special_conditions,
+            mainbank=bank,
+            concerns=concerns,
+        )
+        try:
+            with st.spinner("관련 정책과 상품을 찾고 있습니다..."):
+                # 검색/파싱 후 응답 생성 요청까지 (응답은 조각으로 받음)
+                chunks = get_document(request_data, stream=True, refresh=refresh)
+            # JSON 섹션이 완성되는 대로 화면에 출력
+            display_financial_plan_stream(chunks, name)
+        except Exception as e:
+            st.error(f"금융 플랜 생성 중 오류가 발생했습니다: {str(e)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file